@@ -16,6 +16,8 @@ Attributes:
 """
 
 from models import storage
+from api.v1 import compression, limits, metrics, profiling
+from api.v1.json_provider import OrjsonProvider
 from api.v1.views import app_views
 from flask import Flask, jsonify
 from flask_cors import CORS  # Import CORS from flask_cors
@@ -24,6 +26,22 @@ from os import getenv
 
 app = Flask('__name__')
 
+# Profile single requests on demand, when enabled (first, so that the
+# other hooks are profiled too)
+profiling.init_app(app)
+
+# Encode JSON with orjson when it is installed
+app.json = OrjsonProvider(app)
+
+# Compress large JSON responses (gzip, or brotli when installed)
+compression.init_app(app)
+
+# Request and storage metrics at /api/v1/metrics, when enabled
+metrics.init_app(app)
+
+# Rate limiting and load shedding, when configured
+limits.init_app(app)
+
 # Enable CORS for all routes under /api
 CORS(app, resources={r"/api/*": {"origins": "0.0.0.0"}})
 
@@ -33,6 +51,9 @@ def close(self):
     """
     Teardown app context function to close the storage.
 
+    With DBStorage this ends the session of the request and with it the
+    identity map memoizing storage.get() and storage.all() results.
+
     Args:
         self: The Flask application context.
 
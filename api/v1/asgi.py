@@ -0,0 +1,209 @@
+#!/usr/bin/python3
+"""
+ASGI entry point for the API.
+
+The Flask application is served from an event loop: connections, request
+bodies and response bodies are handled asynchronously, while the views
+and their storage calls run on a bounded pool of HBNB_API_ASGI_WORKERS
+threads. Slow or idle clients therefore only cost a coroutine instead of
+a blocked thread, and the number of requests touching the storage engine
+at once stays bounded. Each request runs on a single pool thread from
+start to end, so the thread-local DBStorage session and the
+stream_with_context responses behave as under a threaded WSGI server.
+
+Streamed responses are handed to the event loop chunk by chunk through a
+bounded queue, so a slow client applies back-pressure to the view.
+
+Usage:
+    uvicorn api.v1.asgi:application --host 0.0.0.0 --port 5000
+
+Attributes:
+    - application: the ASGI application
+    - executor: the thread pool running the Flask views
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import io
+from os import getenv
+import sys
+import threading
+from api.v1.app import app
+
+WORKERS = int(getenv('HBNB_API_ASGI_WORKERS', 16))
+# Number of response chunks buffered between a view and its client.
+QUEUE_SIZE = 8
+
+executor = ThreadPoolExecutor(WORKERS, thread_name_prefix='hbnb-asgi')
+
+
+def build_environ(scope, body):
+    """
+    WSGI environ of an ASGI HTTP request.
+
+    Args:
+        scope: The ASGI connection scope.
+        body: The complete request body.
+
+    Returns:
+        The environ dictionary.
+    """
+    server = scope.get('server') or ('localhost', 80)
+    client = scope.get('client') or ('', 0)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', ''),
+        'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+        'SERVER_NAME': str(server[0]),
+        'SERVER_PORT': str(server[1]),
+        'SERVER_PROTOCOL': 'HTTP/' + scope.get('http_version', '1.1'),
+        'REMOTE_ADDR': str(client[0]),
+        'REMOTE_PORT': str(client[1]),
+        'CONTENT_LENGTH': str(len(body)),
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': False,
+        'wsgi.run_once': False,
+    }
+    for name, value in scope.get('headers', []):
+        name = name.decode('latin-1').upper().replace('-', '_')
+        value = value.decode('latin-1')
+        if name == 'CONTENT_TYPE':
+            environ['CONTENT_TYPE'] = value
+        elif name != 'CONTENT_LENGTH':
+            key = 'HTTP_' + name
+            if key in environ:
+                value = environ[key] + ',' + value
+            environ[key] = value
+    return environ
+
+
+def run_wsgi(environ, loop, queue, cancelled):
+    """
+    Run the Flask application in a pool thread.
+
+    The status and headers, then every body chunk, then None are put on
+    queue; an exception is put as an ('error', exception) item, which
+    application answers with a 500 before the response started and
+    re-raises after.
+    """
+    def put(item):
+        """Hand item to the event loop, waiting while the queue is full"""
+        asyncio.run_coroutine_threadsafe(queue.put(item), loop).result()
+
+    response = []
+
+    def start_response(status, headers, exc_info=None):
+        """WSGI start_response, the status is sent with the first chunk"""
+        response[:] = [status, headers]
+
+        def write(data):
+            """Legacy WSGI write callable"""
+            put(('chunk', data))
+        return write
+
+    try:
+        iterable = app(environ, start_response)
+        try:
+            put(('start', response[0], response[1]))
+            for chunk in iterable:
+                if cancelled.is_set():
+                    break
+                if chunk:
+                    put(('chunk', chunk))
+        finally:
+            if hasattr(iterable, 'close'):
+                iterable.close()
+    except Exception as error:
+        put(('error', error))
+    finally:
+        put(None)
+
+
+async def lifespan(receive, send):
+    """Handle the ASGI lifespan protocol"""
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            executor.shutdown(wait=True)
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def application(scope, receive, send):
+    """
+    ASGI application serving the API.
+
+    Args:
+        scope: The ASGI connection scope.
+        receive: Awaitable returning the next client message.
+        send: Awaitable sending a message to the client.
+    """
+    if scope['type'] == 'lifespan':
+        return await lifespan(receive, send)
+    if scope['type'] != 'http':
+        return
+
+    # Read the whole request body without holding a thread.
+    body = []
+    more_body = True
+    while more_body:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            return
+        body.append(message.get('body', b''))
+        more_body = message.get('more_body', False)
+
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue(QUEUE_SIZE)
+    cancelled = threading.Event()
+    worker = loop.run_in_executor(executor, run_wsgi,
+                                  build_environ(scope, b''.join(body)),
+                                  loop, queue, cancelled)
+    started = False
+    item = ()
+    try:
+        item = await queue.get()
+        while item is not None:
+            if item[0] == 'start':
+                started = True
+                await send({
+                    'type': 'http.response.start',
+                    'status': int(item[1].split(' ', 1)[0]),
+                    'headers': [(name.lower().encode('latin-1'),
+                                 value.encode('latin-1'))
+                                for name, value in item[2]]})
+            elif item[0] == 'chunk':
+                await send({'type': 'http.response.body', 'body': item[1],
+                            'more_body': True})
+            else:
+                app.logger.error('Exception on %s [%s]', scope['path'],
+                                 scope['method'], exc_info=item[1])
+                if started:
+                    # Part of the response was sent: let the server abort
+                    # the connection rather than end a truncated body.
+                    raise item[1]
+                started = True
+                await send({'type': 'http.response.start', 'status': 500,
+                            'headers': [(b'content-type', b'text/plain')]})
+                await send({'type': 'http.response.body',
+                            'body': b'Internal Server Error',
+                            'more_body': True})
+            item = await queue.get()
+        await send({'type': 'http.response.body', 'body': b'',
+                    'more_body': False})
+    finally:
+        if item is not None:
+            # The client went away or the body failed: stop the view and
+            # drain the queue so the pool thread is not left waiting on a
+            # full queue.
+            cancelled.set()
+            while await queue.get() is not None:
+                pass
+        await worker
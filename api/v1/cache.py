@@ -0,0 +1,163 @@
+#!/usr/bin/python3
+"""
+Response cache for read-only API endpoints.
+
+Serialized JSON bodies of cached GET views are kept in a size-bounded LRU
+keyed by request path, query string and Accept header. Every entry records
+the model classes it was built from and is dropped as soon as the storage
+engine reports a write (new/delete/save/reload) on one of them. Responses carry
+an ETag so clients sending If-None-Match get a 304 without the view being
+run or anything being serialized.
+
+Writes made by other processes (API workers, the console) are not
+reported to this one. With FileStorage every lookup first runs the cheap
+reload() generation check, which reports them; with DBStorage entries
+also expire HBNB_API_CACHE_TTL seconds (1 by default) after being built.
+
+Attributes:
+    - response_cache: ResponseCache instance used by the API views
+    - cached: decorator registering a view in response_cache
+"""
+
+from collections import OrderedDict
+from functools import wraps
+import hashlib
+from os import getenv
+from threading import Lock
+import time
+from flask import Response, request
+import models
+from models import storage
+
+
+class ResponseCache:
+    """LRU of serialized responses invalidated per model class"""
+
+    def __init__(self, maxsize=256, ttl=None):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of responses kept, 0 disables caching.
+            ttl: Seconds a response is kept, None for no expiry.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.__entries = OrderedDict()
+        self.__generations = {}
+        self.__lock = Lock()
+
+    def get(self, key):
+        """
+        Look up a cached response.
+
+        Returns:
+            (body, etag, mimetype) or None on a miss.
+        """
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                return None
+            if (self.ttl is not None and
+                    time.monotonic() - entry[4] > self.ttl):
+                del self.__entries[key]
+                return None
+            self.__entries.move_to_end(key)
+            return entry[0], entry[1], entry[3]
+
+    def snapshot(self, names):
+        """
+        Current generation of each class name, taken before building a
+        response so that put() can detect a write that raced with it.
+        """
+        with self.__lock:
+            return tuple(self.__generations.get(name, 0) for name in names)
+
+    def put(self, key, body, names, snapshot, mimetype='application/json'):
+        """
+        Store a serialized body built from the given class names.
+
+        Returns:
+            The ETag of body.
+        """
+        etag = hashlib.sha1(body).hexdigest()
+        if self.maxsize <= 0:
+            return etag
+        with self.__lock:
+            current = tuple(self.__generations.get(name, 0)
+                            for name in names)
+            if current != snapshot:
+                return etag
+            self.__entries[key] = (body, etag, frozenset(names), mimetype,
+                                   time.monotonic())
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.maxsize:
+                self.__entries.popitem(last=False)
+        return etag
+
+    def invalidate(self, event, name):
+        """
+        Storage listener dropping every entry built from class name.
+
+        Args:
+            event: The storage event (new, delete, save or reload).
+            name: The class name that was written.
+        """
+        with self.__lock:
+            self.__generations[name] = self.__generations.get(name, 0) + 1
+            for key in [key for key, entry in self.__entries.items()
+                        if name in entry[2]]:
+                del self.__entries[key]
+
+    def clear(self):
+        """Drop every cached response."""
+        with self.__lock:
+            self.__entries.clear()
+
+    def __len__(self):
+        """Number of cached responses."""
+        return len(self.__entries)
+
+
+response_cache = ResponseCache(
+    int(getenv('HBNB_API_CACHE_SIZE', 256)),
+    float(getenv('HBNB_API_CACHE_TTL', 1)) if models.storage_t == "db"
+    else None)
+storage.subscribe(response_cache.invalidate)
+
+
+def cached(*names):
+    """
+    Cache the JSON response of a GET view.
+
+    Args:
+        names: Class names the response is built from; a storage write on
+            any of them invalidates the cached response.
+    """
+    def decorator(view):
+        """Wrap view with the cache lookup."""
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            """Serve from the cache or run the view and store its body."""
+            if models.storage_t != "db":
+                # apply (and invalidate on) writes of other processes
+                storage.reload()
+            key = (request.full_path, request.headers.get('Accept', ''))
+            entry = response_cache.get(key)
+            if entry is None:
+                snapshot = response_cache.snapshot(names)
+                response = view(*args, **kwargs)
+                if (not isinstance(response, Response) or
+                        response.status_code != 200):
+                    return response
+                body = response.get_data()
+                etag = response_cache.put(key, body, names, snapshot,
+                                          response.mimetype)
+            else:
+                body, etag, mimetype = entry
+                response = Response(body, mimetype=mimetype)
+            response.set_etag(etag)
+            response.vary.add('Accept')
+            return response.make_conditional(request)
+        return wrapper
+    return decorator
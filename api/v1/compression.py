@@ -0,0 +1,181 @@
+#!/usr/bin/python3
+"""
+Negotiated response compression for the API.
+
+JSON responses are compressed with brotli (when the brotli package is
+installed) or gzip, whichever the client prefers in Accept-Encoding.
+Bodies smaller than HBNB_API_COMPRESS_MIN_SIZE bytes are sent as is since
+compressing them costs more than it saves. Streamed responses are
+compressed chunk by chunk, each chunk being flushed so clients still
+receive results as they are produced.
+
+Responses carrying an ETag (the cached views) keep their compressed body
+in a small LRU keyed by ETag and encoding, so a cache hit is not
+compressed again. Their ETag becomes weak since the bytes on the wire
+depend on the encoding; If-None-Match uses the weak comparison, so 304
+responses keep working.
+
+Attributes:
+    - init_app: registers the compression hook on a Flask application
+    - encodings: names of the encodings available, best first
+"""
+
+from collections import OrderedDict
+from os import getenv
+from threading import Lock
+import zlib
+from flask import request
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+MIN_SIZE = int(getenv('HBNB_API_COMPRESS_MIN_SIZE', 1024))
+GZIP_LEVEL = int(getenv('HBNB_API_GZIP_LEVEL', 6))
+BROTLI_QUALITY = int(getenv('HBNB_API_BROTLI_QUALITY', 5))
+COMPRESSIBLE = ('application/json', 'application/x-ndjson',
+                'application/ndjson')
+
+encodings = (['br'] if brotli is not None else []) + ['gzip']
+
+compressed_bodies = OrderedDict()
+compressed_lock = Lock()
+COMPRESSED_CACHE_SIZE = 64
+
+
+class GzipEncoder:
+    """Incremental gzip compressor."""
+
+    def __init__(self):
+        """Start a gzip stream."""
+        self.__compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def compress(self, data):
+        """Compressed bytes of data, flushed to a byte boundary."""
+        return (self.__compressor.compress(data) +
+                self.__compressor.flush(zlib.Z_SYNC_FLUSH))
+
+    def finish(self):
+        """End of the gzip stream."""
+        return self.__compressor.flush()
+
+
+class BrotliEncoder:
+    """Incremental brotli compressor."""
+
+    def __init__(self):
+        """Start a brotli stream."""
+        self.__compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+
+    def compress(self, data):
+        """Compressed bytes of data, flushed to a byte boundary."""
+        return self.__compressor.process(data) + self.__compressor.flush()
+
+    def finish(self):
+        """End of the brotli stream."""
+        return self.__compressor.finish()
+
+
+encoders = {'gzip': GzipEncoder, 'br': BrotliEncoder}
+
+
+def compress(data, encoding):
+    """
+    Compress a whole body.
+
+    Args:
+        data: The bytes to compress.
+        encoding: 'gzip' or 'br'.
+
+    Returns:
+        The compressed bytes.
+    """
+    if encoding == 'br':
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+    return compressor.compress(data) + compressor.flush()
+
+
+def compress_cached(data, encoding, etag):
+    """compress() of data, memoized by ETag and encoding"""
+    key = (etag, encoding)
+    with compressed_lock:
+        body = compressed_bodies.get(key)
+        if body is not None:
+            compressed_bodies.move_to_end(key)
+            return body
+    body = compress(data, encoding)
+    with compressed_lock:
+        compressed_bodies[key] = body
+        while len(compressed_bodies) > COMPRESSED_CACHE_SIZE:
+            compressed_bodies.popitem(last=False)
+    return body
+
+
+def compress_stream(chunks, encoding):
+    """
+    Compress a streamed body.
+
+    Args:
+        chunks: Iterable of str or bytes chunks.
+        encoding: 'gzip' or 'br'.
+
+    Yields:
+        Compressed chunks.
+    """
+    encoder = encoders[encoding]()
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode('utf-8')
+        data = encoder.compress(chunk)
+        if data:
+            yield data
+    yield encoder.finish()
+
+
+def compress_response(response):
+    """
+    after_request hook compressing the response when worth it.
+
+    Args:
+        response: The response built by the view.
+
+    Returns:
+        The response, compressed when the client accepts it.
+    """
+    response.vary.add('Accept-Encoding')
+    if (response.status_code < 200 or response.status_code in (204, 304) or
+            response.direct_passthrough or
+            'Content-Encoding' in response.headers or
+            response.mimetype not in COMPRESSIBLE):
+        return response
+    encoding = request.accept_encodings.best_match(encodings)
+    if encoding is None:
+        return response
+
+    if response.is_streamed:
+        response.response = compress_stream(response.response, encoding)
+        response.headers.pop('Content-Length', None)
+    else:
+        data = response.get_data()
+        if len(data) < MIN_SIZE:
+            return response
+        etag, weak = response.get_etag()
+        if etag is not None:
+            response.set_data(compress_cached(data, encoding, etag))
+            response.set_etag(etag, weak=True)
+        else:
+            response.set_data(compress(data, encoding))
+    response.headers['Content-Encoding'] = encoding
+    return response
+
+
+def init_app(app):
+    """
+    Register response compression on app.
+
+    Args:
+        app: The Flask application.
+    """
+    app.after_request(compress_response)
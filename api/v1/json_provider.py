@@ -0,0 +1,52 @@
+#!/usr/bin/python3
+"""
+Fast JSON encoding for the API.
+
+OrjsonProvider replaces Flask's default JSON provider with orjson when the
+package is installed; it encodes the model dictionaries several times
+faster than the json module and is also used by the streamed list
+responses through current_app.json. Without orjson, or for values orjson
+cannot encode, the default provider is used.
+
+Attributes:
+    - OrjsonProvider: the Flask JSON provider class
+"""
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider encoding with orjson"""
+
+    def dumps(self, obj, **kwargs):
+        """
+        Serialize obj to a JSON string.
+
+        Args:
+            obj: The value to encode.
+            kwargs: Options of json.dumps; only sort_keys and indent are
+                honoured by orjson, others fall back to the json module.
+
+        Returns:
+            The JSON string.
+        """
+        unsupported = set(kwargs) - {'sort_keys', 'indent', 'default',
+                                     'ensure_ascii', 'separators'}
+        if orjson is None or unsupported:
+            return super().dumps(obj, **kwargs)
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if kwargs.get('sort_keys', self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(obj, default=kwargs.get('default',
+                                                        self.default),
+                                option=option).decode('utf-8')
+        except TypeError:
+            return super().dumps(obj, **kwargs)
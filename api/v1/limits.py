@@ -0,0 +1,270 @@
+#!/usr/bin/python3
+"""
+Rate limiting and load shedding for the API.
+
+Two independent guards run before every request:
+
+- A token bucket per client address and route. Each request takes one
+  token; buckets refill at HBNB_API_RATE_LIMIT tokens per second up to
+  HBNB_API_RATE_BURST. Views can set their own rate with the rate_limit
+  decorator (e.g. the expensive /places_search, configured by
+  HBNB_API_SEARCH_RATE_LIMIT and HBNB_API_SEARCH_RATE_BURST). An empty
+  bucket answers 429 with a Retry-After header.
+- A concurrency limit of HBNB_API_MAX_ACTIVE requests in progress per
+  process. Up to HBNB_API_MAX_QUEUE more wait at most
+  HBNB_API_QUEUE_TIMEOUT seconds for a slot; beyond that requests are
+  shed at once with a 503, so an overloaded worker answers quickly
+  instead of piling up work.
+
+Both are off unless their variable is set. Buckets live in the process by
+default; with HBNB_API_RATE_LIMIT_DB pointing to a SQLite file they are
+shared by every process on the host (e.g. the workers of api.v1.server).
+
+Attributes:
+    - init_app: registers the guards on a Flask application
+    - rate_limit: decorator giving a view its own rate
+    - MemoryBuckets, SQLiteBuckets: token bucket backends
+    - ConcurrencyLimiter: bounded admission of requests
+"""
+
+from os import getenv
+import sqlite3
+import threading
+import time
+from flask import current_app, g, jsonify, request
+
+
+class MemoryBuckets:
+    """token buckets kept in the process"""
+
+    # Number of buckets above which full (idle) ones are dropped.
+    MAX_BUCKETS = 10000
+
+    def __init__(self):
+        """Initialize an empty set of buckets"""
+        self.__buckets = {}
+        self.__lock = threading.Lock()
+
+    def take(self, key, rate, burst, now=None):
+        """
+        Take one token from the bucket key.
+
+        Args:
+            key: The bucket (client and route).
+            rate: Tokens added per second.
+            burst: Capacity of the bucket.
+            now: Current time, time.monotonic() by default.
+
+        Returns:
+            0 when a token was taken, otherwise the seconds to wait.
+        """
+        now = time.monotonic() if now is None else now
+        with self.__lock:
+            tokens, stamp, full = self.__buckets.get(key, (burst, now, now))
+            tokens = min(burst, tokens + (now - stamp) * rate)
+            if tokens >= 1:
+                tokens -= 1
+                wait = 0
+            else:
+                wait = (1 - tokens) / rate
+            # Each bucket keeps the time it is full again at its own rate.
+            self.__buckets[key] = (tokens, now,
+                                   now + (burst - tokens) / rate)
+            if len(self.__buckets) > self.MAX_BUCKETS:
+                self.__prune(now)
+        return wait
+
+    def __prune(self, now):
+        """drops the buckets that are full again"""
+        for key in [key for key, (tokens, stamp, full)
+                    in self.__buckets.items() if full <= now]:
+            del self.__buckets[key]
+
+
+class SQLiteBuckets:
+    """token buckets shared between processes through a SQLite file"""
+
+    # Seconds between two deletions of the full (idle) buckets.
+    PRUNE_INTERVAL = 60
+
+    def __init__(self, path):
+        """
+        Initialize the backend.
+
+        Args:
+            path: The SQLite database file.
+        """
+        self.path = path
+        self.__local = threading.local()
+        self.__pruned = None
+
+    def __connection(self):
+        """SQLite connection of the current thread"""
+        connection = getattr(self.__local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5,
+                                         isolation_level=None)
+            connection.execute('CREATE TABLE IF NOT EXISTS token_buckets '
+                               '(key TEXT PRIMARY KEY, tokens REAL, '
+                               'stamp REAL, full REAL)')
+            connection.execute('CREATE INDEX IF NOT EXISTS '
+                               'token_buckets_full ON token_buckets (full)')
+            self.__local.connection = connection
+        return connection
+
+    def take(self, key, rate, burst, now=None):
+        """Take one token from the bucket key, see MemoryBuckets.take"""
+        now = time.time() if now is None else now
+        connection = self.__connection()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            row = connection.execute(
+                'SELECT tokens, stamp FROM token_buckets WHERE key = ?',
+                (key,)).fetchone()
+            tokens, stamp = row if row is not None else (burst, now)
+            tokens = min(burst, tokens + max(0, now - stamp) * rate)
+            wait = 0 if tokens >= 1 else (1 - tokens) / rate
+            if tokens >= 1:
+                tokens -= 1
+            # Each bucket keeps the time it is full again at its own rate.
+            connection.execute('INSERT OR REPLACE INTO token_buckets VALUES '
+                               '(?, ?, ?, ?)', (key, tokens, now,
+                                                now + (burst - tokens) / rate))
+            if (self.__pruned is None or
+                    now - self.__pruned >= self.PRUNE_INTERVAL):
+                self.__pruned = now
+                connection.execute('DELETE FROM token_buckets '
+                                   'WHERE full <= ?', (now,))
+            connection.execute('COMMIT')
+        except Exception:
+            connection.execute('ROLLBACK')
+            raise
+        return wait
+
+
+class ConcurrencyLimiter:
+    """admits at most max_active requests at once, with a bounded queue"""
+
+    def __init__(self, max_active, max_queue=0, timeout=0):
+        """
+        Initialize the limiter.
+
+        Args:
+            max_active: Requests allowed in progress at once.
+            max_queue: Requests allowed to wait for a slot.
+            timeout: Seconds a request may wait for a slot.
+        """
+        self.max_active = max_active
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.__condition = threading.Condition()
+        self.__active = 0
+        self.__waiting = 0
+
+    def acquire(self):
+        """
+        Take a slot, waiting in the queue if there is room.
+
+        Returns:
+            True if the request is admitted, False if it must be shed.
+        """
+        with self.__condition:
+            if self.__active < self.max_active:
+                self.__active += 1
+                return True
+            if self.__waiting >= self.max_queue:
+                return False
+            self.__waiting += 1
+            try:
+                admitted = self.__condition.wait_for(
+                    lambda: self.__active < self.max_active, self.timeout)
+            finally:
+                self.__waiting -= 1
+            if admitted:
+                self.__active += 1
+            return admitted
+
+    def release(self):
+        """Give a slot back"""
+        with self.__condition:
+            self.__active -= 1
+            self.__condition.notify()
+
+
+def rate_limit(rate, burst=None):
+    """
+    Give a view its own token bucket rate.
+
+    Args:
+        rate: Requests per second allowed per client on this route.
+        burst: Bucket capacity, rate by default.
+    """
+    def decorator(view):
+        """Record the rate on the view"""
+        view.rate_limit = (rate, burst if burst is not None else rate)
+        return view
+    return decorator
+
+
+def too_many_requests(wait):
+    """429 response asking the client to retry after wait seconds"""
+    response = jsonify({"error": "Too many requests"})
+    response.status_code = 429
+    response.headers['Retry-After'] = str(max(1, int(wait + 0.999)))
+    return response
+
+
+def check_rate():
+    """before_request hook taking a token from the client's bucket"""
+    view = current_app.view_functions.get(request.endpoint)
+    rate, burst = getattr(view, 'rate_limit', current_app.config[
+        'HBNB_RATE_LIMIT'])
+    if not rate:
+        return None
+    key = '{} {}'.format(request.remote_addr, request.endpoint)
+    wait = current_app.config['HBNB_RATE_BUCKETS'].take(key, rate, burst)
+    if wait:
+        return too_many_requests(wait)
+    return None
+
+
+def admit():
+    """before_request hook applying the concurrency limit"""
+    limiter = current_app.config['HBNB_CONCURRENCY_LIMITER']
+    if not limiter.acquire():
+        response = jsonify({"error": "Server busy"})
+        response.status_code = 503
+        response.headers['Retry-After'] = '1'
+        return response
+    g.admitted = True
+    return None
+
+
+def leave(error=None):
+    """teardown_request hook releasing the concurrency slot"""
+    if g.pop('admitted', False):
+        current_app.config['HBNB_CONCURRENCY_LIMITER'].release()
+
+
+def init_app(app):
+    """
+    Register the guards configured by the environment on app.
+
+    Args:
+        app: The Flask application.
+    """
+    rate = float(getenv('HBNB_API_RATE_LIMIT', 0))
+    burst = float(getenv('HBNB_API_RATE_BURST', rate))
+    if rate:
+        app.config['HBNB_RATE_LIMIT'] = (rate, burst)
+        path = getenv('HBNB_API_RATE_LIMIT_DB')
+        app.config['HBNB_RATE_BUCKETS'] = (SQLiteBuckets(path) if path
+                                           else MemoryBuckets())
+        app.before_request(check_rate)
+    max_active = int(getenv('HBNB_API_MAX_ACTIVE', 0))
+    if max_active:
+        app.config['HBNB_CONCURRENCY_LIMITER'] = ConcurrencyLimiter(
+            max_active, int(getenv('HBNB_API_MAX_QUEUE', 0)),
+            float(getenv('HBNB_API_QUEUE_TIMEOUT', 1)))
+        app.before_request(admit)
+        app.teardown_request(leave)
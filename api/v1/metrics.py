@@ -0,0 +1,246 @@
+#!/usr/bin/python3
+"""
+Request and storage metrics for the API, in Prometheus text format.
+
+When HBNB_API_METRICS is set, init_app records:
+    - a latency histogram per route and method, up to the end of
+      streamed responses, and a request counter per status;
+    - calls to the storage engine per method, and the objects they
+      returned (rows materialized);
+    - SQL statements executed (DBStorage only);
+    - bytes of JSON serialized in responses, before compression.
+They are served at /api/v1/metrics. Without the variable nothing is
+wrapped or registered, so the instrumentation costs nothing. Every
+process keeps its own metrics (one per worker of api.v1.server).
+
+Attributes:
+    - Metrics: the registry
+    - metrics: the registry used by the application
+    - init_app: enables the instrumentation on a Flask application
+"""
+
+from functools import wraps
+from os import getenv
+import threading
+import time
+from flask import Response, g, request
+import models
+from models import storage
+
+# Upper bounds (seconds) of the latency histogram buckets.
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0,
+           2.5, 5.0, 10.0)
+# Storage methods whose calls are counted.
+STORAGE_METHODS = ('all', 'iter', 'get', 'get_many', 'get_related',
+                   'get_place_amenities', 'count', 'new', 'save', 'delete',
+                   'reload', 'search_places', 'places_near')
+
+
+class Metrics:
+    """thread-safe counters and histograms"""
+
+    def __init__(self):
+        """Initialize an empty registry"""
+        self.__lock = threading.Lock()
+        self.__counters = {}
+        self.__histograms = {}
+
+    def inc(self, name, labels=(), value=1):
+        """
+        Add value to a counter.
+
+        Args:
+            name: The metric name.
+            labels: Tuple of (label, value) pairs.
+            value: The increment.
+        """
+        with self.__lock:
+            key = (name, labels)
+            self.__counters[key] = self.__counters.get(key, 0) + value
+
+    def observe(self, name, labels, value):
+        """
+        Record value in a histogram.
+
+        Args:
+            name: The metric name.
+            labels: Tuple of (label, value) pairs.
+            value: The observed value, in seconds.
+        """
+        with self.__lock:
+            key = (name, labels)
+            histogram = self.__histograms.get(key)
+            if histogram is None:
+                histogram = self.__histograms[key] = [
+                    [0] * len(BUCKETS), 0.0, 0]
+            for i, bound in enumerate(BUCKETS):
+                if value <= bound:
+                    histogram[0][i] += 1
+            histogram[1] += value
+            histogram[2] += 1
+
+    @staticmethod
+    def __labels(labels, extra=()):
+        """Prometheus label set of labels"""
+        pairs = list(labels) + list(extra)
+        if not pairs:
+            return ''
+        return '{' + ','.join('{}="{}"'.format(
+            name, str(value).replace('\\', '\\\\').replace('"', '\\"'))
+            for name, value in pairs) + '}'
+
+    def render(self):
+        """
+        The metrics in the Prometheus text exposition format.
+
+        Returns:
+            The text, one sample per line.
+        """
+        lines = []
+        with self.__lock:
+            counters = sorted(self.__counters.items())
+            histograms = sorted((key, (list(h[0]), h[1], h[2]))
+                                for key, h in self.__histograms.items())
+        typed = set()
+        for (name, labels), value in counters:
+            if name not in typed:
+                typed.add(name)
+                lines.append('# TYPE {} counter'.format(name))
+            lines.append('{}{} {}'.format(name, self.__labels(labels),
+                                          value))
+        for (name, labels), (counts, total, count) in histograms:
+            if name not in typed:
+                typed.add(name)
+                lines.append('# TYPE {} histogram'.format(name))
+            for bound, bucket in zip(BUCKETS, counts):
+                lines.append('{}_bucket{} {}'.format(
+                    name, self.__labels(labels, [('le', bound)]), bucket))
+            lines.append('{}_bucket{} {}'.format(
+                name, self.__labels(labels, [('le', '+Inf')]), count))
+            lines.append('{}_sum{} {}'.format(name, self.__labels(labels),
+                                              total))
+            lines.append('{}_count{} {}'.format(name, self.__labels(labels),
+                                                count))
+        return '\n'.join(lines) + '\n'
+
+
+metrics = Metrics()
+
+
+def rows(result):
+    """number of objects in a storage result"""
+    if result is None:
+        return 0
+    if isinstance(result, (list, dict, tuple)):
+        return len(result)
+    if isinstance(result, int):
+        return 0
+    return 1
+
+
+def instrument(method, name):
+    """wraps a bound storage method to count its calls and results"""
+    labels = (('method', name),)
+    if name == 'iter':
+        @wraps(method)
+        def counted(*args, **kwargs):
+            """storage.iter counting the objects yielded"""
+            metrics.inc('hbnb_storage_calls_total', labels)
+            count = 0
+            try:
+                for obj in method(*args, **kwargs):
+                    count += 1
+                    yield obj
+            finally:
+                metrics.inc('hbnb_storage_rows_total', labels, count)
+        return counted
+
+    @wraps(method)
+    def counted(*args, **kwargs):
+        """storage method counting its calls and the objects returned"""
+        metrics.inc('hbnb_storage_calls_total', labels)
+        result = method(*args, **kwargs)
+        if name not in ('count', 'new', 'save', 'delete', 'reload'):
+            metrics.inc('hbnb_storage_rows_total', labels, rows(result))
+        return result
+    return counted
+
+
+def count_bytes(chunks):
+    """passes a streamed body through, counting its bytes"""
+    size = 0
+    try:
+        for chunk in chunks:
+            size += len(chunk.encode('utf-8') if isinstance(chunk, str)
+                        else chunk)
+            yield chunk
+    finally:
+        metrics.inc('hbnb_response_bytes_total', (), size)
+
+
+def start_timer():
+    """before_request hook recording the start of the request"""
+    g.metrics_start = time.perf_counter()
+
+
+def record_response(response):
+    """after_request hook counting the request and its body size"""
+    g.metrics_status = response.status_code
+    if response.is_streamed:
+        response.response = count_bytes(response.response)
+    else:
+        metrics.inc('hbnb_response_bytes_total', (),
+                    response.content_length or 0)
+    return response
+
+
+def record_latency(error=None):
+    """teardown_request hook recording the latency of the request"""
+    start = g.pop('metrics_start', None)
+    if start is None:
+        return
+    route = request.url_rule.rule if request.url_rule else 'unmatched'
+    labels = (('method', request.method), ('route', route))
+    metrics.observe('hbnb_request_duration_seconds', labels,
+                    time.perf_counter() - start)
+    status = g.pop('metrics_status', 500)
+    metrics.inc('hbnb_requests_total', labels + (('status', status),))
+
+
+def render_metrics():
+    """
+    Serves the metrics.
+
+    Returns:
+        The metrics in the Prometheus text format.
+    """
+    return Response(metrics.render(),
+                    mimetype='text/plain; version=0.0.4')
+
+
+def init_app(app):
+    """
+    Enable the instrumentation on app when HBNB_API_METRICS is set.
+
+    Args:
+        app: The Flask application.
+    """
+    if not getenv('HBNB_API_METRICS'):
+        return
+    for name in STORAGE_METHODS:
+        method = getattr(storage, name, None)
+        if method is not None:
+            setattr(storage, name, instrument(method, name))
+    if models.storage_t == "db":
+        from sqlalchemy import event
+        from sqlalchemy.engine import Engine
+
+        def count_statement(*args):
+            """counts every SQL statement sent to the database"""
+            metrics.inc('hbnb_sql_statements_total')
+        event.listen(Engine, 'before_cursor_execute', count_statement)
+    app.before_request(start_timer)
+    app.after_request(record_response)
+    app.teardown_request(record_latency)
+    app.add_url_rule('/api/v1/metrics', 'metrics', render_metrics,
+                     strict_slashes=False)
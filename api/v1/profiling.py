@@ -0,0 +1,130 @@
+#!/usr/bin/python3
+"""
+Profiling of single requests on demand.
+
+When HBNB_API_PROFILE_SECRET is set, a request carrying the header
+"X-Profile: <secret>" runs under cProfile, from the first before_request
+hook to the last chunk of its body (streamed and compressed bodies
+included). Other requests are not affected. The profile is:
+    - returned instead of the response with "X-Profile-Output: text":
+      a pstats summary sorted by X-Profile-Sort (cumulative by default)
+      limited to HBNB_API_PROFILE_LIMIT functions, with the status of the
+      original response in X-Profile-Status;
+    - otherwise saved in HBNB_API_PROFILE_DIR (the temporary directory by
+      default) as a pstats file named in the X-Profile-File header, to be
+      read with python3 -m pstats or snakeviz.
+A wrong secret is ignored, as if there were no header.
+
+Attributes:
+    - init_app: enables the trigger on a Flask application
+"""
+
+import cProfile
+import hmac
+import io
+import os
+import pstats
+import tempfile
+import time
+import uuid
+from flask import current_app, g, request
+
+# Keys accepted by X-Profile-Sort.
+SORT_KEYS = ('cumulative', 'tottime', 'calls', 'ncalls', 'time')
+
+
+def start_profile():
+    """before_request hook enabling the profiler when asked to"""
+    secret = request.headers.get('X-Profile')
+    if not secret or not hmac.compare_digest(
+            secret.encode(), current_app.config['HBNB_PROFILE_SECRET']):
+        return
+    g.profiler = cProfile.Profile()
+    g.profiler.enable()
+
+
+def profiled(profiler, chunks, done):
+    """passes a streamed body through with profiler enabled"""
+    try:
+        iterator = iter(chunks)
+        while True:
+            profiler.enable()
+            try:
+                chunk = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                profiler.disable()
+            yield chunk
+    finally:
+        if hasattr(chunks, 'close'):
+            chunks.close()
+        done(profiler)
+
+
+def summary(profiler, sort):
+    """pstats text summary of profiler"""
+    stream = io.StringIO()
+    stats = pstats.Stats(profiler, stream=stream)
+    stats.sort_stats(sort if sort in SORT_KEYS else 'cumulative')
+    stats.print_stats(current_app.config['HBNB_PROFILE_LIMIT'])
+    return stream.getvalue()
+
+
+def stop_profile(response):
+    """after_request hook returning or saving the profile"""
+    profiler = g.pop('profiler', None)
+    if profiler is None:
+        return response
+    profiler.disable()
+    if request.headers.get('X-Profile-Output') == 'text':
+        if response.is_streamed:
+            response.response = list(profiled(profiler, response.response,
+                                              lambda profiler: None))
+        text = summary(profiler, request.headers.get('X-Profile-Sort'))
+        status = response.status_code
+        response = current_app.response_class(text, mimetype='text/plain')
+        response.headers['X-Profile-Status'] = str(status)
+        return response
+    path = os.path.join(current_app.config['HBNB_PROFILE_DIR'],
+                        '{}-{}-{}-{}.prof'.format(
+                            time.strftime('%Y%m%dT%H%M%S'), os.getpid(),
+                            request.endpoint or 'unmatched',
+                            uuid.uuid4().hex[:8]))
+    response.headers['X-Profile-File'] = os.path.basename(path)
+    if response.is_streamed:
+        response.response = profiled(profiler, response.response,
+                                     lambda profiler: profiler.dump_stats(
+                                         path))
+    else:
+        profiler.dump_stats(path)
+    return response
+
+
+def drop_profile(error=None):
+    """teardown_request hook stopping a profiler left by a failed request"""
+    profiler = g.pop('profiler', None)
+    if profiler is not None:
+        profiler.disable()
+
+
+def init_app(app):
+    """
+    Enable the profiling trigger on app when HBNB_API_PROFILE_SECRET is set.
+
+    Registered first, it profiles the other hooks of the application too.
+
+    Args:
+        app: The Flask application.
+    """
+    secret = os.getenv('HBNB_API_PROFILE_SECRET')
+    if not secret:
+        return
+    app.config['HBNB_PROFILE_SECRET'] = secret.encode()
+    app.config['HBNB_PROFILE_LIMIT'] = int(
+        os.getenv('HBNB_API_PROFILE_LIMIT', 40))
+    app.config['HBNB_PROFILE_DIR'] = os.getenv('HBNB_API_PROFILE_DIR',
+                                               tempfile.gettempdir())
+    app.before_request(start_profile)
+    app.after_request(stop_profile)
+    app.teardown_request(drop_profile)
@@ -0,0 +1,217 @@
+#!/usr/bin/python3
+"""
+Preforking WSGI launcher for the API.
+
+The master process imports the application, which loads the storage
+engine (with FileStorage, file.json is parsed once here), freezes the
+loaded objects out of the garbage collector and then forks
+HBNB_API_WORKERS worker processes sharing one listening socket. Workers
+start with the storage already warm and share its memory pages with the
+master copy-on-write until they modify them.
+
+Signals sent to the master:
+    - SIGHUP: graceful reload; the master reloads the storage engine,
+      forks a new generation of workers, then asks the old ones to stop
+      once their current requests are done.
+    - SIGTERM / SIGINT: graceful shutdown of every worker.
+Workers that die unexpectedly are replaced, after a growing delay while
+they keep dying within MIN_UPTIME seconds of their start; the master
+gives up and exits with status 1 after MAX_FAILURES such failures in a
+row, rather than forking workers that cannot start in a loop.
+
+Usage:
+    HBNB_API_WORKERS=4 python3 -m api.v1.server
+
+Attributes:
+    - Master: the process manager
+    - main: runs a Master with the configuration of the environment
+"""
+
+import gc
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+import traceback
+from werkzeug.serving import make_server
+import models
+from models import storage
+from api.v1.app import app
+
+# A worker exiting sooner than this (seconds) after its start failed.
+MIN_UPTIME = 1
+# Failed starts in a row after which the master stops.
+MAX_FAILURES = 5
+# Longest delay (seconds) before replacing a worker that failed.
+MAX_BACKOFF = 30
+
+
+class Master:
+    """forks and supervises the worker processes"""
+
+    def __init__(self, host='0.0.0.0', port=5000, workers=2, threaded=True):
+        """
+        Initialize the master.
+
+        Args:
+            host: Address to listen on.
+            port: Port to listen on.
+            workers: Number of worker processes.
+            threaded: Whether each worker handles requests in threads.
+        """
+        self.host = host
+        self.port = int(port)
+        self.workers = workers
+        self.threaded = threaded
+        self.socket = None
+        self.__children = {}
+        self.__generation = 0
+        self.__signals = []
+        self.__failures = 0
+        self.__respawns = []
+
+    def listen(self):
+        """Open the listening socket shared by the workers"""
+        family = socket.AF_INET6 if ':' in self.host else socket.AF_INET
+        self.socket = socket.socket(family, socket.SOCK_STREAM)
+        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.socket.bind((self.host, self.port))
+        self.socket.listen(1024)
+        self.socket.set_inheritable(True)
+        self.port = self.socket.getsockname()[1]
+
+    def spawn(self):
+        """Fork one worker of the current generation"""
+        pid = os.fork()
+        if pid:
+            self.__children[pid] = (self.__generation, time.monotonic())
+            return pid
+        status = 1
+        try:
+            self.work()
+            status = 0
+        except BaseException:
+            traceback.print_exc()
+            sys.stderr.flush()
+        finally:
+            os._exit(status)
+
+    def work(self):
+        """Body of a worker process: serve until told to stop"""
+        for signum in (signal.SIGHUP, signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, signal.SIG_DFL)
+        if models.storage_t == "db":
+            storage.after_fork()
+        server = make_server(self.host, self.port, app,
+                             threaded=self.threaded,
+                             fd=self.socket.fileno())
+
+        def stop(signum, frame):
+            """Finish the current requests, then exit"""
+            threading.Thread(target=server.shutdown).start()
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        server.serve_forever()
+        server.server_close()
+
+    def reload(self):
+        """Start a new generation of workers and retire the old one"""
+        storage.reload()
+        gc.freeze()
+        old = [pid for pid, (generation, started) in self.__children.items()
+               if generation == self.__generation]
+        self.__generation += 1
+        self.__failures = 0
+        self.__respawns.clear()
+        for _ in range(self.workers):
+            self.spawn()
+        for pid in old:
+            self.kill(pid, signal.SIGTERM)
+
+    def kill(self, pid, signum):
+        """Send signum to a worker that may already be gone"""
+        try:
+            os.kill(pid, signum)
+        except ProcessLookupError:
+            pass
+
+    def run(self):
+        """Fork the workers and supervise them until shutdown"""
+        if self.socket is None:
+            self.listen()
+        # Objects loaded so far are shared with the workers; keep the
+        # collector from touching (and so copying) their pages.
+        gc.freeze()
+        for signum in (signal.SIGHUP, signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum,
+                          lambda signum, frame: self.__signals.append(signum))
+        for _ in range(self.workers):
+            self.spawn()
+        print(" * Serving on http://{}:{} with {} workers (pid {})".format(
+            self.host, self.port, self.workers, os.getpid()), flush=True)
+        while True:
+            while self.__signals:
+                signum = self.__signals.pop(0)
+                if signum == signal.SIGHUP:
+                    self.reload()
+                else:
+                    return self.stop()
+            self.reap()
+            if self.__failures >= MAX_FAILURES:
+                self.stop()
+                raise SystemExit("Workers keep failing to start, giving up")
+            time.sleep(0.1)
+
+    def reap(self):
+        """Collect exited workers and replace the current ones when due"""
+        now = time.monotonic()
+        while self.__children:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+            if pid == 0:
+                break
+            generation, started = self.__children.pop(pid, (None, now))
+            if generation != self.__generation:
+                continue
+            if now - started < MIN_UPTIME:
+                self.__failures += 1
+                delay = min(MAX_BACKOFF, 0.5 * 2 ** (self.__failures - 1))
+            else:
+                self.__failures = 0
+                delay = 0
+            self.__respawns.append(now + delay)
+        due = [when for when in self.__respawns if when <= now]
+        self.__respawns = [when for when in self.__respawns if when > now]
+        for _ in due:
+            self.spawn()
+
+    def stop(self, timeout=30):
+        """Stop every worker, forcing those still running after timeout"""
+        for pid in list(self.__children):
+            self.kill(pid, signal.SIGTERM)
+        deadline = time.monotonic() + timeout
+        while self.__children and time.monotonic() < deadline:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+            if pid == 0:
+                time.sleep(0.1)
+            else:
+                self.__children.pop(pid, None)
+        for pid in list(self.__children):
+            self.kill(pid, signal.SIGKILL)
+            os.waitpid(pid, 0)
+        self.__children.clear()
+        self.socket.close()
+
+
+def main():
+    """Run the launcher configured by the HBNB_API_* variables"""
+    master = Master(os.getenv('HBNB_API_HOST', '0.0.0.0'),
+                    os.getenv('HBNB_API_PORT', 5000),
+                    int(os.getenv('HBNB_API_WORKERS', os.cpu_count() or 1)),
+                    os.getenv('HBNB_API_THREADED', '1') != '0')
+    master.run()
+
+
+if __name__ == "__main__":
+    main()
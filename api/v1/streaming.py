@@ -0,0 +1,106 @@
+#!/usr/bin/python3
+"""
+Streaming JSON responses for list endpoints.
+
+List views hand an iterable of model objects to stream_list() instead of
+building a list of dictionaries for jsonify. Objects are serialized one
+at a time and sent in chunks, so memory use does not grow with the number
+of results. Clients sending "Accept: application/x-ndjson" get one JSON
+object per line instead of a JSON array.
+
+A "fields" query parameter (comma separated) restricts every object to
+a sparse fieldset, e.g. ?fields=id,name,price_by_night, and an "ids"
+query parameter restricts list endpoints to the given objects.
+
+Attributes:
+    - stream_list: builds the streamed Response for an iterable of objects
+    - requested_fields: the sparse fieldset asked for by the request
+    - requested_ids: the object ids asked for by the request
+"""
+
+from flask import Response, current_app, request, stream_with_context
+
+NDJSON = 'application/x-ndjson'
+CHUNK_SIZE = 16384
+
+
+def requested_fields(data=None):
+    """
+    The sparse fieldset of the request.
+
+    Args:
+        data: Optional JSON body; a "fields" list there takes precedence
+            over the query parameter.
+
+    Returns:
+        List of field names, or None when every field is wanted.
+    """
+    if isinstance(data, dict) and isinstance(data.get('fields'), list):
+        return [str(field) for field in data['fields']]
+    fields = request.args.get('fields')
+    if not fields:
+        return None
+    return [field.strip() for field in fields.split(',') if field.strip()]
+
+
+def requested_ids():
+    """
+    The ids query parameter of the request.
+
+    Returns:
+        List of ids, or None when the parameter is absent.
+    """
+    ids = request.args.get('ids')
+    if ids is None:
+        return None
+    return [id.strip() for id in ids.split(',') if id.strip()]
+
+
+def stream_list(objects, serialize=None):
+    """
+    Stream a list of objects as a JSON array or NDJSON.
+
+    Args:
+        objects: Iterable of model objects; a generator is only started
+            once the response is being sent.
+        serialize: Function turning one object into a JSON-ready value,
+            by default to_dict() restricted to requested_fields().
+
+    Returns:
+        A streamed Response with the negotiated mimetype.
+    """
+    mimetype = request.accept_mimetypes.best_match(
+        ['application/json', NDJSON, 'application/ndjson'],
+        default='application/json')
+    ndjson = mimetype != 'application/json'
+    dumps = current_app.json.dumps
+    if serialize is None:
+        fields = requested_fields()
+
+        def serialize(obj):
+            """to_dict() of obj restricted to the requested fields."""
+            return obj.to_dict(fields=fields)
+
+    def generate():
+        """Yield the encoded objects in chunks of about CHUNK_SIZE."""
+        parts = [] if ndjson else ['[']
+        size = 0
+        first = True
+        for obj in objects:
+            item = dumps(serialize(obj))
+            if ndjson:
+                parts.append(item + '\n')
+            else:
+                parts.append(item if first else ',' + item)
+            first = False
+            size += len(item)
+            if size >= CHUNK_SIZE:
+                yield ''.join(parts)
+                parts = []
+                size = 0
+        if not ndjson:
+            parts.append(']\n')
+        if parts:
+            yield ''.join(parts)
+
+    return Response(stream_with_context(generate()), mimetype=mimetype)
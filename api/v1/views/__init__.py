@@ -20,6 +20,7 @@ Modules:
     - places: Views for managing places data
     - places_reviews: Views for managing place reviews data
     - places_amenities: Views for managing place amenities data
+    - batch: View for retrieving many objects by id at once
 
 Attributes:
     - app_views: Blueprint instance for API version 1 views
@@ -43,3 +44,4 @@ if (__name__ == 'api.v1.views'):
     from api.v1.views.places import *            # Import places view
     from api.v1.views.places_reviews import *    # Import places_reviews view
     from api.v1.views.places_amenities import *  # Import places_amenities view
+    from api.v1.views.batch import *             # Import batch view
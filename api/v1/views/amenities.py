@@ -14,28 +14,37 @@ Routes:
 """
 
 from api.v1.views import app_views
+from api.v1.streaming import requested_fields, requested_ids, stream_list
+from api.v1.cache import cached
 from flask import jsonify, request, abort
 from models import storage
 from models.amenity import Amenity
 
 
 @app_views.route('/amenities', methods=['GET'], strict_slashes=False)
+@cached('Amenity')
 def get_amenities():
     """
     Retrieves the list of all Amenity objects.
 
+    An "ids" query parameter (comma separated) restricts the list to
+    those Amenity objects, resolved in a single storage call.
+
     Returns:
         JSON representation of all Amenity objects.
     """
-    # Retrieve a list of all Amenity objects from the storage engine.
-    all_amenities = storage.all(Amenity)
-
-    # Convert each Amenity object to a dictionary using the `to_dict` method,
-    # and store them in a list called 'amenities'.
-    amenities = [amenity.to_dict() for amenity in all_amenities.values()]
+    ids = requested_ids()
+    if ids is not None:
+        # Fetch only the requested Amenity objects in one batch.
+        all_amenities = storage.get_many(Amenity, ids,
+                                         fields=requested_fields())
+    else:
+        # Iterate lazily over the Amenity objects of the storage engine.
+        all_amenities = storage.iter(Amenity, fields=requested_fields())
 
-    # Return the list of 'amenities' as a JSON response.
-    return (jsonify(amenities))
+    # Stream each Amenity object as a dictionary using the `to_dict` method
+    # instead of building the whole list in memory.
+    return (stream_list(all_amenities))
 
 
 @app_views.route(
@@ -62,7 +71,7 @@ def get_amenity(amenity_id):
 
     # Convert the retrieved 'amenity' object to a dictionary
     # using the `to_dict` method.
-    amenity_dict = amenity.to_dict()
+    amenity_dict = amenity.to_dict(fields=requested_fields())
 
     # Return the 'amenity_dict' as a JSON response.
     return (jsonify(amenity_dict))
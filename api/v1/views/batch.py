@@ -0,0 +1,86 @@
+#!/usr/bin/python3
+"""
+API Route for batch retrieval of objects by id.
+
+This module defines a route resolving many ids of one or several classes in
+a single request, so that clients rendering a page do not need one round
+trip per object.
+
+Routes:
+    - /batch_get: Retrieves objects of several classes by their IDs.
+"""
+
+from os import getenv
+from api.v1.views import app_views
+from api.v1.streaming import requested_fields
+from flask import jsonify, request
+from models import storage
+from models.amenity import Amenity
+from models.city import City
+from models.place import Place
+from models.review import Review
+from models.state import State
+from models.user import User
+
+classes = {"Amenity": Amenity, "City": City, "Place": Place,
+           "Review": Review, "State": State, "User": User}
+
+# Maximum number of ids accepted in a single batch request.
+BATCH_LIMIT = int(getenv('HBNB_API_BATCH_LIMIT', 1000))
+
+
+@app_views.route('/batch_get', methods=['POST'], strict_slashes=False)
+def batch_get():
+    """
+    Retrieves objects of several classes by their IDs.
+
+    The request body maps class names to lists of IDs, for instance
+    {"Place": ["<id>"], "User": ["<id>", "<id>"]}, and may carry a
+    "fields" list selecting a sparse fieldset. Each class is resolved
+    with one storage call.
+
+    Returns:
+        JSON dictionary mapping each class name to the list of its objects
+        found, in the order of the requested IDs; unknown IDs are left out.
+        400 error with the message "Not a JSON"
+            if the request body is not valid JSON.
+        400 error with the message "Unknown class <name>"
+            if a key is not a class name.
+        400 error with the message "Invalid ids for <name>"
+            if the IDs of a class are not a list.
+        400 error with the message "Too many ids"
+            if more than HBNB_API_BATCH_LIMIT IDs are requested.
+    """
+    # Attempt to retrieve JSON data from the request body.
+    data = request.get_json(silent=True)
+
+    # Check if the 'data' variable is a dictionary, otherwise the request
+    # body is not a valid JSON object.
+    if not isinstance(data, dict):
+        # Return a JSON response with a 400 error and the "Not a JSON" message.
+        return (jsonify({"error": "Not a JSON"}), 400)
+
+    fields = requested_fields(data)
+
+    # Validate every class name and list of IDs before querying anything.
+    wanted = {}
+    for name, ids in data.items():
+        if name == 'fields':
+            continue
+        if name not in classes:
+            return (jsonify({"error": "Unknown class " + name}), 400)
+        if not isinstance(ids, list):
+            return (jsonify({"error": "Invalid ids for " + name}), 400)
+        wanted[name] = [str(id) for id in ids]
+
+    if sum(len(ids) for ids in wanted.values()) > BATCH_LIMIT:
+        return (jsonify({"error": "Too many ids"}), 400)
+
+    # Resolve the IDs of each class with a single storage call.
+    result = {}
+    for name, ids in wanted.items():
+        objects = storage.get_many(classes[name], ids, fields=fields)
+        result[name] = [obj.to_dict(fields=fields) for obj in objects]
+
+    # Return the objects found as a JSON response.
+    return (jsonify(result))
@@ -14,6 +14,8 @@ Routes:
 """
 
 from api.v1.views import app_views
+from api.v1.streaming import requested_fields, stream_list
+from api.v1.cache import cached
 from flask import jsonify, request, abort
 from models import storage
 from models.state import State
@@ -22,6 +24,7 @@ from models.city import City
 
 @app_views.route('/states/<state_id>/cities', methods=['GET'],
                  strict_slashes=False)
+@cached('State', 'City')
 def get_cities(state_id):
     """
     Retrieves the list of all City objects of a State.
@@ -42,11 +45,8 @@ def get_cities(state_id):
         # Raise a 404 error response.
         abort(404)
 
-    # Create a list of dictionaries representing City objects within the State.
-    cities = [city.to_dict() for city in state.cities]
-
-    # Return the 'cities' list as a JSON response.
-    return (jsonify(cities))
+    # Stream the City objects within the State as a JSON response.
+    return (stream_list(state.cities))
 
 
 @app_views.route('/cities/<city_id>', methods=['GET'], strict_slashes=False)
@@ -71,7 +71,7 @@ def get_city(city_id):
         abort(404)
 
     # Convert the retrieved 'city' object to a dictionary.
-    city_dict = city.to_dict()
+    city_dict = city.to_dict(fields=requested_fields())
 
     # Return the 'city_dict' as a JSON response.
     return (jsonify(city_dict))
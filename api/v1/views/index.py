@@ -15,6 +15,7 @@ Routes:
 """
 
 from api.v1.views import app_views
+from api.v1.cache import cached
 from flask import jsonify
 from models import storage
 
@@ -36,6 +37,7 @@ def api_status():
 
 
 @app_views.route('/stats', methods=['GET'], strict_slashes=False)
+@cached('Amenity', 'City', 'Place', 'Review', 'State', 'User')
 def api_stats():
     """
     Get API Statistics.
@@ -11,17 +11,54 @@ Authors:
 Routes:
     - /cities/<city_id>/places: Retrieves list of all Place objects of a City.
     - /places/<place_id>: Retrieves a Place object by its ID.
+    - /places/near: Retrieves Place objects around a point, closest first.
     - /places_search: Retrieves Place objects based on search criteria.
 """
 
+import math
+from os import getenv
 from api.v1.views import app_views
+from api.v1.limits import rate_limit
+from api.v1.streaming import requested_fields, stream_list
 from flask import jsonify, request, abort
 from models import storage
 from models.city import City
 from models.place import Place
+from models.review import Review
 from models.user import User
-from models.state import State
-from models.amenity import Amenity
+from models.engine.search_index import RANGE_FIELDS
+
+# Related objects that can be embedded with the expand parameter.
+EXPANSIONS = ('reviews', 'reviews.user', 'amenities', 'user', 'city')
+
+# Largest radius (km) and number of places accepted by /places/near.
+NEAR_MAX_RADIUS = float(getenv('HBNB_API_NEAR_MAX_RADIUS', 500))
+NEAR_MAX_LIMIT = int(getenv('HBNB_API_NEAR_MAX_LIMIT', 100))
+# Token bucket of /places_search per client, 0 disables it.
+SEARCH_RATE_LIMIT = float(getenv('HBNB_API_SEARCH_RATE_LIMIT', 5))
+SEARCH_RATE_BURST = float(getenv('HBNB_API_SEARCH_RATE_BURST',
+                                 2 * SEARCH_RATE_LIMIT))
+
+
+def non_finite_field(data):
+    """
+    First numeric place field of data holding NaN or an infinity.
+
+    float() accepts "nan" and "inf", which the search indexes cannot sort.
+
+    Args:
+        data: The request dictionary.
+
+    Returns:
+        The name of the field, None if every value is finite or absent.
+    """
+    for field in RANGE_FIELDS:
+        try:
+            if not math.isfinite(float(data.get(field))):
+                return field
+        except (TypeError, ValueError):
+            pass
+    return None
 
 
 @app_views.route(
@@ -46,11 +83,73 @@ def get_places(city_id):
         # Raise a 404 error response.
         abort(404)
 
-    # Create a list of dictionaries representing Place objects within the City.
-    places = [place.to_dict() for place in city.places]
+    # Stream the Place objects within the City as a JSON response.
+    return (stream_list(city.places))
+
 
-    # Return the 'places' list as a JSON response.
-    return (jsonify(places))
+@app_views.route('/places/near', methods=['GET'], strict_slashes=False)
+def get_places_near():
+    """
+    Retrieves the Place objects within a radius of a point.
+
+    Query parameters:
+        lat, lng: Coordinates of the point in degrees (required).
+        radius: Search radius in kilometers (default 10, at most
+            HBNB_API_NEAR_MAX_RADIUS).
+        limit: Maximum number of places returned (default 20, at most
+            HBNB_API_NEAR_MAX_LIMIT).
+        fields: Optional comma separated sparse fieldset.
+
+    Returns:
+        JSON list of Place objects, closest first, each with a "distance"
+            key in kilometers.
+        400 error with the message "Missing <param>" or "Invalid <param>"
+            if a parameter is absent or not a valid number.
+        400 error with the message "Invalid parameters" if a coordinate
+            is off the globe or radius or limit is not positive or above
+            its cap.
+    """
+    # Parse and validate the query parameters.
+    params = {}
+    for name, convert, default in (('lat', float, None),
+                                   ('lng', float, None),
+                                   ('radius', float, 10.0),
+                                   ('limit', int, 20)):
+        value = request.args.get(name)
+        if value is None:
+            if default is None:
+                return (jsonify({"error": "Missing " + name}), 400)
+            params[name] = default
+            continue
+        try:
+            params[name] = convert(value)
+        except ValueError:
+            return (jsonify({"error": "Invalid " + name}), 400)
+
+    # Reject coordinates outside the globe, non-finite numbers (float
+    # accepts "nan" and "inf") and sizes that are not positive or above
+    # the caps (a huge radius walks the whole spatial grid).
+    if (not all(math.isfinite(value) for value in params.values()) or
+            not -90 <= params['lat'] <= 90 or
+            not -180 <= params['lng'] <= 180 or
+            not 0 < params['radius'] <= NEAR_MAX_RADIUS or
+            not 0 < params['limit'] <= NEAR_MAX_LIMIT):
+        return (jsonify({"error": "Invalid parameters"}), 400)
+
+    # Ask the storage engine's spatial lookup for the closest places.
+    nearby = storage.places_near(params['lat'], params['lng'],
+                                 params['radius'], params['limit'])
+
+    fields = requested_fields()
+
+    def serialize(pair):
+        """Place dictionary with its distance to the point."""
+        place_dict = pair[0].to_dict(fields=fields)
+        place_dict['distance'] = round(pair[1], 3)
+        return place_dict
+
+    # Stream the places with their distance as a JSON response.
+    return (stream_list(nearby, serialize))
 
 
 @app_views.route('/places/<place_id>', methods=['GET'], strict_slashes=False)
@@ -61,10 +160,23 @@ def get_place(place_id):
     Args:
         place_id: The ID of the Place object to retrieve.
 
+    An "expand" query parameter (comma separated) embeds related objects
+    in the response: "reviews", "reviews.user" (reviews with their
+    author), "amenities", "user" and "city".
+
     Returns:
         JSON representation of the Place object.
         404 error if the place_id is not linked to any Place object.
+        400 error with the message "Invalid expand <name>"
+            if an expansion is not supported.
     """
+    # Parse the expansions requested before touching the storage engine.
+    expand = [name.strip() for name in
+              request.args.get('expand', '').split(',') if name.strip()]
+    for name in expand:
+        if name not in EXPANSIONS:
+            return (jsonify({"error": "Invalid expand " + name}), 400)
+
     # Attempt to retrieve a Place object from the storage engine by its ID.
     place = storage.get(Place, place_id)
 
@@ -74,13 +186,77 @@ def get_place(place_id):
         # Raise a 404 error response.
         abort(404)
 
-    # Convert the retrieved 'place' object to a dictionary.
-    place_dict = place.to_dict()
+    # Convert the retrieved 'place' object to a dictionary, with the
+    # requested related objects embedded.
+    place_dict = expand_places([place], expand, requested_fields())[0]
 
     # Return the 'place_dict' as a JSON response.
     return (jsonify(place_dict))
 
 
+def expand_places(places, expand, fields=None):
+    """
+    Serializes places with their related objects embedded.
+
+    Related objects are loaded in batches, one storage call per relation
+    for all the places, rather than one lookup per object.
+
+    Args:
+        places: List of Place objects.
+        expand: Names from EXPANSIONS to embed.
+        fields: Optional sparse fieldset applied to the places.
+
+    Returns:
+        List of dictionaries, one per place.
+    """
+    place_ids = [place.id for place in places]
+    reviews = {}
+    amenities = {}
+    if 'reviews' in expand or 'reviews.user' in expand:
+        reviews = storage.get_related(Review, 'place_id', place_ids)
+    if 'amenities' in expand:
+        amenities = storage.get_place_amenities(place_ids)
+
+    # Collect every user and city id first so each class is a single call.
+    user_ids = []
+    if 'user' in expand:
+        user_ids.extend(place.user_id for place in places)
+    if 'reviews.user' in expand:
+        for place_reviews in reviews.values():
+            user_ids.extend(review.user_id for review in place_reviews)
+    users = {user.id: user for user in storage.get_many(User, user_ids)}
+    cities = {}
+    if 'city' in expand:
+        cities = {city.id: city for city in storage.get_many(
+            City, [place.city_id for place in places])}
+
+    place_dicts = []
+    for place in places:
+        place_dict = place.to_dict(fields=fields)
+        # The related lists are never part of the serialized place.
+        place_dict.pop('amenities', None)
+        place_dict.pop('reviews', None)
+        if 'reviews' in expand or 'reviews.user' in expand:
+            place_dict['reviews'] = []
+            for review in reviews.get(place.id, []):
+                review_dict = review.to_dict()
+                if 'reviews.user' in expand:
+                    user = users.get(review.user_id)
+                    review_dict['user'] = user.to_dict() if user else None
+                place_dict['reviews'].append(review_dict)
+        if 'amenities' in expand:
+            place_dict['amenities'] = [amenity.to_dict() for amenity in
+                                       amenities.get(place.id, [])]
+        if 'user' in expand:
+            user = users.get(place.user_id)
+            place_dict['user'] = user.to_dict() if user else None
+        if 'city' in expand:
+            city = cities.get(place.city_id)
+            place_dict['city'] = city.to_dict() if city else None
+        place_dicts.append(place_dict)
+    return place_dicts
+
+
 @app_views.route(
     '/places/<place_id>', methods=['DELETE'], strict_slashes=False)
 def delete_place(place_id):
@@ -130,6 +306,8 @@ def create_place(city_id):
         400 error with the message "Missing user_id" or "Missing name"
             if the dictionary doesn't contain the respective keys.
         404 error if the user_id is not linked to any User object.
+        400 error with the message "Invalid <field>"
+            if a numeric field is NaN or infinite.
     """
     # Attempt to retrieve a City object from the storage engine by its ID.
     city = storage.get(City, city_id)
@@ -166,6 +344,11 @@ def create_place(city_id):
         # and the "Missing name" message.
         return (jsonify(error_missing_name), 400)
 
+    # Reject numeric fields that are NaN or infinite.
+    field = non_finite_field(data)
+    if field is not None:
+        return (jsonify({"error": "Invalid " + field}), 400)
+
     # Add 'user_id' to the 'data' dictionary.
     user_id = data['user_id']
 
@@ -207,6 +390,8 @@ def update_place(place_id):
         404 error if the place_id is not linked to any Place object.
         400 error with the message "Not a JSON"
             if the request body is not valid JSON.
+        400 error with the message "Invalid <field>"
+            if a numeric field is NaN or infinite.
     """
     # Attempt to retrieve a Place object from the storage engine by its ID.
     place = storage.get(Place, place_id)
@@ -229,6 +414,11 @@ def update_place(place_id):
         # Return a JSON response with a 400 error and the "Not a JSON" message.
         return (jsonify(error_not_json), 400)
 
+    # Reject numeric fields that are NaN or infinite.
+    field = non_finite_field(data)
+    if field is not None:
+        return (jsonify({"error": "Invalid " + field}), 400)
+
     # Iterate through the 'data' dictionary and update the Place object's
     # attributes accordingly.
     for key, value in data.items():
@@ -246,14 +436,25 @@ def update_place(place_id):
 
 
 @app_views.route('/places_search', methods=['POST'], strict_slashes=False)
+@rate_limit(SEARCH_RATE_LIMIT, SEARCH_RATE_BURST)
 def search_places():
     """
     Retrieves Place objects based on search criteria from JSON request body.
 
+    The body may hold lists of "states", "cities" and "amenities" ids and
+    range filters {"min": x, "max": y} (either bound optional) on
+    "price_by_night", "max_guest", "number_rooms", "latitude" and
+    "longitude"; latitude and longitude together form a bounding box.
+    A "fields" list (or the fields query parameter) selects a sparse
+    fieldset.
+
     Returns:
         JSON representation of the filtered Place objects.
         400 error with the message "Not a JSON"
             if the request body is not valid JSON.
+        400 error with the message "Invalid <field>"
+            if "states", "cities" or "amenities" is not a list of ids or
+            a range filter is not an object of finite numeric min/max.
     """
     # Attempt to retrieve JSON data from the request body.
     data = request.get_json()
@@ -267,102 +468,49 @@ def search_places():
         # Return a JSON response with a 400 error and the "Not a JSON" message.
         return (jsonify(error_not_json), 400)
 
-    # Get search criteria from the JSON data
-    if data and len(data):
-        # Extract states, cities, and amenities from the JSON data
-        states = data.get("states", [])
-        cities = data.get("cities", [])
-        amenities = data.get("amenities", [])
-
-    # Retrieve all places if no search criteria are specified
-    if (
-        not data or not len(data) or (
-            not states and not cities and not amenities)):
-        # If no search criteria provided, fetch all places and return as JSON
-        places = storage.all(Place).values()
-
-        # Create a list of dictionaries,
-        # where each dictionary is a representation of a place
-        # by calling the to_dict() method on each place in places
-        place_dicts = [place.to_dict() for place in places]
-
-        # Return the JSON response for all places
-        return jsonify(place_dicts)
-
-    # Initialize an empty list to store filtered places
-    filtered_places = []
-
-    # Helper function to add places from a specific city to the result
-    def add_city_places(city_id):
-        """
-        Add places associated with a given city to the filtered_places list.
-
-        Args:
-            city_id (int): The ID of the city whose places are to be added.
-        """
-        # Retrieve the city object from the data storage using its ID
-        city = storage.get(City, city_id)
-
-        # If the city object was found in the data storage
-        if city:
-            # Add all places associated with the given city
-            # to the filtered_places list
-            filtered_places.extend(city.places)
-
-    # Handle states and cities inclusion
-    for state_id in states:
-        # Retrieve the State object from the data storage using its ID
-        state = storage.get(State, state_id)
-
-        # If the State object was found in the data storage,
-        if state:
-            # iterate through the cities within the selected state
-            for city in state.cities:
-                # Add places from each city within the selected states
-                add_city_places(city.id)
-
-    for city_id in cities:
-        # Add places from each individual city selected
-        add_city_places(city_id)
-
-    # Filter places based on amenities
-    if amenities:
-        # Check if any amenities were selected for filtering
-        if not filtered_places:
-            # If no places have been filtered yet, consider all places
-            filtered_places = storage.all(Place).values()
-
-        # Create a list of Amenity objects corresponding to
-        # the selected amenity IDs
-        amenities_obj = [
-            # Retrieve Amenity object for each amenity_id
-            storage.get(Amenity, amenity_id)
-            # Iterate through the selected amenity IDs
-            for amenity_id in amenities
-        ]
-
-        # Filter places to only include those with all selected amenities
-        filtered_places = [
-            place  # Keep the place if it meets the following conditions
-            for place in filtered_places  # Iterate through filtered places
-            if all([
-                # Check if each amenity is in the place's amenities
-                amenity in place.amenities
-                for amenity in amenities_obj  # Iterate through amenities_obj
-            ])
-        ]
-
-    # Create the final list of places without 'amenities' in the response
-    places = [
-        # Iterate through the filtered places & prepare each place's dictionary
-        {
-            k: v  # Keep key-value pairs
-            # Convert the place object to a dictionary representation
-            for k, v in place.to_dict().items()
-            if k != 'amenities'  # Exclude 'amenities' key
-        }
-        for place in filtered_places  # Iterate through filtered places
-    ]
-
-    # Return the filtered places as JSON response
-    return jsonify(places)
+    # Extract states, cities, and amenities from the JSON data
+    states = data.get("states", [])
+    cities = data.get("cities", [])
+    amenities = data.get("amenities", [])
+
+    # The ids are used as set members and query parameters: only accept
+    # lists of strings.
+    for name, ids in (("states", states), ("cities", cities),
+                      ("amenities", amenities)):
+        if not isinstance(ids, list) or not all(
+                isinstance(id, str) for id in ids):
+            return (jsonify({"error": "Invalid " + name}), 400)
+
+    # Extract the range filters as {field: (min, max)}
+    ranges = {}
+    for field in RANGE_FIELDS:
+        if field not in data:
+            continue
+        bounds = data[field]
+        if not isinstance(bounds, dict) or not all(
+                bounds.get(k) is None or (
+                    isinstance(bounds[k], (int, float)) and
+                    not isinstance(bounds[k], bool) and
+                    math.isfinite(bounds[k]))
+                for k in ("min", "max")):
+            return (jsonify({"error": "Invalid " + field}), 400)
+        ranges[field] = (bounds.get("min"), bounds.get("max"))
+
+    # Resolve the criteria in one storage call: the file engine answers
+    # from its posting lists and sorted field indexes, the database engine
+    # with a single query. No criteria at all iterates over every place.
+    fields = requested_fields(data)
+    if states or cities or amenities or ranges:
+        filtered_places = storage.search_places(states, cities, amenities,
+                                                ranges, fields=fields)
+    else:
+        filtered_places = storage.iter(Place, fields=fields)
+
+    def serialize(place):
+        """Place dictionary without the 'amenities' key."""
+        place_dict = place.to_dict(fields=fields)
+        place_dict.pop('amenities', None)
+        return place_dict
+
+    # Stream the filtered places as JSON response, one place at a time
+    return stream_list(filtered_places, serialize)
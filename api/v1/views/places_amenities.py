@@ -15,15 +15,79 @@ Routes:
 - DELETE /places/<place_id>/amenities/<amenity_id>:
                             Delete an Amenity linked to a Place.
 - POST /places/<place_id>/amenities/<amenity_id>: Link an Amenity to a Place.
+- POST /places/<place_id>/amenities: Link many Amenities to a Place.
+- DELETE /places/<place_id>/amenities: Unlink many Amenities from a Place.
 """
 
 from api.v1.views import app_views
+from api.v1.views.batch import BATCH_LIMIT
+from api.v1.streaming import stream_list
 from flask import jsonify, request, abort
+import models
 from models import storage
 from models.place import Place
 from models.amenity import Amenity
 
 
+def linked_ids(place):
+    """
+    Ids of the amenities linked to a Place.
+
+    The database engine links them through the place_amenity table, the
+    file engine through the amenity_ids list of the place.
+    """
+    if models.storage_t == "db":
+        return [amenity.id for amenity in place.amenities]
+    return list(place.amenity_ids)
+
+
+def link_amenities(place, amenities):
+    """
+    Links Amenity objects to a Place, without saving it.
+
+    Returns:
+        The amenities that were not linked yet.
+    """
+    linked = set(linked_ids(place))
+    added = []
+    for amenity in amenities:
+        if amenity.id not in linked:
+            linked.add(amenity.id)
+            added.append(amenity)
+    if added:
+        if models.storage_t == "db":
+            place.amenities.extend(added)
+        else:
+            # assign a new list: the default one is shared by the class
+            place.amenity_ids = (list(place.amenity_ids) +
+                                 [amenity.id for amenity in added])
+    return added
+
+
+def unlink_amenities(place, amenities):
+    """
+    Unlinks Amenity objects from a Place, without saving it.
+
+    Returns:
+        The amenities that were linked.
+    """
+    linked = set(linked_ids(place))
+    removed = []
+    for amenity in amenities:
+        if amenity.id in linked:
+            linked.discard(amenity.id)
+            removed.append(amenity)
+    if removed:
+        if models.storage_t == "db":
+            for amenity in removed:
+                place.amenities.remove(amenity)
+        else:
+            gone = set(amenity.id for amenity in removed)
+            place.amenity_ids = [amenity_id for amenity_id in
+                                 place.amenity_ids if amenity_id not in gone]
+    return removed
+
+
 @app_views.route(
     '/places/<place_id>/amenities', methods=['GET'], strict_slashes=False)
 def get_place_amenities(place_id):
@@ -45,11 +109,8 @@ def get_place_amenities(place_id):
         # Raise a 404 error response.
         abort(404)
 
-    # Create a list of dictionaries representing linked Amenity objects
-    amenities = [amenity.to_dict() for amenity in place.amenities]
-
-    # Return the JSON response for all amenities in the place
-    return (jsonify(amenities))
+    # Stream the JSON response for all amenities in the place
+    return (stream_list(place.amenities))
 
 
 @app_views.route('/places/<place_id>/amenities/<amenity_id>',
@@ -72,13 +133,15 @@ def delete_place_amenity(place_id, amenity_id):
     place = storage.get(Place, place_id)
     amenity = storage.get(Amenity, amenity_id)
 
-    # Check if the Place, Amenity, or their link exist
-    if place is None or amenity is None or amenity not in place.amenities:
+    # Check if the Place and Amenity objects exist
+    if place is None or amenity is None:
         # Raise a 404 error response.
         abort(404)
 
-    # Remove the Amenity from the Place's amenities and save
-    place.amenities.remove(amenity)
+    # Remove the Amenity from the Place's amenities, 404 if it was not
+    # linked to the Place before the request
+    if not unlink_amenities(place, [amenity]):
+        abort(404)
 
     # Save the changes in the storage engine.
     place.save()
@@ -112,8 +175,8 @@ def link_place_amenity(place_id, amenity_id):
         # Raise a 404 error response.
         abort(404)
 
-    # Check if the Amenity is already linked to the Place
-    if amenity in place.amenities:
+    # Link the Amenity to the Place, unless it is already linked
+    if not link_amenities(place, [amenity]):
         # If the Amenity is already linked,
         # convert it to a dictionary representation.
         amenity_dict = amenity.to_dict()
@@ -121,9 +184,6 @@ def link_place_amenity(place_id, amenity_id):
         # with a status code of 200 (OK).
         return (jsonify(amenity_dict), 200)
 
-    # Link the Amenity to the Place and save
-    place.amenities.append(amenity)
-
     # Save the changes in the storage engine.
     place.save()
 
@@ -133,3 +193,79 @@ def link_place_amenity(place_id, amenity_id):
     # Return a JSON representation of the linked Amenity
     # with a status code of 201 (Created)
     return (jsonify(amenity_dict), 201)
+
+
+@app_views.route('/places/<place_id>/amenities',
+                 methods=['POST', 'DELETE'], strict_slashes=False)
+def batch_place_amenities(place_id):
+    """
+    Links (POST) or unlinks (DELETE) many Amenity objects of a Place.
+
+    The request body is {"amenity_ids": ["<id>", ...]}. The amenities are
+    resolved with one storage call and the Place is saved once.
+
+    Args:
+        place_id (str): The ID of the Place.
+
+    Returns:
+        JSON list of {"amenity_id", "status"} in the order of the request,
+        with the status code 200. The status of an item is the one of the
+        single amenity route: 201 linked, 200 already linked (POST) or
+        unlinked (DELETE), 404 unknown amenity or not linked (DELETE).
+        404 error if the place_id is not linked to any Place object.
+        400 error with the message "Not a JSON"
+            if the request body is not valid JSON.
+        400 error with the message "Missing amenity_ids"
+            if the body is not a dictionary with an amenity_ids list.
+        400 error with the message "Too many ids"
+            if more than HBNB_API_BATCH_LIMIT IDs are given.
+    """
+    # Retrieve the Place object using its ID
+    place = storage.get(Place, place_id)
+
+    # Check if the Place object exists
+    if place is None:
+        # Raise a 404 error response.
+        abort(404)
+
+    # Get the request data as JSON
+    data = request.get_json(silent=True)
+
+    # Check if the request data is valid JSON with a list of ids
+    if data is None:
+        return (jsonify({"error": "Not a JSON"}), 400)
+    if not isinstance(data, dict) or not isinstance(data.get("amenity_ids"),
+                                                    list):
+        return (jsonify({"error": "Missing amenity_ids"}), 400)
+    ids = [str(amenity_id) for amenity_id in data["amenity_ids"]]
+    if len(ids) > BATCH_LIMIT:
+        return (jsonify({"error": "Too many ids"}), 400)
+
+    # Resolve every Amenity with a single storage call
+    amenities = storage.get_many(Amenity, ids)
+    found = {amenity.id: amenity for amenity in amenities}
+
+    # Link or unlink them all, then save the Place once
+    if request.method == 'POST':
+        changed = link_amenities(place, amenities)
+        status = 201
+    else:
+        changed = unlink_amenities(place, amenities)
+        status = 200
+    if changed:
+        place.save()
+
+    # Report the result of every requested id, in order
+    changed = set(amenity.id for amenity in changed)
+    results = []
+    for amenity_id in ids:
+        if amenity_id not in found:
+            code = 404
+        elif amenity_id in changed:
+            code = status
+            # a repeated id only changes the link once
+            changed.discard(amenity_id)
+        else:
+            code = 200 if request.method == 'POST' else 404
+        results.append({"amenity_id": amenity_id, "status": code})
+    return (jsonify(results), 200)
@@ -13,11 +13,14 @@ Routes:
 - GET /places/<place_id>/reviews: Retrieve all Review objects of a Place.
 - GET /reviews/<review_id>: Retrieve a specific Review object by ID.
 - DELETE /reviews/<review_id>: Delete a specific Review object by ID.
-- POST /places/<place_id>/reviews: Create a new Review object for a Place.
+- POST /places/<place_id>/reviews: Create a new Review object for a Place,
+                            or many of them from a list.
 - PUT /reviews/<review_id>: Update a specific Review object by ID.
 """
 
 from api.v1.views import app_views
+from api.v1.views.batch import BATCH_LIMIT
+from api.v1.streaming import requested_fields, stream_list
 from flask import jsonify, request, abort
 from models import storage
 from models.place import Place
@@ -46,11 +49,8 @@ def get_reviews(place_id):
         # Raise a 404 error response.
         abort(404)
 
-    # Create a list of dictionaries representing linked Review objects
-    reviews = [review.to_dict() for review in place.reviews]
-
-    # Return the JSON response for all reviews in the place
-    return (jsonify(reviews))
+    # Stream the JSON response for all reviews in the place
+    return (stream_list(place.reviews))
 
 
 @app_views.route('/reviews/<review_id>', methods=['GET'], strict_slashes=False)
@@ -74,7 +74,7 @@ def get_review(review_id):
         abort(404)
 
     # Return the JSON response for the review
-    return (jsonify(review.to_dict()))
+    return (jsonify(review.to_dict(fields=requested_fields())))
 
 
 @app_views.route(
@@ -110,13 +110,14 @@ def delete_review(review_id):
     '/places/<place_id>/reviews', methods=['POST'], strict_slashes=False)
 def create_review(place_id):
     """
-    Creates a new Review.
+    Creates a new Review, or many of them when the body is a list.
 
     Args:
         place_id: The ID of the Place in which to create the Review.
 
     Returns:
-        JSON representation of the new Review with the status code 201.
+        JSON representation of the new Review with the status code 201,
+            or of the results of a list (see create_reviews).
         400 error with the message "Not a JSON"
             if the request body is not valid JSON.
         404 error if the place_id is not linked to any Place object.
@@ -145,6 +146,10 @@ def create_review(place_id):
         # Return a JSON response with a 400 error and the "Not a JSON" message.
         return (jsonify(error_not_json), 400)
 
+    # A list creates many Reviews at once
+    if isinstance(data, list):
+        return (create_reviews(place, data))
+
     if 'user_id' not in data:
         # Return a JSON response with a 400 error
         # and the "Missing user_id" message.
@@ -175,6 +180,62 @@ def create_review(place_id):
     return (jsonify(new_review.to_dict()), 201)
 
 
+def create_reviews(place, items):
+    """
+    Creates many Reviews of a Place with a single storage commit.
+
+    Every item is validated like the body of a single Review; the users
+    are resolved with one storage call and the valid Reviews are stored
+    together through storage.new_many.
+
+    Args:
+        place: The Place of the Reviews.
+        items: List of dictionaries with user_id and text.
+
+    Returns:
+        JSON list of results in the order of the items, with the status
+        code 200: {"status": 201, "review": {...}} for a created Review,
+        {"status": 400, "error": "Missing user_id" / "Missing text" /
+        "Not a JSON"} or {"status": 404, "error": "Not found"} for an
+        unknown user.
+        400 error with the message "Too many reviews"
+            if more than HBNB_API_BATCH_LIMIT items are given.
+    """
+    if len(items) > BATCH_LIMIT:
+        return (jsonify({"error": "Too many reviews"}), 400)
+
+    # Resolve every user with a single storage call
+    users = set(user.id for user in storage.get_many(
+        User, [str(item['user_id']) for item in items
+               if isinstance(item, dict) and 'user_id' in item]))
+
+    results = []
+    reviews = []
+    for item in items:
+        if not isinstance(item, dict):
+            results.append({"status": 400, "error": "Not a JSON"})
+        elif 'user_id' not in item:
+            results.append({"status": 400, "error": "Missing user_id"})
+        elif 'text' not in item:
+            results.append({"status": 400, "error": "Missing text"})
+        elif str(item['user_id']) not in users:
+            results.append({"status": 404, "error": "Not found"})
+        else:
+            review = Review(**dict(item, place_id=place.id))
+            reviews.append(review)
+            results.append({"status": 201, "review": review})
+
+    # Store the valid Reviews and commit once
+    if reviews:
+        storage.new_many(reviews)
+        storage.save()
+
+    for result in results:
+        if "review" in result:
+            result["review"] = result["review"].to_dict()
+    return (jsonify(results), 200)
+
+
 @app_views.route('/reviews/<review_id>', methods=['PUT'], strict_slashes=False)
 def update_review(review_id):
     """
@@ -14,28 +14,36 @@ Routes:
 """
 
 from api.v1.views import app_views
+from api.v1.streaming import requested_fields, requested_ids, stream_list
+from api.v1.cache import cached
 from flask import jsonify, request, abort
 from models import storage
 from models.state import State
 
 
 @app_views.route('/states', methods=['GET'], strict_slashes=False)
+@cached('State')
 def get_states():
     """
     Retrieves the list of all State objects.
 
+    An "ids" query parameter (comma separated) restricts the list to
+    those State objects, resolved in a single storage call.
+
     Returns:
         JSON representation of all State objects.
     """
-    # Retrieve a list of all State objects from the storage engine.
-    all_states = storage.all(State)
-
-    # Convert each State object to a dictionary using the `to_dict` method,
-    # and store them in a list called 'states'.
-    states = [state.to_dict() for state in all_states.values()]
+    ids = requested_ids()
+    if ids is not None:
+        # Fetch only the requested State objects in one batch.
+        all_states = storage.get_many(State, ids, fields=requested_fields())
+    else:
+        # Iterate lazily over the State objects of the storage engine.
+        all_states = storage.iter(State, fields=requested_fields())
 
-    # Return the list of 'states' as a JSON response.
-    return (jsonify(states))
+    # Stream each State object as a dictionary using the `to_dict` method
+    # instead of building the whole list in memory.
+    return (stream_list(all_states))
 
 
 @app_views.route('/states/<state_id>', methods=['GET'], strict_slashes=False)
@@ -61,7 +69,7 @@ def get_state(state_id):
 
     # Convert the retrieved 'state' object to a dictionary
     # using the `to_dict` method.
-    state_dict = state.to_dict()
+    state_dict = state.to_dict(fields=requested_fields())
 
     # Return the 'state_dict' as a JSON response.
     return (jsonify(state_dict))
@@ -14,6 +14,7 @@ Routes:
 """
 
 from api.v1.views import app_views
+from api.v1.streaming import requested_fields, requested_ids, stream_list
 from flask import jsonify, request, abort
 from models import storage
 from models.user import User
@@ -24,18 +25,23 @@ def get_users():
     """
     Retrieves the list of all User objects.
 
+    An "ids" query parameter (comma separated) restricts the list to
+    those User objects, resolved in a single storage call.
+
     Returns:
         JSON representation of all User objects.
     """
-    # Retrieve a list of all User objects from the storage engine.
-    all_users = storage.all(User)
-
-    # Convert each User object to a dictionary using the `to_dict` method,
-    # and store them in a list called 'users'.
-    users = [user.to_dict() for user in all_users.values()]
+    ids = requested_ids()
+    if ids is not None:
+        # Fetch only the requested User objects in one batch.
+        all_users = storage.get_many(User, ids, fields=requested_fields())
+    else:
+        # Iterate lazily over the User objects of the storage engine.
+        all_users = storage.iter(User, fields=requested_fields())
 
-    # Return the list of 'users' as a JSON response.
-    return (jsonify(users))
+    # Stream each User object as a dictionary using the `to_dict` method
+    # instead of building the whole list in memory.
+    return (stream_list(all_users))
 
 
 @app_views.route('/users/<user_id>', methods=['GET'], strict_slashes=False)
@@ -61,7 +67,7 @@ def get_user(user_id):
 
     # Convert the retrieved 'user' object to a dictionary
     # using the `to_dict` method.
-    user_dict = user.to_dict()
+    user_dict = user.to_dict(fields=requested_fields())
 
     # Return the 'user_dict' as a JSON response.
     return (jsonify(user_dict))
@@ -0,0 +1,114 @@
+#!/usr/bin/python3
+"""
+Benchmark of JSON encoding and response compression on the API
+
+Fills a FileStorage (in a temporary directory) with N places spread over
+a few cities, then requests the largest endpoints through Flask's test
+client with each JSON provider (json module, orjson) and each content
+encoding (identity, gzip, br when brotli is installed). Prints the bytes
+on the wire and the p50/p99 latencies, then the time spent encoding and
+compressing the places alone, since request latencies also include the
+storage reload done at the end of every request.
+
+Usage: ./benchmarks/bench_api_encoding.py [N] [REPEAT]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+os.chdir(tempfile.mkdtemp())
+
+from flask.json.provider import DefaultJSONProvider  # noqa: E402
+from api.v1 import compression  # noqa: E402
+from api.v1.app import app  # noqa: E402
+from api.v1.cache import response_cache  # noqa: E402
+from api.v1.json_provider import OrjsonProvider  # noqa: E402
+from models import storage  # noqa: E402
+from models.city import City  # noqa: E402
+from models.place import Place  # noqa: E402
+from models.state import State  # noqa: E402
+
+
+def populate(n):
+    """creates n places in 10 cities"""
+    state = State(name="California")
+    storage.new(state)
+    cities = [City(name="City {}".format(i), state_id=state.id)
+              for i in range(10)]
+    for city in cities:
+        storage.new(city)
+    for i in range(n):
+        storage.new(Place(name="Place {}".format(i), city_id=cities[i % 3].id,
+                          user_id="user", number_rooms=i % 5,
+                          price_by_night=50 + i % 200,
+                          description="A quiet place near the beach " * 4,
+                          latitude=37.0 + i % 100 / 100.0,
+                          longitude=-122.0 + i % 100 / 100.0))
+    for i in range(n // 10):
+        storage.new(State(name="State {}".format(i)))
+    storage.save()
+
+
+def percentile(samples, p):
+    """p-th percentile of samples"""
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * p / 100))]
+
+
+def bench(client, method, path, encoding, repeat):
+    """returns (bytes on the wire, p50 ms, p99 ms) of a request"""
+    headers = {"Accept-Encoding": encoding}
+    samples = []
+    size = 0
+    for _ in range(repeat):
+        response_cache.clear()
+        start = time.perf_counter()
+        if method == "POST":
+            response = client.post(path, json={}, headers=headers)
+        else:
+            response = client.get(path, headers=headers)
+        size = len(response.get_data())
+        samples.append((time.perf_counter() - start) * 1000)
+    return size, percentile(samples, 50), percentile(samples, 99)
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    populate(n)
+    endpoints = [("POST", "/api/v1/places_search"),
+                 ("GET", "/api/v1/places/near?lat=37.5&lng=-121.5"
+                  "&radius=100&limit={}".format(n)),
+                 ("GET", "/api/v1/states")]
+    providers = [("json", DefaultJSONProvider(app)),
+                 ("orjson", OrjsonProvider(app))]
+    client = app.test_client()
+    print("{:<34} {:<7} {:<9} {:>12} {:>9} {:>9}".format(
+        "endpoint", "json", "encoding", "bytes", "p50 ms", "p99 ms"))
+    for method, path in endpoints:
+        for provider_name, provider in providers:
+            app.json = provider
+            for encoding in ["identity"] + compression.encodings:
+                size, p50, p99 = bench(client, method, path, encoding,
+                                       repeat)
+                print("{:<34} {:<7} {:<9} {:>12} {:>9.1f} {:>9.1f}".format(
+                    (method + " " + path)[:34], provider_name, encoding,
+                    size, p50, p99))
+
+    places = [place.to_dict() for place in storage.iter(Place)]
+    print()
+    print("{:<34} {:>12} {:>9}".format("encoding of all places", "bytes",
+                                       "ms"))
+    for provider_name, provider in providers:
+        start = time.perf_counter()
+        body = provider.dumps(places).encode("utf-8")
+        print("{:<34} {:>12} {:>9.1f}".format(
+            provider_name, len(body), (time.perf_counter() - start) * 1000))
+    for encoding in compression.encodings:
+        start = time.perf_counter()
+        size = len(compression.compress(body, encoding))
+        print("{:<34} {:>12} {:>9.1f}".format(
+            encoding, size, (time.perf_counter() - start) * 1000))
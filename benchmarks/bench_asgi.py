@@ -0,0 +1,186 @@
+#!/usr/bin/python3
+"""
+Benchmark of concurrent-connection capacity, threaded WSGI vs ASGI
+
+Starts the API on localhost twice: with werkzeug's threaded server (one
+thread per connection, as app.py does) and with api.v1.asgi behind
+uvicorn, or behind a minimal asyncio HTTP/1.1 server when uvicorn is not
+installed. For each concurrency level C, C clients connect at once and
+each sends REQUESTS requests to /api/v1/places/<id>, one connection per
+request. Prints throughput, p50/p99 latencies, errors and the peak
+number of threads of the process.
+
+Usage: ./benchmarks/bench_asgi.py [C,C,...] [REQUESTS]
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+os.chdir(tempfile.mkdtemp())
+
+from werkzeug.serving import make_server  # noqa: E402
+from api.v1.app import app  # noqa: E402
+from api.v1.asgi import application  # noqa: E402
+from models import storage  # noqa: E402
+from models.place import Place  # noqa: E402
+
+try:
+    import uvicorn
+except ImportError:
+    uvicorn = None
+
+
+def free_port():
+    """returns a free TCP port on localhost"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def handle(reader, writer):
+    """serves one HTTP/1.1 request of a connection with the ASGI app"""
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    method, target, version = lines[0].split(" ")
+    headers = [tuple(line.split(": ", 1)) for line in lines[1:] if line]
+    length = int(dict(headers).get("Content-Length", 0))
+    body = await reader.readexactly(length)
+    path, _, query = target.partition("?")
+    scope = {"type": "http", "method": method, "path": path,
+             "query_string": query.encode("latin-1"), "headers":
+             [(k.lower().encode("latin-1"), v.encode("latin-1"))
+              for k, v in headers],
+             "http_version": version[5:], "server": ("127.0.0.1", 0),
+             "client": writer.get_extra_info("peername")}
+
+    async def receive():
+        """the request body in one message"""
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        """writes the response, closing the connection at its end"""
+        if message["type"] == "http.response.start":
+            writer.write("HTTP/1.1 {} -\r\n".format(
+                message["status"]).encode("latin-1"))
+            for name, value in message["headers"]:
+                writer.write(name + b": " + value + b"\r\n")
+            writer.write(b"Connection: close\r\n\r\n")
+        else:
+            writer.write(message.get("body", b""))
+            await writer.drain()
+
+    await application(scope, receive, send)
+    writer.close()
+
+
+def serve_asgi(port):
+    """runs the ASGI app on port in a background thread"""
+    if uvicorn is not None:
+        server = uvicorn.Server(uvicorn.Config(
+            application, port=port, log_level="error", backlog=4096))
+        thread = threading.Thread(target=server.run, daemon=True)
+        thread.start()
+        while not server.started:
+            time.sleep(0.05)
+        return
+    loop = asyncio.new_event_loop()
+    started = threading.Event()
+
+    def run():
+        """event loop of the server"""
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(asyncio.start_server(
+            handle, "127.0.0.1", port, backlog=4096))
+        started.set()
+        loop.run_forever()
+    threading.Thread(target=run, daemon=True).start()
+    started.wait()
+
+
+def serve_wsgi(port):
+    """runs the Flask app on port with werkzeug's threaded server"""
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    server = make_server("127.0.0.1", port, app, threaded=True)
+    server.socket.listen(4096)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+
+async def client(port, path, requests, latencies, errors):
+    """sends requests GET path requests, one connection each"""
+    for _ in range(requests):
+        start = time.perf_counter()
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1",
+                                                           port)
+            writer.write("GET {} HTTP/1.1\r\nHost: localhost\r\n"
+                         "Connection: close\r\n\r\n".format(path).encode())
+            response = await reader.read()
+            writer.close()
+            if not response.startswith(b"HTTP/1.1 200"):
+                errors.append(response[:12])
+                continue
+        except OSError as error:
+            errors.append(error)
+            continue
+        latencies.append((time.perf_counter() - start) * 1000)
+
+
+def load(port, path, concurrency, requests):
+    """(requests/s, p50 ms, p99 ms, errors, peak threads) of a run"""
+    latencies = []
+    errors = []
+    peak = [threading.active_count()]
+    done = threading.Event()
+
+    def watch():
+        """records the peak number of threads"""
+        while not done.is_set():
+            peak[0] = max(peak[0], threading.active_count())
+            time.sleep(0.01)
+    threading.Thread(target=watch, daemon=True).start()
+
+    async def run():
+        """all the clients at once"""
+        await asyncio.gather(*(client(port, path, requests, latencies,
+                                      errors)
+                               for _ in range(concurrency)))
+    start = time.perf_counter()
+    asyncio.run(run())
+    elapsed = time.perf_counter() - start
+    done.set()
+    latencies.sort()
+    if not latencies:
+        return 0, 0, 0, len(errors), peak[0]
+    return (len(latencies) / elapsed,
+            latencies[len(latencies) // 2],
+            latencies[min(len(latencies) - 1, len(latencies) * 99 // 100)],
+            len(errors), peak[0])
+
+
+if __name__ == "__main__":
+    levels = [int(c) for c in (sys.argv[1] if len(sys.argv) > 1
+                               else "10,100,500").split(",")]
+    requests = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    place = Place(name="Place", city_id="city", user_id="user")
+    storage.new(place)
+    storage.save()
+    path = "/api/v1/places/" + place.id
+    servers = [("threaded", serve_wsgi),
+               ("asgi" if uvicorn is None else "asgi/uvicorn", serve_asgi)]
+    print("{:<14} {:>6} {:>10} {:>9} {:>9} {:>7} {:>8}".format(
+        "server", "conns", "req/s", "p50 ms", "p99 ms", "errors",
+        "threads"))
+    for name, serve in servers:
+        port = free_port()
+        serve(port)
+        for concurrency in levels:
+            print("{:<14} {:>6} {:>10.0f} {:>9.1f} {:>9.1f} {:>7} "
+                  "{:>8}".format(name, concurrency,
+                                 *load(port, path, concurrency, requests)))
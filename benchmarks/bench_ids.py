@@ -0,0 +1,64 @@
+#!/usr/bin/python3
+"""
+Benchmark of the id generators on insert throughput
+
+Inserts N rows keyed by each id scheme into a SQLite table clustered on
+its primary key (WITHOUT ROWID, like InnoDB) and through FileStorage.new,
+and prints rows per second for each scheme.
+
+Usage: ./benchmarks/bench_ids.py [N]
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from models import id_generator  # noqa: E402
+
+
+def bench_generate(generator, n):
+    """returns ids generated per second"""
+    start = time.perf_counter()
+    for _ in range(n):
+        generator()
+    return n / (time.perf_counter() - start)
+
+
+def bench_sqlite(generator, n, binary=False):
+    """returns rows inserted per second in a clustered SQLite table"""
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE places (id {} PRIMARY KEY, name TEXT)"
+                 " WITHOUT ROWID".format("BLOB" if binary else "TEXT"))
+    start = time.perf_counter()
+    for _ in range(0, n, 1000):
+        rows = []
+        for _ in range(1000):
+            value = generator()
+            if binary:
+                value = id_generator.id_to_bytes(value)
+            rows.append((value, "place"))
+        conn.executemany("INSERT INTO places VALUES (?, ?)", rows)
+        conn.commit()
+    elapsed = time.perf_counter() - start
+    conn.close()
+    os.remove(path)
+    return n / elapsed
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    print("{:<8} {:>14} {:>16} {:>16}".format(
+        "scheme", "ids/s", "sqlite text/s", "sqlite bin16/s"))
+    for name, generator in sorted(id_generator.generators.items()):
+        binary = "-"
+        if name != "ulid":
+            binary = "{:.0f}".format(bench_sqlite(generator, n, True))
+        print("{:<8} {:>14.0f} {:>16.0f} {:>16}".format(
+            name, bench_generate(generator, n),
+            bench_sqlite(generator, n), binary))
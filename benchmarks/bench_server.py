@@ -0,0 +1,130 @@
+#!/usr/bin/python3
+"""
+Benchmark of the preforking launcher: throughput per worker and memory
+
+Writes N places to a file.json in a temporary directory, then for each
+worker count W starts "python3 -m api.v1.server" with W workers there and
+runs as many client processes, each sending GET /api/v1/places/<id> on a
+keep-alive connection for SECONDS seconds. Prints requests per second in
+total and per worker, and the proportional set size (PSS, shared pages
+split between processes) of the master and workers, which shows the
+storage loaded by the master being shared copy-on-write.
+
+Usage: ./benchmarks/bench_server.py [W,W,...] [N] [SECONDS]
+"""
+
+import http.client
+import multiprocessing
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+os.chdir(tempfile.mkdtemp())
+
+from models import storage  # noqa: E402
+from models.place import Place  # noqa: E402
+
+
+def populate(n):
+    """writes n places to file.json and returns the id of one of them"""
+    places = [Place(name="Place {}".format(i), city_id="city",
+                    user_id="user", description="A quiet place " * 8)
+              for i in range(n)]
+    for place in places:
+        storage.new(place)
+    storage.save()
+    return places[0].id
+
+
+def free_port():
+    """returns a free TCP port on localhost"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def client(port, path, seconds):
+    """number of requests answered on one connection during seconds"""
+    connection = http.client.HTTPConnection("127.0.0.1", port)
+    count = 0
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        connection.request("GET", path)
+        response = connection.getresponse()
+        response.read()
+        if response.status == 200:
+            count += 1
+    connection.close()
+    return count
+
+
+def pss(pid):
+    """proportional set size of a process in MB, 0 if unavailable"""
+    try:
+        with open("/proc/{}/smaps_rollup".format(pid)) as f:
+            for line in f:
+                if line.startswith("Pss:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return 0
+
+
+def children(pid):
+    """pids of the child processes of pid"""
+    try:
+        with open("/proc/{}/task/{}/children".format(pid, pid)) as f:
+            return [int(child) for child in f.read().split()]
+    except OSError:
+        return []
+
+
+def wait_ready(port, timeout=30):
+    """waits until the server accepts connections"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), 1).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError("server did not start")
+
+
+if __name__ == "__main__":
+    levels = [int(w) for w in (sys.argv[1] if len(sys.argv) > 1
+                               else "1,2,4").split(",")]
+    n = int(sys.argv[2]) if len(sys.argv) > 2 else 10000
+    seconds = float(sys.argv[3]) if len(sys.argv) > 3 else 5
+    path = "/api/v1/places/" + populate(n)
+    print("{:>7} {:>10} {:>12} {:>14} {:>14}".format(
+        "workers", "req/s", "req/s/worker", "master PSS MB",
+        "workers PSS MB"))
+    for workers in levels:
+        port = free_port()
+        env = dict(os.environ, HBNB_API_PORT=str(port),
+                   HBNB_API_HOST="127.0.0.1",
+                   HBNB_API_WORKERS=str(workers),
+                   PYTHONPATH=ROOT)
+        master = subprocess.Popen([sys.executable, "-m", "api.v1.server"],
+                                  env=env, stdout=subprocess.DEVNULL,
+                                  stderr=subprocess.DEVNULL)
+        try:
+            wait_ready(port)
+            with multiprocessing.Pool(workers) as pool:
+                counts = pool.starmap(client,
+                                      [(port, path, seconds)] * workers)
+            total = sum(counts) / seconds
+            worker_pss = sum(pss(pid) for pid in children(master.pid))
+            print("{:>7} {:>10.0f} {:>12.0f} {:>14.1f} {:>14.1f}".format(
+                workers, total, total / workers, pss(master.pid),
+                worker_pss))
+        finally:
+            master.send_signal(signal.SIGTERM)
+            master.wait()
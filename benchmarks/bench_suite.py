@@ -0,0 +1,248 @@
+#!/usr/bin/python3
+"""
+Benchmark suite of the storage engines and the API, with saved results
+
+For each engine (file, db) and each dataset size N, runs a fresh process
+in a temporary directory that writes a dataset of N objects with
+generate_data.py (the proportions of its defaults), then times:
+    - the storage methods: reload (cold, and warm with nothing changed,
+      FileStorage only), save (one object changed, and everything
+      re-serialized for FileStorage), get, get_many, count and all;
+    - the main API routes through Flask's test client.
+DBStorage runs on a SQLite file, or on the database of HBNB_DB_URL when
+it is set (it must be empty). Each measure is repeated and its median
+and minimum are kept.
+
+Results are printed and written as JSON to OUTPUT (bench_suite.json by
+default) with the commit they were measured on. Given the results of
+another commit with --compare, prints the ratio of every measure and
+exits with status 1 when one is more than THRESHOLD slower.
+
+Usage: ./benchmarks/bench_suite.py [--sizes N,N,...] [--engines E,E]
+                                    [--repeat R] [--output OUTPUT]
+                                    [--compare BASE] [--threshold T]
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def timed(name, func, repeat, ops=1, setup=None):
+    """median and minimum seconds per operation of func (ops operations)"""
+    samples = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) / ops)
+    samples.sort()
+    return {"name": name, "median": samples[len(samples) // 2],
+            "min": samples[0]}
+
+
+def populate(storage, n):
+    """generates about n objects of every class, returns the ids by class"""
+    from generate_data import COUNTS, Generator
+    total = sum(COUNTS.values())
+    counts = {name: max(1, round(count * n / total))
+              for name, count in COUNTS.items()}
+    return Generator(storage).generate(counts)
+
+
+def forget(storage):
+    """empties the memory of FileStorage, so the next reload is cold"""
+    from models.engine.search_index import SearchIndex
+    cls = type(storage)
+    cls._FileStorage__objects.clear()
+    cls._FileStorage__records.clear()
+    cls._FileStorage__dirty.clear()
+    cls._FileStorage__generation = None
+    cls._FileStorage__indexed = None
+    cls._FileStorage__index = SearchIndex()
+
+
+def bench_storage(storage, ids, repeat):
+    """measures of the storage methods"""
+    from models.place import Place
+    db = type(storage).__name__ == "DBStorage"
+    rng = random.Random(1)
+    sample = [rng.choice(ids["Place"]) for _ in range(1000)]
+    # DBStorage memoizes in the session of a request: start each sample
+    # with a new one, as a request would
+    fresh = storage.close if db else None
+    results = []
+    if not db:
+        results.append(timed("reload cold", storage.reload, repeat,
+                             setup=lambda: forget(storage)))
+        results.append(timed("reload warm", storage.reload, repeat))
+    place = storage.get(Place, sample[0])
+
+    def save_one():
+        """saves one modified place"""
+        place.name = place.name + "!"
+        place.save()
+    results.append(timed("save one", save_one, repeat))
+    if not db:
+        results.append(timed(
+            "save full", storage.save, repeat,
+            setup=lambda: type(storage)._FileStorage__records.clear()))
+    results.append(timed("get", lambda: [storage.get(Place, id)
+                                         for id in sample],
+                         repeat, ops=len(sample), setup=fresh))
+    results.append(timed("get_many 1000", lambda: storage.get_many(
+        Place, sample), repeat, setup=fresh))
+    results.append(timed("count", storage.count, repeat, setup=fresh))
+    results.append(timed("count Place", lambda: storage.count(Place),
+                         repeat, setup=fresh))
+    results.append(timed("all", storage.all, repeat, setup=fresh))
+    results.append(timed("all Place", lambda: storage.all(Place), repeat,
+                         setup=fresh))
+    return results
+
+
+def bench_api(ids, repeat, requests=20):
+    """measures of the main API routes"""
+    from api.v1.app import app
+    client = app.test_client()
+    place_id = ids["Place"][0]
+    routes = [
+        ("GET /stats", "get", "/api/v1/stats", None),
+        ("GET /states", "get", "/api/v1/states", None),
+        ("GET /places/<id>", "get", "/api/v1/places/" + place_id, None),
+        ("GET /places/<id>?expand", "get", "/api/v1/places/" + place_id +
+         "?expand=amenities,reviews", None),
+        ("POST /places_search state", "post", "/api/v1/places_search",
+         {"states": [ids["State"][0]]}),
+        ("GET /places/near", "get",
+         "/api/v1/places/near?lat=0&lng=0&radius=500", None),
+    ]
+    results = []
+    for name, method, path, body in routes:
+        def send():
+            """sends the request requests times"""
+            for _ in range(requests):
+                response = getattr(client, method)(path, json=body)
+                response.get_data()
+                if response.status_code != 200:
+                    raise RuntimeError("{}: {}".format(
+                        name, response.status_code))
+        results.append(timed(name, send, repeat, ops=requests))
+    return results
+
+
+def run_engine(engine, size, repeat):
+    """measures of one engine and size in a new process"""
+    directory = tempfile.mkdtemp()
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    env.pop("HBNB_TYPE_STORAGE", None)
+    if engine == "db":
+        env["HBNB_TYPE_STORAGE"] = "db"
+        env.setdefault("HBNB_DB_URL", "sqlite:///" +
+                       os.path.join(directory, "bench.db"))
+    try:
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--run", engine,
+             str(size), str(repeat)], cwd=directory, env=env,
+            stdout=subprocess.PIPE, check=True).stdout
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    results = json.loads(output)
+    for result in results:
+        result.update(engine=engine, size=size)
+    return results
+
+
+def run_here(engine, size, repeat):
+    """body of the process measuring one engine and size"""
+    sys.path.insert(0, ROOT)
+    from models import storage
+    start = time.perf_counter()
+    ids = populate(storage, size)
+    elapsed = time.perf_counter() - start
+    results = [{"name": "populate", "median": elapsed, "min": elapsed}]
+    results += bench_storage(storage, ids, repeat)
+    results += bench_api(ids, repeat)
+    json.dump(results, sys.stdout)
+
+
+def commit():
+    """short hash of the checked out commit, None outside git"""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"],
+                              cwd=ROOT, stdout=subprocess.PIPE,
+                              stderr=subprocess.DEVNULL,
+                              check=True).stdout.decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, base, threshold):
+    """prints current vs base medians, returns the number of regressions"""
+    before = {(r["engine"], r["size"], r["name"]): r["median"]
+              for r in base["results"]}
+    regressions = 0
+    print("\ncompared with {}".format(base.get("commit")))
+    print("{:<6} {:>8} {:<28} {:>11} {:>11} {:>7}".format(
+        "engine", "size", "measure", "base us", "now us", "ratio"))
+    for r in results:
+        old = before.get((r["engine"], r["size"], r["name"]))
+        if not old:
+            continue
+        ratio = r["median"] / old
+        slower = ratio > 1 + threshold
+        regressions += slower
+        print("{:<6} {:>8} {:<28} {:>11.1f} {:>11.1f} {:>7.2f}{}".format(
+            r["engine"], r["size"], r["name"], old * 1e6,
+            r["median"] * 1e6, ratio, "  slower" if slower else ""))
+    return regressions
+
+
+def main():
+    """runs the suite configured by the command line"""
+    parser = argparse.ArgumentParser(description="HBNB benchmark suite")
+    parser.add_argument("--sizes", default="10000,100000,1000000")
+    parser.add_argument("--engines", default="file,db")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", default="bench_suite.json")
+    parser.add_argument("--compare")
+    parser.add_argument("--threshold", type=float, default=0.1)
+    parser.add_argument("--run", nargs=3, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.run:
+        engine, size, repeat = args.run
+        return run_here(engine, int(size), int(repeat))
+    results = []
+    print("{:<6} {:>8} {:<28} {:>11} {:>11}".format(
+        "engine", "size", "measure", "median us", "min us"))
+    for size in [int(n) for n in args.sizes.split(",")]:
+        for engine in args.engines.split(","):
+            for r in run_engine(engine, size, args.repeat):
+                results.append(r)
+                print("{:<6} {:>8} {:<28} {:>11.1f} {:>11.1f}".format(
+                    engine, size, r["name"], r["median"] * 1e6,
+                    r["min"] * 1e6), flush=True)
+    with open(args.output, "w") as f:
+        json.dump({"commit": commit(), "date": time.strftime(
+            "%Y-%m-%dT%H:%M:%S"), "python": platform.python_version(),
+            "machine": platform.machine(), "results": results}, f,
+            indent=1)
+    if args.compare:
+        with open(args.compare) as f:
+            base = json.load(f)
+        if compare(results, base, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,390 @@
+#!/usr/bin/python3
+"""
+HTTP load test of the API: a weighted mix of calls or a recorded capture
+
+Starts "python3 -m api.v1.server" with WORKERS workers on the storage of
+the current directory (file.json, or the database of the HBNB_* variables)
+unless --url points to a running server. Optionally fills that storage
+first with ./generate_data.py --scale GENERATE.
+
+Then CONCURRENCY threads, each on its own keep-alive connection, send
+requests for DURATION seconds (or REQUESTS requests in total), either:
+    - drawn from a weighted mix (--mix name=weight,...) of:
+        get_place   GET /places/<id> of a random place
+        search      POST /places_search in a random state, with a price
+                    range half of the time
+        review      POST /places/<id>/reviews by a random user
+        stats       GET /stats
+      The ids are read from the API before starting;
+    - or replayed from a NDJSON capture (--replay FILE), one request per
+      line: {"method": "GET", "path": "/api/v1/...", "body": {...},
+      "t": seconds since the start, "name": call name}. Only "path" is
+      required; without "name", calls are named after their path with ids
+      replaced. With --timed requests are sent at their "t" offsets
+      instead of as fast as possible. --record FILE writes the requests
+      sent in this format.
+
+Prints, per call and in total, the throughput, the p50/p90/p99/max
+latencies and the error rate (status >= 400 or failed connections);
+--json writes the same as JSON.
+
+Usage: ./benchmarks/load_test.py [--url URL] [--workers W]
+                                 [--generate SCALE] [--concurrency C]
+                                 [--duration S] [--requests N]
+                                 [--mix MIX] [--replay FILE] [--timed]
+                                 [--record FILE] [--seed S] [--json FILE]
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import re
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+from urllib.parse import urlsplit
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Path segments holding an id (uuid or ulid), grouped in the report of a
+# replay.
+ID = re.compile(r"/(?:[0-9a-fA-F]{8}-(?:[0-9a-fA-F]{4}-){3}[0-9a-fA-F]{12}"
+                r"|[0-9A-HJKMNP-TV-Z]{26})(?=/|$)")
+# Weights of the calls of the default mix.
+MIX = {"get_place": 50, "search": 20, "review": 10, "stats": 20}
+# Methods safe to send twice when the first attempt may have been served.
+IDEMPOTENT = ("GET", "HEAD", "OPTIONS", "PUT", "DELETE")
+
+
+def percentile(samples, p):
+    """p-th percentile of sorted samples"""
+    return samples[min(len(samples) - 1, int(len(samples) * p / 100))]
+
+
+def free_port():
+    """returns a free TCP port on localhost"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(workers):
+    """starts the API on a free port, returns (process, base url)"""
+    port = free_port()
+    env = dict(os.environ, HBNB_API_HOST="127.0.0.1",
+               HBNB_API_PORT=str(port), HBNB_API_WORKERS=str(workers),
+               PYTHONPATH=ROOT)
+    server = subprocess.Popen([sys.executable, "-m", "api.v1.server"],
+                              env=env, stdout=subprocess.DEVNULL,
+                              stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 60
+    while True:
+        try:
+            socket.create_connection(("127.0.0.1", port), 1).close()
+            break
+        except OSError:
+            if server.poll() is not None or time.monotonic() > deadline:
+                raise RuntimeError("the server did not start")
+            time.sleep(0.1)
+    return server, "http://127.0.0.1:{}".format(port)
+
+
+class Client:
+    """one keep-alive connection to the server"""
+
+    def __init__(self, url):
+        """
+        Initialize the client.
+
+        Args:
+            url: Base URL of the server.
+        """
+        parts = urlsplit(url)
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.connection = None
+
+    def send(self, method, path, body=None):
+        """
+        Send one request and read the whole response.
+
+        Returns:
+            (status, body bytes), status 0 when the connection failed.
+        """
+        headers = {}
+        data = None
+        if body is not None:
+            data = json.dumps(body).encode()
+            headers["Content-Type"] = "application/json"
+        for attempt in range(2 if method in IDEMPOTENT else 1):
+            if self.connection is None:
+                self.connection = http.client.HTTPConnection(
+                    self.host, self.port, timeout=30)
+            try:
+                self.connection.request(method, path, data, headers)
+                response = self.connection.getresponse()
+                return response.status, response.read()
+            except (OSError, http.client.HTTPException):
+                # the server may close idle keep-alive connections: retry
+                # once on a new one, unless a retry could apply a write
+                # twice (a POST creating a review)
+                self.connection.close()
+                self.connection = None
+        return 0, b""
+
+
+class Mix:
+    """draws the requests of the weighted mix"""
+
+    def __init__(self, url, weights, rng):
+        """
+        Initialize the mix with ids read from the API.
+
+        Args:
+            url: Base URL of the server.
+            weights: {call name: weight}.
+            rng: The random.Random to draw from.
+        """
+        client = Client(url)
+        self.rng = rng
+        self.names = [name for name in weights if weights[name] > 0]
+        self.weights = [weights[name] for name in self.names]
+        self.places = self.ids(client, "POST", "/api/v1/places_search",
+                               {"fields": ["id"]})
+        self.states = self.ids(client, "GET", "/api/v1/states?fields=id")
+        self.users = self.ids(client, "GET", "/api/v1/users?fields=id")
+        if not self.places or not self.users:
+            raise RuntimeError("no places or users to load test with, "
+                               "see --generate")
+
+    @staticmethod
+    def ids(client, method, path, body=None):
+        """ids of the objects listed by the request"""
+        status, data = client.send(method, path, body)
+        if status != 200:
+            raise RuntimeError("{} {}: {}".format(method, path, status))
+        return [obj["id"] for obj in json.loads(data)]
+
+    def next(self):
+        """(name, method, path, body) of a request of the mix"""
+        rng = self.rng
+        name = rng.choices(self.names, self.weights)[0]
+        if name == "get_place":
+            return (name, "GET",
+                    "/api/v1/places/" + rng.choice(self.places), None)
+        if name == "search":
+            body = {"states": [rng.choice(self.states)]}
+            if rng.random() < 0.5:
+                low = rng.randrange(0, 200, 10)
+                body["price_by_night"] = {"min": low, "max": low + 50}
+            return name, "POST", "/api/v1/places_search", body
+        if name == "review":
+            return (name, "POST", "/api/v1/places/{}/reviews".format(
+                rng.choice(self.places)),
+                {"user_id": rng.choice(self.users), "text": "Load test"})
+        return name, "GET", "/api/v1/stats", None
+
+
+class Capture:
+    """replays the requests of a NDJSON capture"""
+
+    def __init__(self, path):
+        """
+        Initialize the replay.
+
+        Args:
+            path: The NDJSON file, one request per line.
+        """
+        with open(path) as f:
+            self.requests = [json.loads(line) for line in f if line.strip()]
+        if all("t" in request for request in self.requests):
+            self.requests.sort(key=lambda request: request["t"])
+        self.position = 0
+        self.lock = threading.Lock()
+
+    def next(self):
+        """(name, method, path, body, offset) of the next request, or None"""
+        with self.lock:
+            if self.position >= len(self.requests):
+                return None
+            request = self.requests[self.position]
+            self.position += 1
+        method = request.get("method", "GET").upper()
+        name = request.get("name") or "{} {}".format(
+            method, ID.sub("/<id>", request["path"].split("?")[0]))
+        return (name, method, request["path"], request.get("body"),
+                request.get("t"))
+
+
+class Recorder:
+    """accumulates the results of the requests"""
+
+    def __init__(self, record=None):
+        """
+        Initialize the recorder.
+
+        Args:
+            record: Open file receiving the NDJSON capture, or None.
+        """
+        self.lock = threading.Lock()
+        self.latencies = {}
+        self.errors = {}
+        self.record = record
+        self.start = time.monotonic()
+
+    def add(self, name, method, path, body, status, latency, sent):
+        """records one request"""
+        with self.lock:
+            self.latencies.setdefault(name, []).append(latency)
+            if status == 0 or status >= 400:
+                errors = self.errors.setdefault(name, {})
+                errors[status] = errors.get(status, 0) + 1
+            if self.record is not None:
+                line = {"name": name, "method": method, "path": path,
+                        "t": round(sent - self.start, 6)}
+                if body is not None:
+                    line["body"] = body
+                self.record.write(json.dumps(line) + "\n")
+
+    def report(self, elapsed):
+        """{call name: statistics}, with a "total" entry"""
+        report = {}
+        everything = []
+        for name in sorted(self.latencies):
+            everything += self.latencies[name]
+            report[name] = self.statistics(self.latencies[name],
+                                           self.errors.get(name, {}),
+                                           elapsed)
+        errors = {}
+        for by_status in self.errors.values():
+            for status, count in by_status.items():
+                errors[status] = errors.get(status, 0) + count
+        report["total"] = self.statistics(everything, errors, elapsed)
+        return report
+
+    @staticmethod
+    def statistics(latencies, errors, elapsed):
+        """throughput, latency percentiles (ms) and errors of requests"""
+        latencies = sorted(latencies)
+        failed = sum(errors.values())
+        return {"requests": len(latencies),
+                "rps": len(latencies) / elapsed,
+                "p50": percentile(latencies, 50) * 1000,
+                "p90": percentile(latencies, 90) * 1000,
+                "p99": percentile(latencies, 99) * 1000,
+                "max": latencies[-1] * 1000,
+                "errors": failed,
+                "error_rate": failed / len(latencies),
+                "statuses": {str(status): count
+                             for status, count in sorted(errors.items())}}
+
+
+def worker(url, source, recorder, deadline, budget, timed):
+    """sends requests of source until the deadline or the budget is over"""
+    client = Client(url)
+    while time.monotonic() < deadline:
+        with budget[1]:
+            if budget[0] == 0:
+                return
+            budget[0] -= 1
+        request = source.next()
+        if request is None:
+            return
+        name, method, path, body = request[:4]
+        if timed and len(request) > 4 and request[4] is not None:
+            delay = recorder.start + request[4] - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+        sent = time.monotonic()
+        start = time.perf_counter()
+        status, data = client.send(method, path, body)
+        recorder.add(name, method, path, body, status,
+                     time.perf_counter() - start, sent)
+
+
+def run(url, source, concurrency, duration, requests, timed, record):
+    """runs the load, returns the report"""
+    recorder = Recorder(record)
+    deadline = time.monotonic() + duration
+    # [requests left (-1: unlimited), lock]
+    budget = [requests or -1, threading.Lock()]
+    threads = [threading.Thread(target=worker, args=(
+        url, source, recorder, deadline, budget, timed))
+        for _ in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    if not recorder.latencies:
+        raise RuntimeError("no request was sent")
+    return recorder.report(elapsed)
+
+
+def main():
+    """runs the load test configured by the command line"""
+    parser = argparse.ArgumentParser(description="HBNB API load test")
+    parser.add_argument("--url")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--generate", type=float)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--requests", type=int)
+    parser.add_argument("--mix", default=",".join(
+        "{}={}".format(name, weight) for name, weight in MIX.items()))
+    parser.add_argument("--replay")
+    parser.add_argument("--timed", action="store_true")
+    parser.add_argument("--record")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json")
+    args = parser.parse_args()
+    if args.generate:
+        subprocess.run([sys.executable, os.path.join(ROOT, "generate_data.py"),
+                        "--scale", str(args.generate),
+                        "--seed", str(args.seed)], check=True)
+    server = None
+    url = args.url
+    if url is None:
+        server, url = start_server(args.workers)
+    record = open(args.record, "w") if args.record else None
+    try:
+        if args.replay:
+            source = Capture(args.replay)
+        else:
+            weights = {}
+            for item in args.mix.split(","):
+                name, weight = item.split("=")
+                if name not in MIX:
+                    parser.error("unknown call {}".format(name))
+                weights[name] = float(weight)
+            source = Mix(url, weights, random.Random(args.seed))
+        report = run(url, source, args.concurrency, args.duration,
+                     args.requests, args.timed, record)
+    finally:
+        if record is not None:
+            record.close()
+        if server is not None:
+            server.send_signal(signal.SIGTERM)
+            server.wait()
+    print("{:<32} {:>8} {:>9} {:>8} {:>8} {:>8} {:>8} {:>7}".format(
+        "call", "requests", "req/s", "p50 ms", "p90 ms", "p99 ms",
+        "max ms", "errors"))
+    for name, stats in report.items():
+        print("{:<32} {:>8} {:>9.1f} {:>8.1f} {:>8.1f} {:>8.1f} {:>8.1f} "
+              "{:>6.1%}".format(name, stats["requests"], stats["rps"],
+                                stats["p50"], stats["p90"], stats["p99"],
+                                stats["max"], stats["error_rate"]))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"url": url, "concurrency": args.concurrency,
+                       "report": report}, f, indent=1)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,7 @@ import models
 from models.amenity import Amenity
 from models.base_model import BaseModel
 from models.city import City
+from models.password_hasher import hasher
 from models.place import Place
 from models.review import Review
 from models.state import State
@@ -96,7 +97,7 @@ class HBNBCommand(cmd.Cmd):
             if len(args) > 1:
                 key = args[0] + "." + args[1]
                 if key in models.storage.all():
-                    models.storage.all().pop(key)
+                    models.storage.delete(models.storage.all()[key])
                     models.storage.save()
                 else:
                     print("** no instance found **")
@@ -108,18 +109,16 @@ class HBNBCommand(cmd.Cmd):
     def do_all(self, arg):
         """Prints string representations of instances"""
         args = shlex.split(arg)
-        obj_list = []
         if len(args) == 0:
-            obj_dict = models.storage.all()
+            objs = models.storage.iter()
         elif args[0] in classes:
-            obj_dict = models.storage.all(classes[args[0]])
+            objs = models.storage.iter(classes[args[0]])
         else:
             print("** class doesn't exist **")
             return False
-        for key in obj_dict:
-            obj_list.append(str(obj_dict[key]))
         print("[", end="")
-        print(", ".join(obj_list), end="")
+        for i, obj in enumerate(objs):
+            print(", " if i else "", obj, sep="", end="")
         print("]")
 
     def do_update(self, arg):
@@ -147,6 +146,9 @@ class HBNBCommand(cmd.Cmd):
                                         args[3] = float(args[3])
                                     except:
                                         args[3] = 0.0
+                            elif (args[0] == "User" and
+                                  args[2] == "password"):
+                                args[3] = hasher.hash(args[3])
                             setattr(models.storage.all()[k], args[2], args[3])
                             models.storage.all()[k].save()
                         else:
@@ -0,0 +1,235 @@
+#!/usr/bin/python3
+"""
+Generates a synthetic HBNB dataset for load testing
+
+Writes states, cities, users, amenities, places and reviews forming a
+consistent graph (every foreign key points to an object of the dataset)
+through the bulk path of the configured storage engine (new_many), so
+HBNB_TYPE_STORAGE selects FileStorage or DBStorage as for the console.
+
+Parents are picked with a Zipf distribution of exponent SKEW over a
+random order of the candidates: a few states have most of the cities, a
+few cities most of the places, a few hosts most of the listings and a
+few places most of the reviews, as in real data. SKEW 0 spreads them
+uniformly. Places get a random number of amenities (popular ones more
+often) and coordinates around the center of their city. The same SEED
+gives the same ids, names and links.
+
+Usage: ./generate_data.py [--scale F] [--states N] [--cities N]
+                          [--users N] [--amenities N] [--places N]
+                          [--reviews N] [--amenities-per-place N]
+                          [--skew S] [--seed S] [--batch N]
+"""
+
+import argparse
+from datetime import datetime, timedelta
+import itertools
+import random
+import sys
+import time
+import uuid
+import models
+from models.amenity import Amenity
+from models.city import City
+from models.password_hasher import hasher
+from models.place import Place
+from models.review import Review
+from models.state import State
+from models.user import User
+
+# Number of objects of each class at scale 1.
+COUNTS = {"State": 50, "City": 1000, "User": 10000, "Amenity": 50,
+          "Place": 20000, "Review": 100000}
+# Classes whose objects link to objects of the listed classes.
+PARENTS = {"City": ("State",), "Place": ("City", "User"),
+           "Review": ("Place", "User")}
+
+
+class Zipf:
+    """picks items with probability proportional to 1 / rank ** skew"""
+
+    def __init__(self, items, skew, rng):
+        """
+        Initialize the distribution.
+
+        Args:
+            items: The candidates, ranked in a random order.
+            skew: The exponent, 0 for a uniform distribution.
+            rng: The random.Random to draw from.
+        """
+        self.items = list(items)
+        rng.shuffle(self.items)
+        self.rng = rng
+        self.weights = list(itertools.accumulate(
+            1 / rank ** skew for rank in range(1, len(self.items) + 1)))
+
+    def pick(self, k=1):
+        """k items, with replacement"""
+        if not k:
+            return []
+        return self.rng.choices(self.items, cum_weights=self.weights, k=k)
+
+    def sample(self, k):
+        """at most k distinct items"""
+        return list(dict.fromkeys(self.pick(k)))
+
+
+class Generator:
+    """writes a dataset with storage.new_many in batches"""
+
+    def __init__(self, storage, seed=0, skew=1.0, batch=10000):
+        """
+        Initialize the generator.
+
+        Args:
+            storage: The storage engine to write to.
+            seed: Seed of every random choice (ids included).
+            skew: Zipf exponent of the parent choices.
+            batch: Objects passed to new_many at once.
+        """
+        self.storage = storage
+        self.rng = random.Random(seed)
+        self.skew = skew
+        self.batch = batch
+        self.start = datetime(2020, 1, 1)
+        self.ids = {}
+        # hashed once and assigned to every user (see user)
+        self.password = hasher.hash("password")
+
+    def make(self, cls, **kwargs):
+        """an instance of cls with a seeded id and creation date"""
+        id = uuid.UUID(int=self.rng.getrandbits(128), version=4)
+        obj = cls(id=str(id), **kwargs)
+        obj.created_at = obj.updated_at = self.start + timedelta(
+            seconds=self.rng.randrange(5 * 365 * 86400))
+        return obj
+
+    def user(self, i):
+        """user i, with the password hashed once in __init__"""
+        user = self.make(User, email="user{}@hbnb.io".format(i),
+                         first_name="First{}".format(i),
+                         last_name="Last{}".format(i))
+        user.password = self.password
+        return user
+
+    def write(self, objs):
+        """stores objs by batches, returns their ids"""
+        ids = []
+        for chunk in iter(lambda: list(itertools.islice(objs, self.batch)),
+                          []):
+            self.storage.new_many(chunk)
+            # DBStorage commits every batch, FileStorage writes the file
+            # once at the end
+            if models.storage_t == "db":
+                self.storage.save()
+            ids.extend(obj.id for obj in chunk)
+        if ids:
+            self.ids.setdefault(chunk[0].__class__.__name__, []).extend(ids)
+        return ids
+
+    def zipf(self, ids):
+        """Zipf distribution over ids"""
+        return Zipf(ids, self.skew, self.rng)
+
+    def generate(self, counts, amenities_per_place=5):
+        """
+        Write the dataset.
+
+        Args:
+            counts: Number of objects by class name (see COUNTS).
+            amenities_per_place: Mean number of amenities of a place.
+
+        Returns:
+            The ids of the objects written, by class name.
+        """
+        rng = self.rng
+        states = self.write(self.make(State, name="State {}".format(i))
+                            for i in range(counts["State"]))
+        by_state = self.zipf(states)
+        centers = {}
+
+        def cities():
+            """cities of skewed states, with a center for their places"""
+            for i, state_id in enumerate(by_state.pick(counts["City"])):
+                city = self.make(City, name="City {}".format(i),
+                                 state_id=state_id)
+                centers[city.id] = (rng.uniform(-60, 60),
+                                    rng.uniform(-180, 180))
+                yield city
+        by_city = self.zipf(self.write(cities()))
+        users = self.write(self.user(i) for i in range(counts["User"]))
+        by_host = self.zipf(users)
+        amenities = self.write(self.make(Amenity,
+                                         name="Amenity {}".format(i))
+                               for i in range(counts["Amenity"]))
+        by_amenity = self.zipf(amenities) if amenities else None
+
+        def places():
+            """places of skewed cities and hosts, with amenities"""
+            hosts = by_host.pick(counts["Place"])
+            for i, city_id in enumerate(by_city.pick(counts["Place"])):
+                lat, lng = centers[city_id]
+                place = self.make(
+                    Place, name="Place {}".format(i), city_id=city_id,
+                    user_id=hosts[i], description="A lovely place " * 4,
+                    number_rooms=rng.randint(1, 6),
+                    number_bathrooms=rng.randint(1, 3),
+                    max_guest=rng.randint(1, 10),
+                    price_by_night=int(rng.lognormvariate(4.5, 0.6)),
+                    latitude=lat + rng.gauss(0, 0.05),
+                    longitude=lng + rng.gauss(0, 0.05))
+                place.amenity_ids = [] if by_amenity is None else (
+                    by_amenity.sample(rng.randint(
+                        0, 2 * amenities_per_place)))
+                yield place
+        by_place = self.zipf(self.write(places()))
+        by_reviewer = self.zipf(users)
+
+        def reviews():
+            """reviews of skewed places by skewed users"""
+            for i in range(counts["Review"]):
+                yield self.make(Review, text="Review {}".format(i),
+                                place_id=by_place.pick()[0],
+                                user_id=by_reviewer.pick()[0])
+        self.write(reviews())
+        self.storage.save()
+        return self.ids
+
+
+def main():
+    """generates the dataset configured by the command line"""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--scale", type=float, default=1,
+                        help="multiplies every count but amenities")
+    for name, count in COUNTS.items():
+        option = {"City": "cities", "Amenity": "amenities"}.get(
+            name, name.lower() + "s")
+        parser.add_argument("--" + option, type=int, dest=name, metavar="N",
+                            help="default {} times the scale".format(count))
+    parser.add_argument("--amenities-per-place", type=int, default=5)
+    parser.add_argument("--skew", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--batch", type=int, default=10000)
+    args = parser.parse_args()
+    counts = {}
+    for name, count in COUNTS.items():
+        counts[name] = getattr(args, name)
+        if counts[name] is None:
+            counts[name] = (count if name == "Amenity"
+                            else max(1, round(count * args.scale)))
+    for name, parents in PARENTS.items():
+        for parent in parents:
+            if counts[name] > 0 and counts[parent] <= 0:
+                parser.error("{} objects need at least one {}".format(
+                    name, parent))
+    start = time.perf_counter()
+    Generator(models.storage, args.seed, args.skew, args.batch).generate(
+        counts, args.amenities_per_place)
+    elapsed = time.perf_counter() - start
+    total = sum(counts.values())
+    print("{} objects in {:.1f}s ({:.0f}/s)".format(
+        total, elapsed, total / elapsed), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
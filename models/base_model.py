@@ -5,24 +5,54 @@ Contains class BaseModel
 
 from datetime import datetime
 import models
+from models import id_generator
 from os import getenv
-import sqlalchemy
-from sqlalchemy import Column, String, DateTime
-from sqlalchemy.ext.declarative import declarative_base
-import uuid
 
 time = "%Y-%m-%dT%H:%M:%S.%f"
 
+# SQLAlchemy is only imported in DB mode, file mode never pays for it
 if models.storage_t == "db":
+    from sqlalchemy import BINARY, Column, String, DateTime
+    from sqlalchemy.ext.declarative import declarative_base
+    from sqlalchemy.types import TypeDecorator
+
     Base = declarative_base()
+
+    class BinaryId(TypeDecorator):
+        """Stores UUID formatted ids as BINARY(16) instead of strings"""
+        impl = BINARY(16)
+        cache_ok = True
+
+        def process_bind_param(self, value, dialect):
+            """converts the id string to 16 bytes on the way to the db"""
+            if value is None:
+                return None
+            return id_generator.id_to_bytes(value)
+
+        def process_result_value(self, value, dialect):
+            """converts 16 bytes back to the id string"""
+            if value is None:
+                return None
+            return id_generator.id_from_bytes(value)
 else:
     Base = object
 
 
+def id_type():
+    """returns the column type for ids and foreign keys
+
+    BINARY(16) when HBNB_MYSQL_BINARY_IDS is set (uuid ids only),
+    String(60) otherwise.
+    """
+    if getenv("HBNB_MYSQL_BINARY_IDS"):
+        return BinaryId()
+    return String(60)
+
+
 class BaseModel:
     """The BaseModel class from which future classes will be derived"""
     if models.storage_t == "db":
-        id = Column(String(60), primary_key=True)
+        id = Column(id_type(), primary_key=True)
         created_at = Column(DateTime, default=datetime.utcnow)
         updated_at = Column(DateTime, default=datetime.utcnow)
 
@@ -41,12 +71,23 @@ class BaseModel:
             else:
                 self.updated_at = datetime.utcnow()
             if kwargs.get("id", None) is None:
-                self.id = str(uuid.uuid4())
+                self.id = id_generator.generate_id()
         else:
-            self.id = str(uuid.uuid4())
+            self.id = id_generator.generate_id()
             self.created_at = datetime.utcnow()
             self.updated_at = self.created_at
 
+    @classmethod
+    def from_stored(cls, record):
+        """instance of a dictionary read back from the storage engine"""
+        return cls(**record)
+
+    if models.storage_t != "db":
+        def __setattr__(self, name, value):
+            """sets an attribute and flags the instance as modified"""
+            super().__setattr__(name, value)
+            models.storage.mark_dirty(self)
+
     def __str__(self):
         """String representation of the BaseModel class"""
         return "[{:s}] ({:s}) {}".format(self.__class__.__name__, self.id,
@@ -58,8 +99,14 @@ class BaseModel:
         models.storage.new(self)
         models.storage.save()
 
-    def to_dict(self, exclude_password=True):  # set exclude_password to true
-        """returns a dictionary containing all keys/values of the instance"""
+    def to_dict(self, exclude_password=True, fields=None):
+        """returns a dictionary containing all keys/values of the instance
+
+        When fields is given only those keys, plus __class__ and id, are
+        built (sparse fieldset).
+        """
+        if fields is not None:
+            return self.__project(fields, exclude_password)
         new_dict = self.__dict__.copy()
         if "created_at" in new_dict:
             new_dict["created_at"] = new_dict["created_at"].strftime(time)
@@ -73,6 +120,21 @@ class BaseModel:
             del new_dict["password"]  # Exclude password key
         return new_dict
 
+    def __project(self, fields, exclude_password):
+        """builds the dictionary of the requested keys, __class__ and id"""
+        new_dict = {"id": self.id, "__class__": self.__class__.__name__}
+        for key in fields:
+            if (key in new_dict or key == "_sa_instance_state" or
+                    key not in self.__dict__):
+                continue
+            elif key == "password" and exclude_password:
+                continue
+            elif key in ("created_at", "updated_at"):
+                new_dict[key] = self.__dict__[key].strftime(time)
+            else:
+                new_dict[key] = self.__dict__[key]
+        return new_dict
+
     def delete(self):
         """delete the current instance from the storage"""
         models.storage.delete(self)
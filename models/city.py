@@ -1,18 +1,18 @@
 #!/usr/bin/python
 """ holds class City"""
 import models
-from models.base_model import BaseModel, Base
+from models.base_model import BaseModel, Base, id_type
 from os import getenv
-import sqlalchemy
-from sqlalchemy import Column, String, ForeignKey
-from sqlalchemy.orm import relationship
+if models.storage_t == "db":
+    from sqlalchemy import Column, String, ForeignKey
+    from sqlalchemy.orm import relationship
 
 
 class City(BaseModel, Base):
     """Representation of city """
     if models.storage_t == "db":
         __tablename__ = 'cities'
-        state_id = Column(String(60), ForeignKey('states.id'), nullable=False)
+        state_id = Column(id_type(), ForeignKey('states.id'), nullable=False)
         name = Column(String(128), nullable=False)
         places = relationship("Place", backref="cities")
     else:
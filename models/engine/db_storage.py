@@ -4,26 +4,32 @@ Contains the class DBStorage
 """
 
 import models
+from models import base_model, id_generator
 from models.amenity import Amenity
 from models.base_model import BaseModel, Base
 from models.city import City
+from models.engine.spatial_index import bounding_box, haversine
 from models.place import Place
 from models.review import Review
 from models.state import State
 from models.user import User
 from os import getenv
 import sqlalchemy
-from sqlalchemy import create_engine
-from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy import create_engine, func, or_
+from sqlalchemy.orm import load_only, scoped_session, sessionmaker
 
 classes = {"Amenity": Amenity, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
+# Type of the BINARY(16) id columns, only defined when models are mapped.
+BinaryId = getattr(base_model, "BinaryId", None)
 
 
 class DBStorage:
     """interaacts with the MySQL database"""
     __engine = None
     __session = None
+    # list - callables notified with (event, class name) on writes
+    __listeners = []
 
     def __init__(self):
         """Instantiate a DBStorage object"""
@@ -32,7 +38,11 @@ class DBStorage:
         HBNB_MYSQL_HOST = getenv('HBNB_MYSQL_HOST')
         HBNB_MYSQL_DB = getenv('HBNB_MYSQL_DB')
         HBNB_ENV = getenv('HBNB_ENV')
-        self.__engine = create_engine('mysql+mysqldb://{}:{}@{}/{}'.
+        # HBNB_DB_URL replaces the MySQL database, e.g. with a local
+        # sqlite:///file.db for benchmarks
+        HBNB_DB_URL = getenv('HBNB_DB_URL')
+        self.__engine = create_engine(HBNB_DB_URL or
+                                      'mysql+mysqldb://{}:{}@{}/{}'.
                                       format(HBNB_MYSQL_USER,
                                              HBNB_MYSQL_PWD,
                                              HBNB_MYSQL_HOST,
@@ -41,7 +51,14 @@ class DBStorage:
             Base.metadata.drop_all(self.__engine)
 
     def all(self, cls=None):
-        """query on the current database session"""
+        """query on the current database session
+
+        Results are memoized in the session until the next new, delete or
+        save; the session lives for one request (close() removes it).
+        """
+        memo = self.__session.info.setdefault("all", {})
+        if cls in memo:
+            return dict(memo[cls])
         new_dict = {}
         for clss in classes:
             if cls is None or cls is classes[clss] or cls is clss:
@@ -49,41 +66,207 @@ class DBStorage:
                 for obj in objs:
                     key = obj.__class__.__name__ + '.' + obj.id
                     new_dict[key] = obj
-        return (new_dict)
+        memo[cls] = new_dict
+        return (dict(new_dict))
+
+    def iter(self, cls=None, batch_size=1000, fields=None):
+        """
+        yields the objects of cls (all classes if None) one by one,
+        fetching batch_size rows at a time from a server-side cursor;
+        fields restricts the columns loaded (sparse fieldset)
+        """
+        for clss in classes:
+            if cls is None or cls is classes[clss] or cls == clss:
+                query = self.__project(
+                    self.__session.query(classes[clss]), classes[clss],
+                    fields)
+                for obj in query.yield_per(batch_size):
+                    yield obj
+
+    @staticmethod
+    def __project(query, cls, fields):
+        """adds a load_only option for the columns of cls among fields"""
+        if fields is None:
+            return query
+        columns = cls.__table__.columns.keys()
+        wanted = [getattr(cls, name) for name in columns
+                  if name in fields or name == 'id']
+        return query.options(load_only(*wanted))
 
     def new(self, obj):
         """add the object to the current database session"""
         self.__session.add(obj)
+        self.__session.info.pop("all", None)
+        self.__notify("new", obj.__class__.__name__)
+
+    def new_many(self, objs):
+        """
+        inserts every object of objs with one executemany INSERT per table,
+        bypassing the unit of work of the session; the amenities of places
+        are taken from their amenity_ids list, as in FileStorage. The
+        objects are not attached to the session and the rows are
+        committed by the next save().
+        """
+        rows = {}
+        defaults = {}
+        names = set()
+        for obj in objs:
+            table = obj.__table__
+            if table not in defaults:
+                defaults[table] = self.__defaults(table)
+            row = {}
+            for column in table.columns:
+                value = getattr(obj, column.key, None)
+                row[column.key] = (defaults[table].get(column.key)
+                                   if value is None else value)
+            rows.setdefault(table, []).append(row)
+            if isinstance(obj, Place):
+                link = Base.metadata.tables['place_amenity']
+                rows.setdefault(link, []).extend(
+                    {"place_id": obj.id, "amenity_id": amenity_id}
+                    for amenity_id in getattr(obj, "amenity_ids", ()))
+            names.add(obj.__class__.__name__)
+        for table in Base.metadata.sorted_tables:
+            if rows.get(table):
+                self.__session.execute(table.insert(), rows[table])
+        self.__session.info.pop("all", None)
+        for name in names:
+            self.__notify("new", name)
+
+    @staticmethod
+    def __defaults(table):
+        """{column: scalar default} of the columns of table"""
+        return {column.key: column.default.arg for column in table.columns
+                if column.default is not None and column.default.is_scalar}
+
+    def subscribe(self, listener):
+        """registers listener(event, class name) for storage writes"""
+        self.__listeners.append(listener)
+
+    def __notify(self, event, name):
+        """calls every listener for a write on the class name"""
+        for listener in self.__listeners:
+            listener(event, name)
+
+    @staticmethod
+    def __bindable(column, values):
+        """
+        values that can be compared with column: ids that are not UUIDs
+        cannot be packed into a BINARY(16) column (HBNB_MYSQL_BINARY_IDS)
+        and match no row, so they are dropped instead of failing the query
+        """
+        if BinaryId is None or not isinstance(column.type, BinaryId):
+            return list(values)
+        return [value for value in values if id_generator.is_uuid(value)]
 
     def get(self, cls, id):
-        """ method return objects in specific class id """
-        cls_all = self.all(cls)
-        for c in cls_all:
-            if c.split(".")[1] == id:
-                return cls_all[c]
-        return None
+        """ method return objects in specific class id
+
+        Objects already loaded by the session (the current request) are
+        returned from its identity map without a query.
+        """
+        if type(cls) is str:
+            cls = classes.get(cls)
+        if cls not in classes.values() or type(id) is not str:
+            return None
+        if not self.__bindable(cls.id, [id]):
+            return None
+        return self.__session.get(cls, id)
+
+    def get_many(self, cls, ids, fields=None, chunk_size=500):
+        """
+        objects of class cls with the given ids, in the order of ids,
+        fetched with one IN (...) query per chunk_size ids; unknown and
+        repeated ids are skipped, fields restricts the columns loaded
+        """
+        if type(cls) is str:
+            cls = classes.get(cls)
+        if cls not in classes.values():
+            return []
+        ids = self.__bindable(cls.id, dict.fromkeys(str(id) for id in ids))
+        found = {}
+        missing = []
+        for id in ids:
+            obj = self.__session.identity_map.get(
+                self.__session.identity_key(cls, id))
+            if obj is not None:
+                found[id] = obj
+            else:
+                missing.append(id)
+        for start in range(0, len(missing), chunk_size):
+            query = self.__project(self.__session.query(cls), cls, fields)
+            for obj in query.filter(
+                    cls.id.in_(missing[start:start + chunk_size])):
+                found[obj.id] = obj
+        return [found[id] for id in ids if id in found]
+
+    def get_related(self, cls, attr, values, fields=None, chunk_size=500):
+        """
+        {value: [objects]} of the objects of class cls whose column attr
+        is one of values, fetched with one IN (...) query per chunk_size
+        values; fields restricts the columns loaded
+        """
+        if type(cls) is str:
+            cls = classes.get(cls)
+        if cls not in classes.values():
+            return {}
+        column = getattr(cls, attr)
+        values = self.__bindable(column, dict.fromkeys(values))
+        if fields is not None:
+            fields = list(fields) + [attr]
+        related = {}
+        for start in range(0, len(values), chunk_size):
+            query = self.__project(self.__session.query(cls), cls, fields)
+            query = query.filter(
+                column.in_(values[start:start + chunk_size]))
+            for obj in query.order_by(cls.id):
+                related.setdefault(getattr(obj, attr), []).append(obj)
+        return related
+
+    def get_place_amenities(self, place_ids, chunk_size=500):
+        """
+        {place id: [Amenity]} of the amenities linked to the places, in
+        one query on place_amenity per chunk_size places
+        """
+        link = Base.metadata.tables['place_amenity']
+        place_ids = list(dict.fromkeys(place_ids))
+        related = {}
+        for start in range(0, len(place_ids), chunk_size):
+            query = self.__session.query(link.c.place_id, Amenity).join(
+                Amenity, Amenity.id == link.c.amenity_id).filter(
+                link.c.place_id.in_(place_ids[start:start + chunk_size]))
+            for place_id, amenity in query.order_by(Amenity.id):
+                related.setdefault(place_id, []).append(amenity)
+        return related
 
     def count(self, cls=None):
         """method that count number of object of specific class or
             all if not cls provided"
         """
-        if cls is None:
-            obj_list = self.all()
-        else:
-            obj_list = self.all(cls)
         num = 0
-        for i in obj_list.keys():
-            num += 1
+        for clss in classes:
+            if cls is None or cls is classes[clss] or cls == clss:
+                num += self.__session.query(
+                    func.count(classes[clss].id)).scalar()
         return num
 
     def save(self):
         """commit all changes of the current database session"""
-        self.__session.commit()
+        session = self.__session
+        changed = set(obj.__class__.__name__ for obj in
+                      list(session.new) + list(session.dirty) +
+                      list(session.deleted))
+        session.commit()
+        session.info.pop("all", None)
+        for name in changed:
+            self.__notify("save", name)
 
     def delete(self, obj=None):
         """delete from the current database session obj if not None"""
         if obj is not None:
             self.__session.delete(obj)
+            self.__session.info.pop("all", None)
+            self.__notify("delete", obj.__class__.__name__)
 
     def reload(self):
         """reloads data from the database"""
@@ -92,6 +275,77 @@ class DBStorage:
         Session = scoped_session(sess_factory)
         self.__session = Session
 
+    def search_places(self, states=(), cities=(), amenities=(), ranges=None,
+                      fields=None):
+        """
+        Places located in any of the states or cities (all places when
+        both are empty) that have every one of the amenities and whose
+        fields are within ranges ({field: (min, max)}, None is open), by id;
+        fields restricts the columns loaded (sparse fieldset).
+        """
+        query = self.__project(self.__session.query(Place), Place, fields)
+        if states or cities:
+            query = query.join(City, Place.city_id == City.id).filter(
+                or_(City.state_id.in_(self.__bindable(City.state_id,
+                                                      states)),
+                    Place.city_id.in_(self.__bindable(Place.city_id,
+                                                      cities))))
+        amenities = set(amenities)
+        link = Base.metadata.tables['place_amenity']
+        if len(self.__bindable(link.c.amenity_id, amenities)) < len(
+                amenities):
+            # no place has an amenity whose id cannot be stored
+            return []
+        if amenities:
+            linked = self.__session.query(link.c.place_id).filter(
+                link.c.amenity_id.in_(amenities)).group_by(
+                link.c.place_id).having(
+                func.count(link.c.amenity_id) == len(amenities))
+            query = query.filter(Place.id.in_(linked))
+        for field, (low, high) in (ranges or {}).items():
+            column = getattr(Place, field)
+            if low is not None:
+                query = query.filter(column >= low)
+            if high is not None:
+                query = query.filter(column <= high)
+        return query.order_by(Place.id).all()
+
+    def places_near(self, lat, lng, radius, limit=None):
+        """
+        [(place, distance km)] of the places within radius km of the
+        point, closest first, at most limit of them.
+        """
+        min_lat, max_lat, min_lng, max_lng = bounding_box(lat, lng, radius)
+        query = self.__session.query(Place).filter(
+            Place.latitude.between(min_lat, max_lat))
+        if max_lng - min_lng < 360:
+            if min_lng < -180:
+                query = query.filter(or_(Place.longitude >= min_lng + 360,
+                                         Place.longitude <= max_lng))
+            elif max_lng > 180:
+                query = query.filter(or_(Place.longitude >= min_lng,
+                                         Place.longitude <= max_lng - 360))
+            else:
+                query = query.filter(
+                    Place.longitude.between(min_lng, max_lng))
+        places = []
+        for place in query.filter(Place.longitude.isnot(None)).all():
+            distance = haversine(lat, lng, place.latitude, place.longitude)
+            if distance <= radius:
+                places.append((place, distance))
+        places.sort(key=lambda pair: pair[1])
+        if limit is not None:
+            places = places[:limit]
+        return places
+
+    def after_fork(self):
+        """
+        called in a forked worker: drops the connections inherited from
+        the parent without closing them and starts a new session
+        """
+        self.__engine.dispose(close=False)
+        self.reload()
+
     def close(self):
         """call remove() method on the private session attribute"""
         self.__session.remove()
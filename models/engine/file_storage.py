@@ -1,17 +1,32 @@
 #!/usr/bin/python3
 """
 Contains the FileStorage class
+
+Several processes (API workers, the console, the web_flask apps) may share
+the same JSON file. Writers hold an advisory lock (fcntl) on
+<file>.lock while they merge the changes made by others and replace the
+file, and bump the generation stored in the <file>.version sidecar.
+reload() only reads the JSON file when that generation changed, and only
+rebuilds the records that differ from the ones in memory.
 """
 
+from contextlib import contextmanager
 import json
+import os
 from models.amenity import Amenity
 from models.base_model import BaseModel
 from models.city import City
+from models.engine.search_index import SearchIndex
 from models.place import Place
 from models.review import Review
 from models.state import State
 from models.user import User
 
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
 classes = {"Amenity": Amenity, "BaseModel": BaseModel, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
 
@@ -21,34 +36,191 @@ class FileStorage:
 
     # string - path to the JSON file
     __file_path = "file.json"
+    # int - generation of the JSON file last read or written, None before
+    # the first reload
+    __generation = None
     # dictionary - empty but will store all objects by <class name>.id
     __objects = {}
+    # dictionary - <class name>.id: (obj, serialized dict) as last written
+    __records = {}
+    # set - keys of objects modified since the last save (unit of work)
+    __dirty = set()
+    # list - callables notified with (event, class name) on writes
+    __listeners = []
+    # SearchIndex - posting lists of place ids for search_places()
+    __index = SearchIndex()
+    # dictionary - <class name>: {<class name>.id: obj}, built for the
+    # __objects dictionary referenced by __indexed
+    __by_class = {}
+    __indexed = None
+    # dictionary - (<class name>, attribute): ({value: {key: obj}},
+    # {key: value}), reverse indexes built on demand by get_related()
+    __reverse = {}
+
+    def __class_index(self, name):
+        """returns the {key: obj} dictionary of the objects of class name"""
+        if self.__indexed is not self.__objects:
+            self.__by_class.clear()
+            self.__reverse.clear()
+            for key, obj in self.__objects.items():
+                self.__by_class.setdefault(key.split(".")[0], {})[key] = obj
+            FileStorage.__indexed = self.__objects
+        return self.__by_class.setdefault(name, {})
 
     def all(self, cls=None):
         """returns the dictionary __objects"""
         if cls is not None:
-            new_dict = {}
-            for key, value in self.__objects.items():
-                if cls == value.__class__ or cls == value.__class__.__name__:
-                    new_dict[key] = value
-            return new_dict
+            if type(cls) is not str:
+                cls = cls.__name__
+            return dict(self.__class_index(cls))
         return self.__objects
 
+    def iter(self, cls=None, batch_size=None, fields=None):
+        """
+        yields the objects of cls (all objects if None) one by one
+
+        Only a snapshot of the references is taken, so objects written
+        while iterating do not break the iteration. batch_size and fields
+        are accepted for compatibility with DBStorage.iter, objects are
+        already in memory.
+        """
+        if cls is None:
+            objects = tuple(self.__objects.values())
+        else:
+            if type(cls) is not str:
+                cls = cls.__name__
+            objects = tuple(self.__class_index(cls).values())
+        for obj in objects:
+            yield obj
+
     def new(self, obj):
         """sets in __objects the obj with key <obj class name>.id"""
         if obj is not None:
             key = obj.__class__.__name__ + "." + obj.id
             self.__objects[key] = obj
+            self.__class_index(obj.__class__.__name__)[key] = obj
+            self.__dirty.add(key)
+            self.__index.add(obj)
+            self.__refile(key, obj)
+            self.__notify("new", obj.__class__.__name__)
+
+    def new_many(self, objs):
+        """
+        sets in __objects every object of objs, the bulk version of new()
+        notifying the listeners once per class
+        """
+        names = set()
+        for obj in objs:
+            name = obj.__class__.__name__
+            key = name + "." + obj.id
+            self.__objects[key] = obj
+            self.__class_index(name)[key] = obj
+            self.__dirty.add(key)
+            self.__index.add(obj)
+            if self.__reverse:
+                self.__refile(key, obj)
+            names.add(name)
+        for name in names:
+            self.__notify("new", name)
+
+    def subscribe(self, listener):
+        """registers listener(event, class name) for storage writes"""
+        self.__listeners.append(listener)
+
+    def __notify(self, event, name):
+        """calls every listener for a write on the class name"""
+        for listener in self.__listeners:
+            listener(event, name)
+
+    def mark_dirty(self, obj):
+        """flags a stored obj as modified so save() re-serializes it"""
+        if "id" in obj.__dict__:
+            key = obj.__class__.__name__ + "." + obj.id
+            if self.__objects.get(key) is obj:
+                self.__dirty.add(key)
+                if self.__reverse:
+                    self.__refile(key, obj)
+
+    def __refile(self, key, obj):
+        """moves obj in the reverse indexes of its class, None removes it"""
+        name = key.split(".")[0]
+        for (indexed, attr), (by_value, by_key) in self.__reverse.items():
+            if indexed != name:
+                continue
+            if key in by_key:
+                old = by_key.pop(key)
+                by_value[old].pop(key, None)
+                if not by_value[old]:
+                    del by_value[old]
+            if obj is not None:
+                value = getattr(obj, attr, None)
+                by_key[key] = value
+                by_value.setdefault(value, {})[key] = obj
 
     def get(self, cls, id):
         """
         Get an object by class and ID from the JSON file.
         Returns None if cls or id is not found in the JSON file.
         """
-        for obj_key, obj in self.__objects.items():
-            if obj.__class__ == cls and obj.id == id:
-                return obj
-        return None
+        if cls is None or type(id) is not str:
+            return None
+        if type(cls) is not str:
+            cls = cls.__name__
+        return self.__objects.get(cls + "." + id)
+
+    def get_many(self, cls, ids, fields=None):
+        """
+        Get the objects of class cls with the given ids, in the order of
+        ids; unknown and repeated ids are skipped. fields is accepted for
+        compatibility with DBStorage.get_many.
+        """
+        if type(cls) is not str:
+            cls = cls.__name__
+        objects = []
+        seen = set()
+        for id in ids:
+            obj = self.__objects.get(cls + "." + str(id))
+            if obj is not None and obj.id not in seen:
+                seen.add(obj.id)
+                objects.append(obj)
+        return objects
+
+    def get_related(self, cls, attr, values, fields=None):
+        """
+        {value: [objects]} of the objects of class cls whose attribute
+        attr is one of values, answered from a reverse index built on the
+        first call for (cls, attr). fields is accepted for compatibility
+        with DBStorage.get_related.
+        """
+        if type(cls) is not str:
+            cls = cls.__name__
+        objects = self.__class_index(cls)
+        if (cls, attr) not in self.__reverse:
+            by_value = {}
+            by_key = {}
+            for key, obj in objects.items():
+                value = getattr(obj, attr, None)
+                by_key[key] = value
+                by_value.setdefault(value, {})[key] = obj
+            self.__reverse[(cls, attr)] = (by_value, by_key)
+        by_value = self.__reverse[(cls, attr)][0]
+        related = {}
+        for value in values:
+            found = [obj for key, obj in by_value.get(value, {}).items()
+                     if objects.get(key) is obj]
+            if found:
+                related[value] = found
+        return related
+
+    def get_place_amenities(self, place_ids):
+        """{place id: [Amenity]} of the amenities linked to the places"""
+        related = {}
+        for place_id in place_ids:
+            place = self.__objects.get("Place." + str(place_id))
+            if place is not None:
+                related[place.id] = self.get_many(
+                    "Amenity", getattr(place, "amenity_ids", []))
+        return related
 
     def count(self, cls=None):
         """
@@ -56,29 +228,138 @@ class FileStorage:
         Defaults to None, which returns a count of all objects in - JSON file.
         """
         if cls is not None:
-            count = sum(1 for obj in self.__objects.values()
-                        if obj.__class__ == cls)
+            if type(cls) is not str:
+                cls = cls.__name__
+            count = len(self.__class_index(cls))
         else:
             count = len(self.__objects)
         return count
 
+    @contextmanager
+    def __locked(self, operation):
+        """holds the advisory lock of the JSON file (LOCK_SH or LOCK_EX)"""
+        if fcntl is None:
+            yield
+            return
+        with open(self.__file_path + ".lock", "a") as lock:
+            fcntl.flock(lock, getattr(fcntl, operation))
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def __read_generation(self):
+        """generation of the JSON file in the sidecar file, 0 if none"""
+        try:
+            with open(self.__file_path + ".version", "r") as f:
+                return int(f.read() or 0)
+        except (OSError, ValueError):
+            return 0
+
+    @staticmethod
+    def __replace(path, write):
+        """atomically replaces path with what write(f) writes"""
+        tmp = "{}.{}.tmp".format(path, os.getpid())
+        with open(tmp, "w") as f:
+            write(f)
+        os.replace(tmp, path)
+
     def save(self):
-        """serializes __objects to the JSON file (path: __file_path)"""
-        json_objects = {}
-        for key in self.__objects:
-            json_objects[key] = self.__objects[key].to_dict()
-        with open(self.__file_path, 'w') as f:
-            json.dump(json_objects, f)
+        """serializes __objects to the JSON file (path: __file_path)
+
+        Only objects that are new, modified or replaced since the last
+        save/reload are converted with to_dict(), the others reuse their
+        cached serialized form. Changes saved by other processes since
+        the last reload are merged first; for the objects modified here
+        the local version wins.
+        """
+        records = self.__records
+        changed = set()
+        with self.__locked("LOCK_EX"):
+            generation = self.__read_generation()
+            if generation != self.__generation:
+                for name in self.__load(generation, keep_dirty=True):
+                    self.__notify("reload", name)
+            for key in [k for k in records if k not in self.__objects]:
+                self.__index.remove(records.pop(key)[0])
+                self.__class_index(key.split(".")[0]).pop(key, None)
+                self.__refile(key, None)
+                changed.add(key.split(".")[0])
+            for key, obj in self.__objects.items():
+                record = records.get(key)
+                if (key in self.__dirty or record is None or
+                        record[0] is not obj):
+                    records[key] = (obj, obj.to_dict())
+                    self.__index.add(obj)
+                    changed.add(key.split(".")[0])
+            self.__dirty.clear()
+            json_objects = {key: record[1] for key, record in records.items()}
+            self.__replace(self.__file_path,
+                           lambda f: json.dump(json_objects, f))
+            generation += 1
+            self.__replace(self.__file_path + ".version",
+                           lambda f: f.write(str(generation)))
+            FileStorage.__generation = generation
+        for name in changed:
+            self.__notify("save", name)
 
     def reload(self):
-        """deserializes the JSON file to __objects"""
+        """deserializes the JSON file to __objects
+
+        Nothing is read when no process saved since the last reload; the
+        objects whose record did not change are kept as they are.
+        """
+        generation = self.__read_generation()
+        if generation == self.__generation:
+            return
+        with self.__locked("LOCK_SH"):
+            changed = self.__load(self.__read_generation())
+        for name in changed:
+            self.__notify("reload", name)
+
+    def __load(self, generation, keep_dirty=False):
+        """
+        applies the records of the JSON file that differ from the ones in
+        memory (skipping locally modified objects if keep_dirty) and
+        returns the names of the classes that changed
+        """
+        changed = set()
         try:
             with open(self.__file_path, 'r') as f:
                 jo = json.load(f)
-            for key in jo:
-                self.__objects[key] = classes[jo[key]["__class__"]](**jo[key])
-        except Exception:
-            pass
+        except (OSError, ValueError):
+            FileStorage.__generation = generation
+            return changed
+        records = self.__records
+        for key, value in jo.items():
+            record = records.get(key)
+            if record is not None and record[1] == value:
+                continue
+            if keep_dirty and key in self.__dirty:
+                continue
+            obj = classes[value["__class__"]].from_stored(value)
+            self.__objects[key] = obj
+            self.__class_index(value["__class__"])[key] = obj
+            self.__refile(key, obj)
+            self.__index.add(obj)
+            records[key] = (obj, value)
+            self.__dirty.discard(key)
+            changed.add(value["__class__"])
+        # records saved before but no longer in the file were deleted by
+        # another process
+        for key in [k for k in records if k not in jo]:
+            if keep_dirty and key in self.__dirty:
+                continue
+            obj = records.pop(key)[0]
+            if self.__objects.get(key) is obj:
+                del self.__objects[key]
+                self.__class_index(key.split(".")[0]).pop(key, None)
+                self.__index.remove(obj)
+                self.__refile(key, None)
+                self.__dirty.discard(key)
+            changed.add(key.split(".")[0])
+        FileStorage.__generation = generation
+        return changed
 
     def delete(self, obj=None):
         """delete obj from __objects if it’s inside"""
@@ -86,6 +367,41 @@ class FileStorage:
             key = obj.__class__.__name__ + '.' + obj.id
             if key in self.__objects:
                 del self.__objects[key]
+                self.__class_index(obj.__class__.__name__).pop(key, None)
+                self.__dirty.add(key)
+                self.__index.remove(obj)
+                self.__refile(key, None)
+                self.__notify("delete", obj.__class__.__name__)
+
+    def search_places(self, states=(), cities=(), amenities=(), ranges=None,
+                      fields=None):
+        """
+        Places located in any of the states or cities (all places when
+        both are empty) that have every one of the amenities and whose
+        fields are within ranges ({field: (min, max)}, None is open), by id.
+        fields is accepted for compatibility with DBStorage.
+        """
+        ids = self.__index.search(states, cities, amenities, ranges)
+        places = []
+        for place_id in sorted(ids):
+            place = self.__objects.get("Place." + place_id)
+            if place is not None:
+                places.append(place)
+        return places
+
+    def places_near(self, lat, lng, radius, limit=None):
+        """
+        [(place, distance km)] of the places within radius km of the
+        point, closest first, at most limit of them.
+        """
+        places = []
+        for distance, place_id in self.__index.near(lat, lng, radius):
+            place = self.__objects.get("Place." + place_id)
+            if place is not None:
+                places.append((place, distance))
+                if limit is not None and len(places) >= limit:
+                    break
+        return places
 
     def close(self):
         """call reload() method for deserializing the JSON file to objects"""
@@ -0,0 +1,232 @@
+#!/usr/bin/python3
+"""
+Contains the SearchIndex class
+
+In-memory inverted index used by FileStorage to answer place searches
+without walking states, cities and amenities object by object. It keeps
+posting lists (sets of place ids) for every state, city and amenity so
+a search is a union over the locations followed by an intersection over
+the amenities.
+
+Numeric place fields (RANGE_FIELDS) are also kept in sorted arrays so
+min/max filters, including a latitude/longitude bounding box, are two
+binary searches. The arrays are built on the first range query and then
+updated in place. Coordinates also feed a SpatialIndex grid for radius
+queries.
+"""
+
+from bisect import bisect_left, bisect_right
+from math import isfinite
+from models.engine.spatial_index import SpatialIndex
+from threading import RLock
+
+RANGE_FIELDS = ("price_by_night", "max_guest", "number_rooms",
+                "latitude", "longitude")
+
+
+class SearchIndex:
+    """posting lists of place ids by state, city and amenity, and
+    sorted arrays of place ids by numeric field"""
+
+    def __init__(self):
+        """Instantiate an empty SearchIndex"""
+        self.__lock = RLock()
+        # place id -> city id / frozenset of amenity ids
+        self.__place_city = {}
+        self.__place_amenities = {}
+        # city id -> state id
+        self.__city_state = {}
+        # posting lists: <id> -> set of place ids
+        self.__by_city = {}
+        self.__by_state = {}
+        self.__by_amenity = {}
+        # field -> {place id: value} and field -> sorted ([values], [ids])
+        self.__values = {field: {} for field in RANGE_FIELDS}
+        self.__sorted = {}
+        self.__spatial = SpatialIndex()
+
+    def add(self, obj):
+        """indexes a new or updated Place or City, ignores other classes"""
+        name = obj.__class__.__name__
+        with self.__lock:
+            if name == "Place":
+                self.__add_place(obj.id, obj.city_id,
+                                 frozenset(getattr(obj, "amenity_ids", [])))
+                for field in RANGE_FIELDS:
+                    self.__set_value(field, obj.id, getattr(obj, field, None))
+                self.__spatial.add(obj.id, getattr(obj, "latitude", None),
+                                   getattr(obj, "longitude", None))
+            elif name == "City":
+                self.__add_city(obj.id, obj.state_id)
+
+    def remove(self, obj):
+        """drops a deleted Place or City from the index"""
+        name = obj.__class__.__name__
+        with self.__lock:
+            if name == "Place":
+                self.__remove_place(obj.id)
+                for field in RANGE_FIELDS:
+                    self.__set_value(field, obj.id, None)
+                self.__spatial.remove(obj.id)
+            elif name == "City":
+                self.__add_city(obj.id, None)
+                del self.__city_state[obj.id]
+
+    def clear(self):
+        """empties the index"""
+        with self.__lock:
+            for index in (self.__place_city, self.__place_amenities,
+                          self.__city_state, self.__by_city,
+                          self.__by_state, self.__by_amenity):
+                index.clear()
+            for values in self.__values.values():
+                values.clear()
+            self.__sorted.clear()
+            self.__spatial.clear()
+
+    def __add_place(self, place_id, city_id, amenity_ids):
+        """moves a place to the posting lists of its city and amenities"""
+        if (self.__place_city.get(place_id) == city_id and
+                self.__place_amenities.get(place_id) == amenity_ids):
+            return
+        self.__remove_place(place_id)
+        self.__place_city[place_id] = city_id
+        self.__place_amenities[place_id] = amenity_ids
+        self.__by_city.setdefault(city_id, set()).add(place_id)
+        state_id = self.__city_state.get(city_id)
+        if state_id is not None:
+            self.__by_state.setdefault(state_id, set()).add(place_id)
+        for amenity_id in amenity_ids:
+            self.__by_amenity.setdefault(amenity_id, set()).add(place_id)
+
+    def __remove_place(self, place_id):
+        """takes a place out of every posting list"""
+        if place_id not in self.__place_city:
+            return
+        city_id = self.__place_city.pop(place_id)
+        self.__discard(self.__by_city, city_id, place_id)
+        self.__discard(self.__by_state, self.__city_state.get(city_id),
+                       place_id)
+        for amenity_id in self.__place_amenities.pop(place_id):
+            self.__discard(self.__by_amenity, amenity_id, place_id)
+
+    def __add_city(self, city_id, state_id):
+        """records the state of a city and moves its places along"""
+        old_state_id = self.__city_state.get(city_id)
+        self.__city_state[city_id] = state_id
+        if old_state_id == state_id:
+            return
+        places = self.__by_city.get(city_id, ())
+        if old_state_id is not None and places:
+            old = self.__by_state[old_state_id]
+            old.difference_update(places)
+            if not old:
+                del self.__by_state[old_state_id]
+        if state_id is not None and places:
+            self.__by_state.setdefault(state_id, set()).update(places)
+
+    def __set_value(self, field, place_id, value):
+        """records the numeric value of a field, None/NaN/inf remove it"""
+        if value is not None:
+            try:
+                value = float(value)
+            except (TypeError, ValueError):
+                value = None
+        if value is not None and not isfinite(value):
+            value = None
+        values = self.__values[field]
+        old = values.get(place_id)
+        if old == value:
+            return
+        if value is None:
+            del values[place_id]
+        else:
+            values[place_id] = value
+        arrays = self.__sorted.get(field)
+        if arrays is None:
+            return
+        keys, ids = arrays
+        if old is not None:
+            i = bisect_left(keys, old)
+            while ids[i] != place_id:
+                i += 1
+            del keys[i]
+            del ids[i]
+        if value is not None:
+            i = bisect_right(keys, value)
+            keys.insert(i, value)
+            ids.insert(i, place_id)
+
+    def __range(self, field, low, high, candidates):
+        """
+        Ids of the places with low <= field <= high (None is unbounded),
+        checked one by one when candidates is the smaller set.
+        """
+        values = self.__values[field]
+        arrays = self.__sorted.get(field)
+        if arrays is None:
+            pairs = sorted((v, k) for k, v in values.items())
+            arrays = ([v for v, k in pairs], [k for v, k in pairs])
+            self.__sorted[field] = arrays
+        keys, ids = arrays
+        start = 0 if low is None else bisect_left(keys, low)
+        end = len(keys) if high is None else bisect_right(keys, high)
+        if candidates is not None and len(candidates) < end - start:
+            return set(place_id for place_id in candidates
+                       if place_id in values and
+                       (low is None or values[place_id] >= low) and
+                       (high is None or values[place_id] <= high))
+        result = set(ids[start:end])
+        if candidates is not None:
+            result.intersection_update(candidates)
+        return result
+
+    @staticmethod
+    def __discard(postings, key, place_id):
+        """removes place_id from postings[key], dropping empty lists"""
+        ids = postings.get(key)
+        if ids is not None:
+            ids.discard(place_id)
+            if not ids:
+                del postings[key]
+
+    def search(self, states=(), cities=(), amenities=(), ranges=None):
+        """
+        Returns the set of place ids matching the criteria: in any of the
+        states or cities (every place when both are empty), linked to all
+        the amenities and with every field of ranges ({field: (min, max)})
+        in its bounds.
+        """
+        with self.__lock:
+            if states or cities:
+                result = set()
+                for state_id in states:
+                    result.update(self.__by_state.get(state_id, ()))
+                for city_id in cities:
+                    result.update(self.__by_city.get(city_id, ()))
+            else:
+                result = None
+            postings = sorted((self.__by_amenity.get(amenity_id, set())
+                               for amenity_id in set(amenities)), key=len)
+            for ids in postings:
+                if result is None:
+                    result = set(ids)
+                else:
+                    result.intersection_update(ids)
+                if not result:
+                    break
+            for field, (low, high) in (ranges or {}).items():
+                if result is not None and not result:
+                    break
+                result = self.__range(field, low, high, result)
+            if result is None:
+                result = set(self.__place_city)
+            return result
+
+    def near(self, lat, lng, radius, limit=None):
+        """
+        [(distance km, place id)] of the places within radius km of the
+        point, closest first, at most limit of them.
+        """
+        with self.__lock:
+            return self.__spatial.near(lat, lng, radius, limit)
@@ -0,0 +1,113 @@
+#!/usr/bin/python3
+"""
+Contains the SpatialIndex class and the haversine distance helper
+
+Places are bucketed in a fixed latitude/longitude grid. A radius query
+only looks at the cells overlapping the bounding box of the circle, then
+computes exact great-circle distances for the places in those cells, or
+for every place when the box covers more cells than there are places.
+"""
+
+from math import asin, cos, isfinite, radians, sin, sqrt
+
+EARTH_RADIUS = 6371.0088
+KM_PER_DEGREE = 111.195
+
+
+def haversine(lat1, lng1, lat2, lng2):
+    """great-circle distance in kilometers between two points"""
+    dlat = radians(lat2 - lat1)
+    dlng = radians(lng2 - lng1)
+    a = (sin(dlat / 2) ** 2 +
+         cos(radians(lat1)) * cos(radians(lat2)) * sin(dlng / 2) ** 2)
+    return 2 * EARTH_RADIUS * asin(min(1.0, sqrt(a)))
+
+
+def bounding_box(lat, lng, radius):
+    """
+    (min lat, max lat, min lng, max lng) in degrees around a circle of
+    radius km; longitudes may fall outside [-180, 180] near the
+    antimeridian and span the whole circle near the poles.
+    """
+    dlat = radius / KM_PER_DEGREE
+    if abs(lat) + dlat >= 90:
+        return (max(-90.0, lat - dlat), min(90.0, lat + dlat), -180.0, 180.0)
+    dlng = min(180.0, dlat / cos(radians(lat)))
+    return (lat - dlat, lat + dlat, lng - dlng, lng + dlng)
+
+
+class SpatialIndex:
+    """grid of place ids by latitude/longitude cell"""
+
+    def __init__(self, cell=0.25):
+        """Instantiate an empty SpatialIndex with cells of cell degrees"""
+        self.cell = cell
+        self.__columns = int(round(360 / cell))
+        self.__points = {}
+        self.__cells = {}
+
+    def __key(self, lat, lng):
+        """grid cell of a point"""
+        return (int((lat + 90) // self.cell),
+                int((lng + 180) // self.cell) % self.__columns)
+
+    def add(self, place_id, lat, lng):
+        """indexes or moves a place, None/NaN/inf coordinates remove it"""
+        try:
+            point = (float(lat), float(lng))
+        except (TypeError, ValueError):
+            point = None
+        if point is not None and not all(map(isfinite, point)):
+            point = None
+        if self.__points.get(place_id) == point:
+            return
+        self.remove(place_id)
+        if point is None:
+            return
+        self.__points[place_id] = point
+        self.__cells.setdefault(self.__key(*point), set()).add(place_id)
+
+    def remove(self, place_id):
+        """drops a place from the index"""
+        point = self.__points.pop(place_id, None)
+        if point is not None:
+            key = self.__key(*point)
+            self.__cells[key].discard(place_id)
+            if not self.__cells[key]:
+                del self.__cells[key]
+
+    def clear(self):
+        """empties the index"""
+        self.__points.clear()
+        self.__cells.clear()
+
+    def near(self, lat, lng, radius, limit=None):
+        """
+        [(distance km, place id)] of the places within radius km of the
+        point, closest first, at most limit of them.
+        """
+        min_lat, max_lat, min_lng, max_lng = bounding_box(lat, lng, radius)
+        rows = range(int((min_lat + 90) // self.cell),
+                     int((max_lat + 90) // self.cell) + 1)
+        first = int((min_lng + 180) // self.cell)
+        last = int((max_lng + 180) // self.cell)
+        columns = min(last - first + 1, self.__columns)
+        if len(rows) * columns > len(self.__points):
+            # the box covers more cells than there are places: checking
+            # every place is cheaper than walking the cells
+            candidates = self.__points
+        else:
+            columns = set(j % self.__columns
+                          for j in range(first, first + columns))
+            candidates = (place_id for i in rows for j in columns
+                          for place_id in self.__cells.get((i, j), ()))
+        found = []
+        for place_id in candidates:
+            p_lat, p_lng = self.__points[place_id]
+            distance = haversine(lat, lng, p_lat, p_lng)
+            if distance <= radius:
+                found.append((distance, place_id))
+        found.sort()
+        if limit is not None:
+            found = found[:limit]
+        return found
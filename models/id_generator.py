@@ -0,0 +1,90 @@
+#!/usr/bin/python3
+"""
+Contains the id generators used for new model instances
+
+The scheme is picked with HBNB_ID_SCHEME:
+    - uuid7 (default): time-ordered RFC 9562 UUID, same 36 char format
+      as uuid4 but new rows land at the right edge of the primary key
+      index and ids sort by creation time
+    - ulid: 26 char Crockford base32, time-ordered
+    - uuid4: the original fully random ids
+"""
+
+from os import getenv, urandom
+from threading import Lock
+import time
+import uuid
+
+crockford = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+_lock = Lock()
+_last = [0, 0]
+
+
+def uuid4():
+    """returns a random (version 4) UUID string"""
+    return str(uuid.uuid4())
+
+
+def uuid7():
+    """returns a time-ordered (version 7) UUID string
+
+    The 12 bits after the version hold a counter seeded randomly at each
+    new millisecond, so ids made in the same millisecond still increase.
+    """
+    with _lock:
+        ms = time.time_ns() // 1000000
+        if ms > _last[0]:
+            _last[:] = [ms, int.from_bytes(urandom(2), "big") & 0x7ff]
+        else:
+            _last[1] += 1
+            if _last[1] > 0xfff:
+                _last[:] = [_last[0] + 1, 0]
+        ms, seq = _last
+    value = (ms & 0xffffffffffff) << 80
+    value |= 0x7 << 76
+    value |= seq << 64
+    value |= 0x2 << 62
+    value |= int.from_bytes(urandom(8), "big") & 0x3fffffffffffffff
+    return str(uuid.UUID(int=value))
+
+
+def ulid():
+    """returns a ULID string (48 bit millisecond time + 80 random bits)"""
+    value = (time.time_ns() // 1000000) << 80
+    value |= int.from_bytes(urandom(10), "big")
+    chars = []
+    for _ in range(26):
+        chars.append(crockford[value & 0x1f])
+        value >>= 5
+    return "".join(reversed(chars))
+
+
+def id_to_bytes(value):
+    """packs a UUID formatted id into 16 bytes"""
+    return uuid.UUID(value).bytes
+
+
+def is_uuid(value):
+    """whether value is a UUID formatted id that id_to_bytes can pack"""
+    try:
+        uuid.UUID(value)
+    except (AttributeError, TypeError, ValueError):
+        return False
+    return True
+
+
+def id_from_bytes(value):
+    """unpacks 16 bytes into a UUID formatted id"""
+    return str(uuid.UUID(bytes=bytes(value)))
+
+
+generators = {"uuid4": uuid4, "uuid7": uuid7, "ulid": ulid}
+generate_id = generators[getenv("HBNB_ID_SCHEME", "uuid7")]
+
+
+def set_generator(generator):
+    """replaces the id generator by a name in generators or a callable"""
+    global generate_id
+    if not callable(generator):
+        generator = generators[generator]
+    generate_id = generator
@@ -0,0 +1,100 @@
+#!/usr/bin/python3
+"""
+Contains the PasswordHasher class
+
+Passwords are stored as salted PBKDF2-SHA256 hashes in the form
+``pbkdf2_sha256$<iterations>$<salt hex>$<hash hex>``. The key derivation
+runs in a bounded thread pool (hashlib releases the GIL while deriving) so
+a burst of user creations or logins can only keep a fixed number of cores
+busy while the other request threads keep being served.
+"""
+
+import hashlib
+import hmac
+from os import getenv, urandom
+import re
+from threading import Lock
+
+ALGORITHM = "pbkdf2_sha256"
+md5_pattern = re.compile(r"^[0-9a-f]{32}$")
+
+
+class PasswordHasher:
+    """hashes and verifies passwords in a bounded worker pool"""
+
+    def __init__(self, iterations=None, workers=None, salt_size=16):
+        """Instantiate a PasswordHasher
+
+        iterations and workers default to HBNB_PWD_ITERATIONS and
+        HBNB_PWD_WORKERS from the environment.
+        """
+        if iterations is None:
+            iterations = getenv("HBNB_PWD_ITERATIONS", 200000)
+        if workers is None:
+            workers = getenv("HBNB_PWD_WORKERS", 2)
+        self.iterations = int(iterations)
+        self.workers = int(workers)
+        self.salt_size = salt_size
+        self.__pool = None
+        self.__lock = Lock()
+
+    def _derive(self, password, salt, iterations):
+        """runs the key derivation on one of the pool threads"""
+        with self.__lock:
+            if self.__pool is None:
+                from concurrent.futures import ThreadPoolExecutor
+                self.__pool = ThreadPoolExecutor(
+                    max_workers=self.workers,
+                    thread_name_prefix="password_hasher")
+        return self.__pool.submit(hashlib.pbkdf2_hmac, "sha256",
+                                  password.encode(), salt,
+                                  iterations).result()
+
+    def hash(self, password):
+        """returns the salted hash string of password"""
+        salt = urandom(self.salt_size)
+        digest = self._derive(password, salt, self.iterations)
+        return "{}${}${}${}".format(ALGORITHM, self.iterations,
+                                    salt.hex(), digest.hex())
+
+    def is_hashed(self, value):
+        """True if value is a hash string produced by this hasher"""
+        return type(value) is str and value.startswith(ALGORITHM + "$")
+
+    def is_legacy(self, value):
+        """True if value is an unsalted MD5 hex digest"""
+        return type(value) is str and md5_pattern.match(value) is not None
+
+    def needs_rehash(self, value):
+        """True if value is legacy or uses a lower cost than configured"""
+        if not self.is_hashed(value):
+            return True
+        return int(value.split("$")[1]) < self.iterations
+
+    def verify(self, password, value):
+        """checks password against a stored hash (PBKDF2 or legacy MD5)"""
+        if password is None or not value:
+            return False
+        if self.is_legacy(value):
+            legacy = hashlib.md5(password.encode()).hexdigest()
+            return hmac.compare_digest(legacy, value)
+        if not self.is_hashed(value):
+            return False
+        try:
+            algorithm, iterations, salt, digest = value.split("$")
+            salt = bytes.fromhex(salt)
+            iterations = int(iterations)
+        except ValueError:
+            return False
+        new_digest = self._derive(password, salt, iterations)
+        return hmac.compare_digest(new_digest.hex(), digest)
+
+    def close(self):
+        """shuts the worker pool down"""
+        with self.__lock:
+            if self.__pool is not None:
+                self.__pool.shutdown()
+                self.__pool = None
+
+
+hasher = PasswordHasher()
@@ -1,19 +1,18 @@
 #!/usr/bin/python
 """ holds class Place"""
 import models
-from models.base_model import BaseModel, Base
+from models.base_model import BaseModel, Base, id_type
 from os import getenv
-import sqlalchemy
-from sqlalchemy import Column, String, Integer, Float, ForeignKey, Table
-from sqlalchemy.orm import relationship
-
 if models.storage_t == 'db':
+    from sqlalchemy import Column, String, Integer, Float, ForeignKey, Table
+    from sqlalchemy.orm import relationship
+
     place_amenity = Table('place_amenity', Base.metadata,
-                          Column('place_id', String(60),
+                          Column('place_id', id_type(),
                                  ForeignKey('places.id', onupdate='CASCADE',
                                             ondelete='CASCADE'),
                                  primary_key=True),
-                          Column('amenity_id', String(60),
+                          Column('amenity_id', id_type(),
                                  ForeignKey('amenities.id', onupdate='CASCADE',
                                             ondelete='CASCADE'),
                                  primary_key=True))
@@ -23,16 +22,19 @@ class Place(BaseModel, Base):
     """Representation of Place """
     if models.storage_t == 'db':
         __tablename__ = 'places'
-        city_id = Column(String(60), ForeignKey('cities.id'), nullable=False)
-        user_id = Column(String(60), ForeignKey('users.id'), nullable=False)
+        city_id = Column(id_type(), ForeignKey('cities.id'), nullable=False)
+        user_id = Column(id_type(), ForeignKey('users.id'), nullable=False)
         name = Column(String(128), nullable=False)
         description = Column(String(1024), nullable=True)
-        number_rooms = Column(Integer, nullable=False, default=0)
+        number_rooms = Column(Integer, nullable=False, default=0,
+                              index=True)
         number_bathrooms = Column(Integer, nullable=False, default=0)
-        max_guest = Column(Integer, nullable=False, default=0)
-        price_by_night = Column(Integer, nullable=False, default=0)
-        latitude = Column(Float, nullable=True)
-        longitude = Column(Float, nullable=True)
+        max_guest = Column(Integer, nullable=False, default=0,
+                           index=True)
+        price_by_night = Column(Integer, nullable=False, default=0,
+                                index=True)
+        latitude = Column(Float, nullable=True, index=True)
+        longitude = Column(Float, nullable=True, index=True)
         reviews = relationship("Review", backref="place")
         amenities = relationship("Amenity", secondary="place_amenity",
                                  backref="place_amenities",
@@ -68,11 +70,7 @@ class Place(BaseModel, Base):
 
         @property
         def amenities(self):
-            """getter attribute returns the list of Amenity instances"""
+            """getter attribute returns the list of Amenity instances
+            linked through amenity_ids"""
             from models.amenity import Amenity
-            amenity_list = []
-            all_amenities = models.storage.all(Amenity)
-            for amenity in all_amenities.values():
-                if amenity.place_id == self.id:
-                    amenity_list.append(amenity)
-            return amenity_list
+            return models.storage.get_many(Amenity, self.amenity_ids)
@@ -1,18 +1,18 @@
 #!/usr/bin/python
 """ holds class Review"""
 import models
-from models.base_model import BaseModel, Base
+from models.base_model import BaseModel, Base, id_type
 from os import getenv
-import sqlalchemy
-from sqlalchemy import Column, String, ForeignKey
+if models.storage_t == 'db':
+    from sqlalchemy import Column, String, ForeignKey
 
 
 class Review(BaseModel, Base):
     """Representation of Review """
     if models.storage_t == 'db':
         __tablename__ = 'reviews'
-        place_id = Column(String(60), ForeignKey('places.id'), nullable=False)
-        user_id = Column(String(60), ForeignKey('users.id'), nullable=False)
+        place_id = Column(id_type(), ForeignKey('places.id'), nullable=False)
+        user_id = Column(id_type(), ForeignKey('users.id'), nullable=False)
         text = Column(String(1024), nullable=False)
     else:
         place_id = ""
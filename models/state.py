@@ -4,9 +4,9 @@ import models
 from models.base_model import BaseModel, Base
 from models.city import City
 from os import getenv
-import sqlalchemy
-from sqlalchemy import Column, String, ForeignKey
-from sqlalchemy.orm import relationship
+if models.storage_t == "db":
+    from sqlalchemy import Column, String, ForeignKey
+    from sqlalchemy.orm import relationship
 
 
 class State(BaseModel, Base):
@@ -2,12 +2,11 @@
 """ holds class User"""
 import models
 from models.base_model import BaseModel, Base
+from models.password_hasher import hasher
 from os import getenv
-import sqlalchemy
-from sqlalchemy import Column, String
-from sqlalchemy.orm import relationship
-# import md5
-from hashlib import md5
+if models.storage_t == 'db':
+    from sqlalchemy import Column, String
+    from sqlalchemy.orm import relationship
 
 
 class User(BaseModel, Base):
@@ -29,6 +28,26 @@ class User(BaseModel, Base):
     def __init__(self, *args, **kwargs):
         """initializes user with hashed password"""
         super().__init__(*args, **kwargs)
-        # hash the password to a MD5 value
+        # always hash: a password that looks like a hash is still a
+        # password, only from_stored keeps a stored hash as is
         if 'password' in kwargs:
-            self.password = md5(kwargs['password'].encode()).hexdigest()
+            self.password = hasher.hash(kwargs['password'])
+
+    @classmethod
+    def from_stored(cls, record):
+        """user read back from the storage engine, keeping its hash"""
+        record = dict(record)
+        password = record.pop('password', None)
+        user = cls(**record)
+        if password is not None:
+            user.password = password
+        return user
+
+    def check_password(self, password):
+        """checks password and upgrades a legacy or weaker stored hash"""
+        if not hasher.verify(password, self.password):
+            return False
+        if hasher.needs_rehash(self.password):
+            self.password = hasher.hash(password)
+            self.save()
+        return True
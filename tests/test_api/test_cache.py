@@ -0,0 +1,150 @@
+#!/usr/bin/python3
+"""
+Contains the TestCacheDocs, TestResponseCache and TestCachedView classes
+"""
+
+from api.v1 import cache
+from api.v1.app import app
+import inspect
+from models import storage
+from models.state import State
+import pep8
+import unittest
+from unittest import mock
+ResponseCache = cache.ResponseCache
+
+
+class TestCacheDocs(unittest.TestCase):
+    """Tests to check the documentation and style of cache.py"""
+    def test_pep8_conformance_cache(self):
+        """Test that cache.py and its tests conform to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/cache.py',
+                                    'tests/test_api/test_cache.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_cache_module_docstring(self):
+        """Test for the cache.py module docstring"""
+        self.assertIsNot(cache.__doc__, None, "cache.py needs a docstring")
+
+    def test_rc_func_docstrings(self):
+        """Test for the presence of docstrings in ResponseCache methods"""
+        for name, func in inspect.getmembers(ResponseCache,
+                                             inspect.isfunction):
+            self.assertIsNot(func.__doc__, None,
+                             "{:s} method needs a docstring".format(name))
+
+
+class TestResponseCache(unittest.TestCase):
+    """Test the ResponseCache class"""
+    def setUp(self):
+        """Creates a cache of two entries"""
+        self.cache = ResponseCache(2)
+
+    def put(self, key, names=('State',)):
+        """stores the body key built from names, returns its etag"""
+        return self.cache.put(key, key.encode(), names,
+                              self.cache.snapshot(names))
+
+    def test_get(self):
+        """Test that a stored body is returned with its etag"""
+        self.assertIsNone(self.cache.get('a'))
+        etag = self.put('a')
+        self.assertEqual(self.cache.get('a'),
+                         (b'a', etag, 'application/json'))
+        self.assertEqual(etag, self.put('a'))
+        self.assertNotEqual(etag, self.put('b'))
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted"""
+        self.put('a')
+        self.put('b')
+        self.cache.get('a')
+        self.put('c')
+        self.assertEqual(len(self.cache), 2)
+        self.assertIsNone(self.cache.get('b'))
+        self.assertIsNotNone(self.cache.get('a'))
+        self.assertIsNotNone(self.cache.get('c'))
+
+    def test_disabled(self):
+        """Test that a cache of size 0 keeps nothing"""
+        disabled = ResponseCache(0)
+        disabled.put('a', b'a', ('State',), disabled.snapshot(('State',)))
+        self.assertIsNone(disabled.get('a'))
+
+    def test_invalidate_per_class(self):
+        """Test that a write drops only the entries built from its class"""
+        self.put('states', ('State',))
+        self.put('cities', ('State', 'City'))
+        self.cache.invalidate('save', 'City')
+        self.assertIsNotNone(self.cache.get('states'))
+        self.assertIsNone(self.cache.get('cities'))
+        self.cache.invalidate('new', 'State')
+        self.assertEqual(len(self.cache), 0)
+
+    def test_write_during_build(self):
+        """Test that a body built across a write is not stored"""
+        snapshot = self.cache.snapshot(('State',))
+        self.cache.invalidate('save', 'State')
+        self.cache.put('a', b'stale', ('State',), snapshot)
+        self.assertIsNone(self.cache.get('a'))
+        snapshot = self.cache.snapshot(('State',))
+        self.cache.invalidate('save', 'Amenity')
+        self.cache.put('a', b'fresh', ('State',), snapshot)
+        self.assertEqual(self.cache.get('a')[0], b'fresh')
+
+    def test_ttl(self):
+        """Test that entries expire ttl seconds after being stored"""
+        expiring = ResponseCache(2, ttl=1)
+        with mock.patch.object(cache.time, 'monotonic', return_value=100):
+            expiring.put('a', b'a', ('State',),
+                         expiring.snapshot(('State',)))
+        with mock.patch.object(cache.time, 'monotonic', return_value=101):
+            self.assertIsNotNone(expiring.get('a'))
+        with mock.patch.object(cache.time, 'monotonic', return_value=101.5):
+            self.assertIsNone(expiring.get('a'))
+        self.assertEqual(len(expiring), 0)
+
+
+class TestCachedView(unittest.TestCase):
+    """Test the ETag handling of a cached view through the test client"""
+    def setUp(self):
+        """Stores a state and empties the cache"""
+        cache.response_cache.clear()
+        self.client = app.test_client()
+        self.state = State(name="Nevada")
+        self.state.save()
+
+    def tearDown(self):
+        """Deletes the state"""
+        storage.delete(self.state)
+        storage.save()
+
+    def test_etag(self):
+        """Test that a matching If-None-Match gets a 304"""
+        first = self.client.get('/api/v1/states')
+        self.assertEqual(first.status_code, 200)
+        etag = first.headers['ETag']
+        self.assertIn('Accept', first.headers['Vary'])
+        again = self.client.get('/api/v1/states',
+                                headers={'If-None-Match': etag})
+        self.assertEqual(again.status_code, 304)
+        self.assertEqual(again.get_data(), b'')
+        self.assertEqual(self.client.get('/api/v1/states').get_data(),
+                         first.get_data())
+
+    def test_etag_changes_on_write(self):
+        """Test that a write invalidates the cached response"""
+        etag = self.client.get('/api/v1/states').headers['ETag']
+        self.state.name = "Utah"
+        self.state.save()
+        response = self.client.get('/api/v1/states',
+                                   headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers['ETag'], etag)
+        self.assertIn(b'Utah', response.get_data())
+
+
+if __name__ == "__main__":
+    unittest.main()
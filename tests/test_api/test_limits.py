@@ -0,0 +1,163 @@
+#!/usr/bin/python3
+"""
+Contains the TestLimitsDocs, TestMemoryBuckets, TestSQLiteBuckets and
+TestConcurrencyLimiter classes
+"""
+
+from api.v1 import limits
+import inspect
+import os
+import pep8
+import sqlite3
+import tempfile
+import threading
+import time
+import unittest
+
+
+class TestLimitsDocs(unittest.TestCase):
+    """Tests to check the documentation and style of limits.py"""
+    def test_pep8_conformance_limits(self):
+        """Test that limits.py and its tests conform to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/limits.py',
+                                    'tests/test_api/test_limits.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_limits_module_docstring(self):
+        """Test for the limits.py module docstring"""
+        self.assertIsNot(limits.__doc__, None,
+                         "limits.py needs a docstring")
+
+    def test_func_docstrings(self):
+        """Test for the presence of docstrings in limits functions"""
+        for name, func in inspect.getmembers(limits, inspect.isfunction):
+            self.assertIsNot(func.__doc__, None,
+                             "{:s} needs a docstring".format(name))
+
+
+class BucketsTests:
+    """Tests shared by the token bucket backends"""
+    def test_burst_then_reject(self):
+        """Test that a bucket allows burst requests, then asks to wait"""
+        for _ in range(3):
+            self.assertEqual(self.buckets.take("a", 2, 3, now=100), 0)
+        self.assertAlmostEqual(self.buckets.take("a", 2, 3, now=100), 0.5)
+        self.assertEqual(self.buckets.take("b", 2, 3, now=100), 0)
+
+    def test_refill(self):
+        """Test that tokens come back at rate, up to burst"""
+        for _ in range(3):
+            self.buckets.take("a", 2, 3, now=100)
+        self.assertEqual(self.buckets.take("a", 2, 3, now=100.5), 0)
+        self.assertGreater(self.buckets.take("a", 2, 3, now=100.5), 0)
+        for _ in range(3):
+            self.assertEqual(self.buckets.take("a", 2, 3, now=200), 0)
+        self.assertGreater(self.buckets.take("a", 2, 3, now=200), 0)
+
+
+class TestMemoryBuckets(BucketsTests, unittest.TestCase):
+    """Test the MemoryBuckets class"""
+    def setUp(self):
+        """Creates empty buckets"""
+        self.buckets = limits.MemoryBuckets()
+
+    def test_prune_at_own_rate(self):
+        """Test that pruning drops only the buckets full at their rate"""
+        self.buckets.MAX_BUCKETS = 2
+        for _ in range(10):
+            self.buckets.take("fast", 10, 20, now=0)
+        self.buckets.take("idle", 10, 20, now=0)
+        # pruning with a slower rate must keep the drained fast bucket
+        self.buckets.take("slow", 5, 10, now=0.5)
+        for _ in range(15):
+            self.assertEqual(self.buckets.take("fast", 10, 20, now=0.5), 0)
+        self.assertGreater(self.buckets.take("fast", 10, 20, now=0.5), 0)
+        buckets = self.buckets._MemoryBuckets__buckets
+        self.assertNotIn("idle", buckets)
+        self.assertIn("slow", buckets)
+
+
+class TestSQLiteBuckets(BucketsTests, unittest.TestCase):
+    """Test the SQLiteBuckets class"""
+    def setUp(self):
+        """Creates buckets in a temporary SQLite file"""
+        fd, self.path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        self.buckets = limits.SQLiteBuckets(self.path)
+
+    def tearDown(self):
+        """Removes the SQLite file"""
+        os.remove(self.path)
+
+    def keys(self):
+        """keys of the buckets stored in the file"""
+        with sqlite3.connect(self.path) as connection:
+            return set(key for key, in connection.execute(
+                'SELECT key FROM token_buckets'))
+
+    def test_shared(self):
+        """Test that two backends on one file share their buckets"""
+        other = limits.SQLiteBuckets(self.path)
+        self.assertEqual(self.buckets.take("a", 1, 1, now=100), 0)
+        self.assertGreater(other.take("a", 1, 1, now=100), 0)
+
+    def test_prune(self):
+        """Test that buckets full at their own rate are deleted"""
+        self.buckets.PRUNE_INTERVAL = 0
+        for _ in range(10):
+            self.buckets.take("fast", 10, 20, now=0)
+        self.buckets.take("idle", 10, 20, now=0)
+        self.buckets.take("slow", 5, 10, now=0.5)
+        self.assertEqual(self.keys(), {"fast", "slow"})
+        self.buckets.take("new", 5, 10, now=2)
+        self.assertEqual(self.keys(), {"new"})
+
+    def test_prune_interval(self):
+        """Test that buckets are deleted at most every PRUNE_INTERVAL"""
+        self.buckets.take("idle", 10, 20, now=0)
+        self.buckets.take("other", 10, 20, now=30)
+        self.assertEqual(self.keys(), {"idle", "other"})
+        self.buckets.take("new", 10, 20, now=60)
+        self.assertEqual(self.keys(), {"new"})
+
+
+class TestConcurrencyLimiter(unittest.TestCase):
+    """Test the ConcurrencyLimiter class"""
+    def test_max_active(self):
+        """Test that requests beyond max_active are shed at once"""
+        limiter = limits.ConcurrencyLimiter(2)
+        self.assertTrue(limiter.acquire())
+        self.assertTrue(limiter.acquire())
+        self.assertFalse(limiter.acquire())
+        limiter.release()
+        self.assertTrue(limiter.acquire())
+
+    def test_queue_timeout(self):
+        """Test that a queued request gives up after timeout"""
+        limiter = limits.ConcurrencyLimiter(1, max_queue=1, timeout=0.05)
+        self.assertTrue(limiter.acquire())
+        start = time.monotonic()
+        self.assertFalse(limiter.acquire())
+        self.assertGreaterEqual(time.monotonic() - start, 0.05)
+
+    def test_queue_wait(self):
+        """Test that a queued request gets the slot released, and that
+        requests beyond the queue are shed"""
+        limiter = limits.ConcurrencyLimiter(1, max_queue=1, timeout=5)
+        self.assertTrue(limiter.acquire())
+        admitted = []
+        waiter = threading.Thread(
+            target=lambda: admitted.append(limiter.acquire()))
+        waiter.start()
+        while not limiter._ConcurrencyLimiter__waiting:
+            time.sleep(0.001)
+        self.assertFalse(limiter.acquire())
+        limiter.release()
+        waiter.join(5)
+        self.assertEqual(admitted, [True])
+
+
+if __name__ == "__main__":
+    unittest.main()
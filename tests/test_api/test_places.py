@@ -0,0 +1,115 @@
+#!/usr/bin/python3
+"""
+Contains the TestPlacesDocs and TestPlacesSearch classes
+"""
+
+from api.v1.app import app
+from api.v1.views import places
+from models import storage
+from models.city import City
+from models.place import Place
+from models.state import State
+from models.user import User
+import pep8
+import unittest
+
+
+class TestPlacesDocs(unittest.TestCase):
+    """Tests to check the style of the places views"""
+    def test_pep8_conformance_places(self):
+        """Test that places.py and its tests conform to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/views/places.py',
+                                    'tests/test_api/test_places.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_places_module_docstring(self):
+        """Test for the places.py module docstring"""
+        self.assertIsNot(places.__doc__, None,
+                         "places.py needs a docstring")
+
+
+class TestPlacesSearch(unittest.TestCase):
+    """Test the place views through the Flask test client"""
+    def setUp(self):
+        """Stores a state, a city, a user and two places"""
+        self.client = app.test_client()
+        self.state = State(name="California")
+        self.city = City(name="San Francisco", state_id=self.state.id)
+        self.user = User(email="host@hbnb.io", password="pwd")
+        self.places = [Place(name="Place {}".format(i), city_id=self.city.id,
+                             user_id=self.user.id, price_by_night=price,
+                             latitude=37.77, longitude=-122.42)
+                       for i, price in enumerate((80, 120))]
+        self.objs = [self.state, self.city, self.user] + self.places
+        for obj in self.objs:
+            storage.new(obj)
+        storage.save()
+
+    def tearDown(self):
+        """Deletes the stored objects"""
+        for obj in reversed(self.objs):
+            storage.delete(obj)
+        storage.save()
+
+    def search(self, body):
+        """status and ids of a /places_search"""
+        response = self.client.post('/api/v1/places_search', json=body)
+        if response.status_code != 200:
+            return response.status_code, None
+        return 200, set(p["id"] for p in response.get_json())
+
+    def test_non_finite_update(self):
+        """Test that NaN and infinite numbers are rejected"""
+        path = '/api/v1/places/' + self.places[0].id
+        for body in ({"price_by_night": "nan"}, {"max_guest": "inf"},
+                     {"number_rooms": "-Infinity"}):
+            self.assertEqual(self.client.put(path, json=body).status_code,
+                             400)
+        response = self.client.post(
+            '/api/v1/cities/{}/places'.format(self.city.id),
+            json={"user_id": self.user.id, "name": "X",
+                  "price_by_night": "nan"})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.search({"price_by_night": {"min": 0}}),
+                         (200, set(p.id for p in self.places)))
+        response = self.client.put(path, json={"price_by_night": 90})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.search({"price_by_night": {"max": 100}}),
+                         (200, {self.places[0].id}))
+
+    def test_non_finite_range(self):
+        """Test that NaN and infinite range bounds are rejected"""
+        # the JSON provider would encode NaN as null: send the text
+        for bound in ("NaN", "Infinity", "-Infinity"):
+            response = self.client.post(
+                '/api/v1/places_search', content_type='application/json',
+                data='{"price_by_night": {"min": ' + bound + '}}')
+            self.assertEqual(response.status_code, 400)
+
+    def test_invalid_ids(self):
+        """Test that states, cities and amenities must be lists of ids"""
+        for body in ({"amenities": [{"a": 1}]}, {"states": [["x"]]},
+                     {"cities": "x"}, {"states": [1]}, {"amenities": None}):
+            self.assertEqual(self.search(body), (400, None))
+        self.assertEqual(self.search({"states": [self.state.id],
+                                      "amenities": []}),
+                         (200, set(p.id for p in self.places)))
+
+    def test_near_caps(self):
+        """Test that radius and limit above their caps are rejected"""
+        path = '/api/v1/places/near?lat=37.77&lng=-122.42&'
+        for query in ('radius={}'.format(places.NEAR_MAX_RADIUS + 1),
+                      'radius=20000',
+                      'limit={}'.format(places.NEAR_MAX_LIMIT + 1)):
+            self.assertEqual(self.client.get(path + query).status_code, 400)
+        response = self.client.get(path + 'radius={}&limit={}'.format(
+            places.NEAR_MAX_RADIUS, places.NEAR_MAX_LIMIT))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(p["id"] for p in response.get_json()),
+                         set(p.id for p in self.places))
+
+
+if __name__ == "__main__":
+    unittest.main()
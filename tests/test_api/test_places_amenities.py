@@ -0,0 +1,117 @@
+#!/usr/bin/python3
+"""
+Contains the TestPlacesAmenitiesDocs and TestBatchPlaceAmenities classes
+"""
+
+from api.v1.app import app
+from api.v1.views import places_amenities
+from models import storage
+from models.amenity import Amenity
+from models.city import City
+from models.place import Place
+from models.state import State
+from models.user import User
+import pep8
+import unittest
+from unittest import mock
+
+
+class TestPlacesAmenitiesDocs(unittest.TestCase):
+    """Tests to check the style of the place amenities views"""
+    def test_pep8_conformance_places_amenities(self):
+        """Test that places_amenities.py and its tests conform to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/views/places_amenities.py',
+                                    'tests/test_api/'
+                                    'test_places_amenities.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_places_amenities_module_docstring(self):
+        """Test for the places_amenities.py module docstring"""
+        self.assertIsNot(places_amenities.__doc__, None,
+                         "places_amenities.py needs a docstring")
+
+
+class TestBatchPlaceAmenities(unittest.TestCase):
+    """Test POST and DELETE /places/<place_id>/amenities"""
+    def setUp(self):
+        """Stores a place and three amenities"""
+        self.client = app.test_client()
+        state = State(name="California")
+        city = City(name="San Francisco", state_id=state.id)
+        user = User(email="host@hbnb.io", password="pwd")
+        self.place = Place(name="Loft", city_id=city.id, user_id=user.id)
+        self.amenities = [Amenity(name=name)
+                          for name in ("Wifi", "Pool", "Sauna")]
+        self.objs = [state, city, user, self.place] + self.amenities
+        for obj in self.objs:
+            storage.new(obj)
+        storage.save()
+        self.path = '/api/v1/places/{}/amenities'.format(self.place.id)
+
+    def tearDown(self):
+        """Deletes the stored objects, as loaded by the current session"""
+        storage.close()
+        for obj in reversed(self.objs):
+            storage.delete(storage.get(type(obj), obj.id))
+        storage.save()
+
+    def send(self, method, ids):
+        """[(amenity_id, status)] of a batch request"""
+        response = self.client.open(self.path, method=method,
+                                    json={"amenity_ids": ids})
+        self.assertEqual(response.status_code, 200)
+        return [(item["amenity_id"], item["status"])
+                for item in response.get_json()]
+
+    def linked(self):
+        """ids of the amenities listed by GET, as stored"""
+        storage.close()
+        return set(amenity["id"] for amenity in
+                   self.client.get(self.path).get_json())
+
+    def test_link(self):
+        """Test the status of new, repeated, linked and unknown ids"""
+        wifi, pool, sauna = (amenity.id for amenity in self.amenities)
+        self.assertEqual(self.send('POST', [wifi]), [(wifi, 201)])
+        self.assertEqual(self.send('POST', [pool, wifi, "nope", pool]),
+                         [(pool, 201), (wifi, 200), ("nope", 404),
+                          (pool, 200)])
+        self.assertEqual(self.linked(), {wifi, pool})
+
+    def test_unlink(self):
+        """Test the status of linked, repeated, unlinked and unknown ids"""
+        wifi, pool, sauna = (amenity.id for amenity in self.amenities)
+        self.send('POST', [wifi, pool])
+        self.assertEqual(self.send('DELETE', [wifi, sauna, "nope", wifi]),
+                         [(wifi, 200), (sauna, 404), ("nope", 404),
+                          (wifi, 404)])
+        self.assertEqual(self.linked(), {pool})
+
+    def test_single_save(self):
+        """Test that a batch saves the place once, and not when nothing
+        changed"""
+        ids = [amenity.id for amenity in self.amenities]
+        with mock.patch.object(storage, 'save',
+                               wraps=storage.save) as save:
+            self.send('POST', ids)
+            self.assertEqual(save.call_count, 1)
+            self.send('POST', ids)
+            self.assertEqual(save.call_count, 1)
+        self.assertEqual(self.linked(), set(ids))
+
+    def test_errors(self):
+        """Test the errors of the whole request"""
+        self.assertEqual(self.client.post(
+            self.path, json={"ids": []}).status_code, 400)
+        self.assertEqual(self.client.post(
+            self.path, data="x", content_type="application/json"
+        ).status_code, 400)
+        self.assertEqual(self.client.post(
+            '/api/v1/places/nope/amenities',
+            json={"amenity_ids": []}).status_code, 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+#!/usr/bin/python3
+"""
+Contains the TestPlacesReviewsDocs and TestCreateReviews classes
+"""
+
+from api.v1.app import app
+from api.v1.views import places_reviews
+from models import storage
+from models.city import City
+from models.place import Place
+from models.review import Review
+from models.state import State
+from models.user import User
+import pep8
+import unittest
+from unittest import mock
+
+
+class TestPlacesReviewsDocs(unittest.TestCase):
+    """Tests to check the style of the place reviews views"""
+    def test_pep8_conformance_places_reviews(self):
+        """Test that places_reviews.py and its tests conform to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/views/places_reviews.py',
+                                    'tests/test_api/test_places_reviews.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_places_reviews_module_docstring(self):
+        """Test for the places_reviews.py module docstring"""
+        self.assertIsNot(places_reviews.__doc__, None,
+                         "places_reviews.py needs a docstring")
+
+
+class TestCreateReviews(unittest.TestCase):
+    """Test POST /places/<place_id>/reviews with a list of reviews"""
+    def setUp(self):
+        """Stores a place and two users"""
+        self.client = app.test_client()
+        state = State(name="California")
+        city = City(name="San Francisco", state_id=state.id)
+        self.users = [User(email="user{}@hbnb.io".format(i), password="pwd")
+                      for i in range(2)]
+        self.place = Place(name="Loft", city_id=city.id,
+                           user_id=self.users[0].id)
+        self.objs = [state, city] + self.users + [self.place]
+        for obj in self.objs:
+            storage.new(obj)
+        storage.save()
+        self.path = '/api/v1/places/{}/reviews'.format(self.place.id)
+
+    def tearDown(self):
+        """Deletes the stored objects and the reviews created, as loaded by
+        the current session"""
+        for review in self.reviews():
+            storage.delete(review)
+        for obj in reversed(self.objs):
+            storage.delete(storage.get(type(obj), obj.id))
+        storage.save()
+
+    def reviews(self):
+        """stored reviews of the place"""
+        storage.close()
+        return [review for review in storage.all(Review).values()
+                if review.place_id == self.place.id]
+
+    def test_mixed_items(self):
+        """Test that valid items are created next to invalid ones"""
+        first, second = (user.id for user in self.users)
+        response = self.client.post(self.path, json=[
+            {"user_id": first, "text": "Great"},
+            {"text": "No user"},
+            {"user_id": second},
+            "not a review",
+            {"user_id": "nope", "text": "Unknown user"},
+            {"user_id": second, "text": "Nice"}])
+        self.assertEqual(response.status_code, 200)
+        results = response.get_json()
+        self.assertEqual([result["status"] for result in results],
+                         [201, 400, 400, 400, 404, 201])
+        self.assertEqual([result.get("error") for result in results[1:5]],
+                         ["Missing user_id", "Missing text", "Not a JSON",
+                          "Not found"])
+        created = {result["review"]["id"]: result["review"]
+                   for result in results if result["status"] == 201}
+        stored = self.reviews()
+        self.assertEqual(set(review.id for review in stored), set(created))
+        for review in stored:
+            self.assertEqual(created[review.id]["text"], review.text)
+            self.assertEqual(created[review.id]["place_id"], self.place.id)
+
+    def test_single_commit(self):
+        """Test that the valid reviews are stored with one save"""
+        items = [{"user_id": self.users[i % 2].id, "text": str(i)}
+                 for i in range(5)]
+        with mock.patch.object(storage, 'save', wraps=storage.save) as save, \
+                mock.patch.object(storage, 'new_many',
+                                  wraps=storage.new_many) as new_many:
+            response = self.client.post(self.path, json=items)
+            self.assertEqual(save.call_count, 1)
+            self.assertEqual(new_many.call_count, 1)
+            self.assertEqual(len(new_many.call_args[0][0]), 5)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(sorted(review.text for review in self.reviews()),
+                         ["0", "1", "2", "3", "4"])
+
+    def test_nothing_valid(self):
+        """Test that a list without valid items stores nothing"""
+        with mock.patch.object(storage, 'save', wraps=storage.save) as save:
+            response = self.client.post(self.path, json=[{"text": "x"}])
+            self.assertEqual(save.call_count, 0)
+        self.assertEqual(response.get_json(),
+                         [{"status": 400, "error": "Missing user_id"}])
+        self.assertEqual(self.reviews(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
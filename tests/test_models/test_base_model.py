@@ -138,6 +138,37 @@ class TestBaseModel(unittest.TestCase):
         self.assertEqual(new_d["created_at"], bm.created_at.strftime(t_format))
         self.assertEqual(new_d["updated_at"], bm.updated_at.strftime(t_format))
 
+    def test_to_dict_fields(self):
+        """Test that to_dict(fields=...) builds only the requested keys"""
+        bm = BaseModel()
+        bm.name = "Holberton"
+        bm.my_number = 89
+        d = bm.to_dict(fields=["name", "missing"])
+        self.assertEqual(d, {"id": bm.id, "__class__": "BaseModel",
+                             "name": "Holberton"})
+        self.assertEqual(bm.to_dict(fields=[]),
+                         {"id": bm.id, "__class__": "BaseModel"})
+        self.assertEqual(bm.to_dict(fields=["__class__", "id"]),
+                         {"id": bm.id, "__class__": "BaseModel"})
+
+    def test_to_dict_fields_values(self):
+        """Test that projected datetimes are formatted as in to_dict"""
+        bm = BaseModel()
+        d = bm.to_dict(fields=["created_at", "updated_at"])
+        self.assertEqual(d["created_at"], bm.to_dict()["created_at"])
+        self.assertEqual(d["updated_at"], bm.to_dict()["updated_at"])
+
+    def test_to_dict_fields_password(self):
+        """Test that password stays excluded when asked for by name"""
+        bm = BaseModel()
+        bm.password = "secret"
+        self.assertNotIn("password", bm.to_dict(fields=["password"]))
+        self.assertEqual(bm.to_dict(exclude_password=False,
+                                    fields=["password"])["password"],
+                         "secret")
+        self.assertNotIn("_sa_instance_state",
+                         bm.to_dict(fields=["_sa_instance_state"]))
+
     def test_str(self):
         """test that the str method has the correct output"""
         inst = BaseModel()
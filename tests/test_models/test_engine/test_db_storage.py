@@ -128,3 +128,47 @@ class TestFileStorage(unittest.TestCase):
         count_all = storage.count()
         count_state = storage.count(State)
         self.assertEqual(count_all, count_state)
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_get_identity_map(self):
+        """Test that get returns the object loaded earlier in the session"""
+        new_state = State(name="Vermont")
+        new_state.save()
+        first = models.storage.get(State, new_state.id)
+        self.assertIs(models.storage.get(State, new_state.id), first)
+        self.assertEqual(models.storage.get_many(State, [new_state.id]),
+                         [first])
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_malformed_ids(self):
+        """Test that ids that are not UUIDs match nothing, even when ids
+        are stored as BINARY(16)"""
+        new_state = State(name="Oregon")
+        new_state.save()
+        self.assertIsNone(models.storage.get(State, "not-a-uuid"))
+        self.assertEqual(models.storage.get_many(
+            State, ["not-a-uuid", new_state.id]), [new_state])
+        self.assertEqual(models.storage.get_related(
+            City, "state_id", ["not-a-uuid"]), {})
+        self.assertEqual(models.storage.search_places(
+            states=["not-a-uuid"]), [])
+        self.assertEqual(models.storage.search_places(
+            amenities=["not-a-uuid"]), [])
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_new_many(self):
+        """Test that new_many inserts the rows and the amenity links"""
+        state = State(name="Iowa")
+        city = City(name="Ames", state_id=state.id)
+        user = User(email="iowa@hbnb.io", password="pwd")
+        amenity = Amenity(name="Wifi")
+        place = Place(name="Loft", city_id=city.id, user_id=user.id)
+        place.amenity_ids = [amenity.id]
+        models.storage.new_many([place, amenity, user, city, state])
+        models.storage.save()
+        models.storage.close()
+        stored = models.storage.get(Place, place.id)
+        self.assertEqual(stored.number_rooms, 0)
+        self.assertEqual([a.id for a in stored.amenities], [amenity.id])
+        self.assertEqual(models.storage.get(City, city.id).state_id,
+                         state.id)
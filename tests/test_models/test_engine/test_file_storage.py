@@ -18,6 +18,7 @@ import json
 import os
 import pep8
 import unittest
+from unittest import mock
 FileStorage = file_storage.FileStorage
 classes = {"Amenity": Amenity, "BaseModel": BaseModel, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
@@ -155,3 +156,191 @@ class TestFileStorage(unittest.TestCase):
         count_all = storage.count()
         count_sum = sum(storage.count(cls) for cls in classes.values())
         self.assertEqual(count_all, count_sum)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_save_serializes_only_modified(self):
+        """Test that save only calls to_dict on new or modified objects"""
+        storage = FileStorage()
+        first = State(name="Oregon")
+        second = State(name="Nevada")
+        storage.new(first)
+        storage.new(second)
+        storage.save()
+        first.name = "Utah"
+        patch = mock.patch.object(State, "to_dict", autospec=True,
+                                  side_effect=BaseModel.to_dict)
+        with patch as m:
+            storage.save()
+        self.assertEqual(m.call_count, 1)
+        self.assertIs(m.call_args[0][0], first)
+        with open("file.json", "r") as f:
+            js = json.load(f)
+        self.assertEqual(js["State." + first.id]["name"], "Utah")
+        self.assertEqual(js["State." + second.id]["name"], "Nevada")
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_save_drops_deleted(self):
+        """Test that deleted objects are removed from file.json on save"""
+        storage = FileStorage()
+        state = State(name="Ohio")
+        storage.new(state)
+        storage.save()
+        storage.delete(state)
+        storage.save()
+        with open("file.json", "r") as f:
+            js = json.load(f)
+        self.assertNotIn("State." + state.id, js)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_subscribe(self):
+        """Test that listeners are notified of writes per class"""
+        storage = FileStorage()
+        events = []
+        storage.subscribe(lambda event, name: events.append((event, name)))
+        try:
+            state = State(name="Iowa")
+            storage.new(state)
+            storage.save()
+            storage.delete(state)
+        finally:
+            FileStorage._FileStorage__listeners.pop()
+        self.assertIn(("new", "State"), events)
+        self.assertIn(("save", "State"), events)
+        self.assertIn(("delete", "State"), events)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_iter(self):
+        """Test that iter yields the objects of a class lazily"""
+        storage = FileStorage()
+        state = State(name="Maine")
+        storage.new(state)
+        objs = storage.iter(State)
+        self.assertNotIsInstance(objs, (list, dict))
+        objs = list(objs)
+        self.assertIn(state, objs)
+        self.assertTrue(all(type(obj) is State for obj in objs))
+        self.assertEqual(len(objs), storage.count(State))
+        self.assertEqual(len(list(storage.iter())), storage.count())
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_count_class_name(self):
+        """Test that count and all accept class names"""
+        storage = FileStorage()
+        storage.new(State(name="Idaho"))
+        self.assertEqual(storage.count("State"), storage.count(State))
+        self.assertEqual(storage.all("State"), storage.all(State))
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_get_many(self):
+        """Test that get_many resolves ids in order, skipping unknown ones"""
+        storage = FileStorage()
+        first = State(name="Ohio")
+        second = State(name="Utah")
+        storage.new(first)
+        storage.new(second)
+        objs = storage.get_many(State, [second.id, "nonexistent_id",
+                                        first.id, second.id])
+        self.assertEqual(objs, [second, first])
+        self.assertEqual(storage.get_many("State", [first.id]), [first])
+        self.assertEqual(storage.get_many(City, [first.id]), [])
+        self.assertIs(storage.get("State", first.id), first)
+        self.assertIsNone(storage.get(City, first.id))
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_new_many(self):
+        """Test that new_many stores every object like new"""
+        storage = FileStorage()
+        state = State(name="Iowa")
+        city = City(name="Ames", state_id=state.id)
+        storage.new_many([state, city])
+        self.assertIs(storage.get(State, state.id), state)
+        self.assertIs(storage.all(City)["City." + city.id], city)
+        self.assertEqual(storage.get_related(City, "state_id",
+                                             [state.id])[state.id], [city])
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_get_related(self):
+        """Test that get_related follows new, updated and deleted objects"""
+        storage = FileStorage()
+        place_1 = Place().id
+        place_2 = Place().id
+        first = Review(place_id=place_1, user_id="user", text="a")
+        storage.new(first)
+        self.assertEqual(storage.get_related(Review, "place_id",
+                                             [place_1])[place_1],
+                         [first])
+        second = Review(place_id=place_2, user_id="user", text="b")
+        storage.new(second)
+        first.place_id = place_2
+        related = storage.get_related("Review", "place_id",
+                                      [place_1, place_2])
+        self.assertNotIn(place_1, related)
+        self.assertEqual(set(related[place_2]), {first, second})
+        storage.delete(second)
+        related = storage.get_related(Review, "place_id", [place_2])
+        self.assertEqual(related[place_2], [first])
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_reload_skips_unchanged_generation(self):
+        """Test that reload does not read the file when nothing was saved"""
+        storage = FileStorage()
+        state = State(name="Iowa")
+        storage.new(state)
+        storage.save()
+        with mock.patch.object(file_storage.json, "load") as m:
+            storage.reload()
+        m.assert_not_called()
+        self.assertIs(storage.get(State, state.id), state)
+
+    def write_as_other_process(self, update):
+        """Edits file.json with update(dict) and bumps its generation"""
+        with open("file.json", "r") as f:
+            js = json.load(f)
+        update(js)
+        with open("file.json", "w") as f:
+            json.dump(js, f)
+        with open("file.json.version", "r") as f:
+            generation = int(f.read())
+        with open("file.json.version", "w") as f:
+            f.write(str(generation + 1))
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_reload_applies_changed_records(self):
+        """Test that reload rebuilds only the records saved elsewhere"""
+        storage = FileStorage()
+        first = State(name="Iowa")
+        second = State(name="Texas")
+        storage.new(first)
+        storage.new(second)
+        storage.save()
+        other = State(name="Maine")
+        gone = "State." + second.id
+
+        def update(js):
+            """renames first, adds other and deletes second"""
+            js["State." + first.id]["name"] = "Kansas"
+            js["State." + other.id] = other.to_dict()
+            del js[gone]
+        self.write_as_other_process(update)
+        storage.reload()
+        self.assertEqual(storage.get(State, first.id).name, "Kansas")
+        self.assertEqual(storage.get(State, other.id).name, "Maine")
+        self.assertIsNone(storage.get(State, second.id))
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_save_merges_other_processes(self):
+        """Test that save keeps the records saved by another process"""
+        storage = FileStorage()
+        first = State(name="Iowa")
+        storage.new(first)
+        storage.save()
+        other = State(name="Maine")
+        self.write_as_other_process(
+            lambda js: js.update({"State." + other.id: other.to_dict()}))
+        first.name = "Ohio"
+        storage.save()
+        with open("file.json", "r") as f:
+            js = json.load(f)
+        self.assertEqual(js["State." + first.id]["name"], "Ohio")
+        self.assertEqual(js["State." + other.id]["name"], "Maine")
+        self.assertEqual(storage.get(State, other.id).name, "Maine")
@@ -0,0 +1,132 @@
+#!/usr/bin/python3
+"""
+Contains the TestSearchIndexDocs and TestSearchIndex classes
+"""
+
+import inspect
+from models.city import City
+from models.engine import search_index
+from models.place import Place
+import pep8
+import unittest
+SearchIndex = search_index.SearchIndex
+
+
+class TestSearchIndexDocs(unittest.TestCase):
+    """Tests to check the documentation and style of SearchIndex class"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.si_f = inspect.getmembers(SearchIndex, inspect.isfunction)
+
+    def test_pep8_conformance_search_index(self):
+        """Test that models/engine/search_index.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/search_index.py',
+                                    'tests/test_models/test_engine/'
+                                    'test_search_index.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_search_index_module_docstring(self):
+        """Test for the search_index.py module docstring"""
+        self.assertIsNot(search_index.__doc__, None,
+                         "search_index.py needs a docstring")
+
+    def test_search_index_class_docstring(self):
+        """Test for the SearchIndex class docstring"""
+        self.assertIsNot(SearchIndex.__doc__, None,
+                         "SearchIndex class needs a docstring")
+
+    def test_si_func_docstrings(self):
+        """Test for the presence of docstrings in SearchIndex methods"""
+        for func in self.si_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+
+
+class TestSearchIndex(unittest.TestCase):
+    """Test the SearchIndex class"""
+    def setUp(self):
+        """Builds a small index: two states, three cities, three places"""
+        self.index = SearchIndex()
+        self.cities = [City(state_id="s1"), City(state_id="s1"),
+                       City(state_id="s2")]
+        self.places = [
+            Place(city_id=self.cities[0].id, amenity_ids=["wifi", "tv"]),
+            Place(city_id=self.cities[1].id, amenity_ids=["wifi"]),
+            Place(city_id=self.cities[2].id, amenity_ids=["wifi", "tv"])]
+        for obj in self.places + self.cities:
+            self.index.add(obj)
+
+    def ids(self, *indexes):
+        """ids of the places at the given positions"""
+        return set(self.places[i].id for i in indexes)
+
+    def test_search_all(self):
+        """Test that no criteria returns every place"""
+        self.assertEqual(self.index.search(), self.ids(0, 1, 2))
+
+    def test_search_states_and_cities(self):
+        """Test that states and cities are unioned"""
+        self.assertEqual(self.index.search(states=["s1"]), self.ids(0, 1))
+        self.assertEqual(self.index.search(states=["s2"],
+                                           cities=[self.cities[1].id]),
+                         self.ids(1, 2))
+        self.assertEqual(self.index.search(states=["nope"]), set())
+
+    def test_search_amenities(self):
+        """Test that amenities are intersected"""
+        self.assertEqual(self.index.search(amenities=["wifi", "tv"]),
+                         self.ids(0, 2))
+        self.assertEqual(self.index.search(states=["s1"],
+                                           amenities=["tv"]),
+                         self.ids(0))
+        self.assertEqual(self.index.search(amenities=["tv", "nope"]),
+                         set())
+
+    def test_updates(self):
+        """Test that moved and removed objects are reindexed"""
+        self.places[1].city_id = self.cities[2].id
+        self.index.add(self.places[1])
+        self.assertEqual(self.index.search(states=["s2"]), self.ids(1, 2))
+        self.cities[0].state_id = "s2"
+        self.index.add(self.cities[0])
+        self.assertEqual(self.index.search(states=["s1"]), set())
+        self.index.remove(self.places[2])
+        self.assertEqual(self.index.search(states=["s2"]), self.ids(0, 1))
+
+    def test_search_ranges(self):
+        """Test min/max filters on numeric fields"""
+        for price, place in zip([50, 120, 200], self.places):
+            place.price_by_night = price
+            place.latitude = price / 10.0
+            self.index.add(place)
+        self.assertEqual(self.index.search(
+            ranges={"price_by_night": (100, None)}), self.ids(1, 2))
+        self.assertEqual(self.index.search(
+            ranges={"price_by_night": (None, 120)}), self.ids(0, 1))
+        self.assertEqual(self.index.search(
+            states=["s1"], ranges={"price_by_night": (100, 200),
+                                   "latitude": (0, 15)}), self.ids(1))
+        self.places[0].price_by_night = 150
+        self.index.add(self.places[0])
+        self.assertEqual(self.index.search(
+            ranges={"price_by_night": (130, 160)}), self.ids(0))
+        self.index.remove(self.places[2])
+        self.assertEqual(self.index.search(
+            ranges={"price_by_night": (100, None)}), self.ids(0, 1))
+
+    def test_non_finite_values(self):
+        """Test that NaN and infinite values are indexed as missing"""
+        self.places[0].price_by_night = "nan"
+        self.places[1].price_by_night = float("inf")
+        self.places[2].price_by_night = 80
+        for place in self.places:
+            self.index.add(place)
+        self.assertEqual(self.index.search(
+            ranges={"price_by_night": (None, None)}), self.ids(2))
+        self.places[0].price_by_night = 70
+        self.index.add(self.places[0])
+        self.assertEqual(self.index.search(
+            ranges={"price_by_night": (60, 100)}), self.ids(0, 2))
@@ -0,0 +1,89 @@
+#!/usr/bin/python3
+"""
+Contains the TestSpatialIndexDocs and TestSpatialIndex classes
+"""
+
+import inspect
+from models.engine import spatial_index
+import pep8
+import unittest
+SpatialIndex = spatial_index.SpatialIndex
+
+
+class TestSpatialIndexDocs(unittest.TestCase):
+    """Tests to check the documentation and style of SpatialIndex class"""
+    def test_pep8_conformance_spatial_index(self):
+        """Test that models/engine/spatial_index.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/spatial_index.py',
+                                    'tests/test_models/test_engine/'
+                                    'test_spatial_index.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_spatial_index_module_docstring(self):
+        """Test for the spatial_index.py module docstring"""
+        self.assertIsNot(spatial_index.__doc__, None,
+                         "spatial_index.py needs a docstring")
+
+    def test_func_docstrings(self):
+        """Test for the presence of docstrings in SpatialIndex methods"""
+        for func in inspect.getmembers(SpatialIndex, inspect.isfunction):
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+
+
+class TestSpatialIndex(unittest.TestCase):
+    """Test the SpatialIndex class"""
+    def setUp(self):
+        """Indexes a few cities"""
+        self.index = SpatialIndex()
+        self.index.add("paris", 48.8566, 2.3522)
+        self.index.add("versailles", 48.8049, 2.1204)
+        self.index.add("london", 51.5072, -0.1276)
+        self.index.add("fiji", -17.7, 179.9)
+        self.index.add("samoa", -17.7, -179.9)
+
+    def ids(self, *args, **kwargs):
+        """ids returned by near() in order"""
+        return [place_id for distance, place_id in
+                self.index.near(*args, **kwargs)]
+
+    def test_haversine(self):
+        """Test the distance between Paris and London"""
+        distance = spatial_index.haversine(48.8566, 2.3522, 51.5072, -0.1276)
+        self.assertAlmostEqual(distance, 343.5, delta=1)
+
+    def test_near_sorted(self):
+        """Test that results are within radius and closest first"""
+        self.assertEqual(self.ids(48.85, 2.35, 30), ["paris", "versailles"])
+        self.assertEqual(self.ids(48.85, 2.35, 400),
+                         ["paris", "versailles", "london"])
+        self.assertEqual(self.ids(48.85, 2.35, 400, limit=1), ["paris"])
+
+    def test_antimeridian(self):
+        """Test that a query crossing longitude 180 finds both sides"""
+        self.assertEqual(self.ids(-17.7, 179.95, 50), ["fiji", "samoa"])
+
+    def test_move_and_remove(self):
+        """Test that moved and removed places are reindexed"""
+        self.index.add("paris", 51.5, -0.12)
+        self.assertEqual(self.ids(48.85, 2.35, 30), ["versailles"])
+        self.index.remove("versailles")
+        self.index.add("london", None, None)
+        self.assertEqual(self.ids(51.5, -0.12, 30), ["paris"])
+
+    def test_non_finite_coordinates(self):
+        """Test that NaN and infinite coordinates remove a place"""
+        self.index.add("paris", float("nan"), 2.35)
+        self.index.add("versailles", 48.8, "inf")
+        self.assertEqual(self.ids(48.85, 2.35, 400), ["london"])
+
+    def test_near_scans_points(self):
+        """Test that a radius covering more cells than places scans them"""
+        self.assertEqual(self.ids(48.85, 2.35, 20000),
+                         ["paris", "versailles", "london", "fiji", "samoa"])
+        self.assertEqual(self.ids(48.85, 2.35, 20000, limit=2),
+                         ["paris", "versailles"])
+        self.assertEqual(self.ids(48.85, 2.35, 400),
+                         ["paris", "versailles", "london"])
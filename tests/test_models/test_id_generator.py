@@ -0,0 +1,81 @@
+#!/usr/bin/python3
+"""
+Contains the tests for the id generators
+"""
+
+import inspect
+import models
+from models import id_generator
+import pep8
+import unittest
+
+
+class TestIdGeneratorDocs(unittest.TestCase):
+    """Tests to check the documentation and style of id_generator"""
+    def test_pep8_conformance_id_generator(self):
+        """Test that models/id_generator.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/id_generator.py',
+                                    'tests/test_models/test_id_generator.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_id_generator_module_docstring(self):
+        """Test for the id_generator.py module docstring"""
+        self.assertIsNot(id_generator.__doc__, None,
+                         "id_generator.py needs a docstring")
+
+    def test_func_docstrings(self):
+        """Test for the presence of docstrings in id_generator functions"""
+        for func in inspect.getmembers(id_generator, inspect.isfunction):
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} needs a docstring".format(func[0]))
+
+
+class TestIdGenerator(unittest.TestCase):
+    """Test the id generators"""
+    def test_uuid7_format(self):
+        """Test that uuid7 ids are version 7 UUID strings"""
+        value = id_generator.uuid7()
+        self.assertRegex(value,
+                         '^[0-9a-f]{8}-[0-9a-f]{4}'
+                         '-7[0-9a-f]{3}-[89ab][0-9a-f]{3}'
+                         '-[0-9a-f]{12}$')
+
+    def test_uuid7_sorted(self):
+        """Test that successive uuid7 ids increase"""
+        ids = [id_generator.uuid7() for _ in range(5000)]
+        self.assertEqual(ids, sorted(ids))
+        self.assertEqual(len(set(ids)), len(ids))
+
+    def test_ulid(self):
+        """Test that ulid ids are 26 chars and time ordered"""
+        first = id_generator.ulid()
+        models.id_generator.time.sleep(0.002)
+        second = id_generator.ulid()
+        self.assertEqual(len(first), 26)
+        self.assertLess(first, second)
+
+    def test_bytes_round_trip(self):
+        """Test that ids survive packing to 16 bytes"""
+        value = id_generator.uuid7()
+        packed = id_generator.id_to_bytes(value)
+        self.assertEqual(len(packed), 16)
+        self.assertEqual(id_generator.id_from_bytes(packed), value)
+
+    def test_is_uuid(self):
+        """Test that only UUID formatted ids can be packed"""
+        self.assertTrue(id_generator.is_uuid(id_generator.uuid7()))
+        for value in ("not-a-uuid", id_generator.ulid(), "", None, 1):
+            self.assertFalse(id_generator.is_uuid(value))
+
+    def test_set_generator(self):
+        """Test that new models use the configured generator"""
+        saved = id_generator.generate_id
+        try:
+            id_generator.set_generator("ulid")
+            self.assertEqual(len(models.base_model.BaseModel().id), 26)
+            id_generator.set_generator(lambda: "fixed")
+            self.assertEqual(models.base_model.BaseModel().id, "fixed")
+        finally:
+            id_generator.set_generator(saved)
@@ -0,0 +1,92 @@
+#!/usr/bin/python3
+"""
+Contains the TestPasswordHasherDocs and TestPasswordHasher classes
+"""
+
+from hashlib import md5
+import inspect
+from models import password_hasher
+import pep8
+import unittest
+PasswordHasher = password_hasher.PasswordHasher
+
+
+class TestPasswordHasherDocs(unittest.TestCase):
+    """Tests to check the documentation and style of PasswordHasher class"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.ph_f = inspect.getmembers(PasswordHasher, inspect.isfunction)
+
+    def test_pep8_conformance_password_hasher(self):
+        """Test that models/password_hasher.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/password_hasher.py',
+                                    'tests/test_models/'
+                                    'test_password_hasher.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_password_hasher_module_docstring(self):
+        """Test for the password_hasher.py module docstring"""
+        self.assertIsNot(password_hasher.__doc__, None,
+                         "password_hasher.py needs a docstring")
+        self.assertTrue(len(password_hasher.__doc__) >= 1,
+                        "password_hasher.py needs a docstring")
+
+    def test_password_hasher_class_docstring(self):
+        """Test for the PasswordHasher class docstring"""
+        self.assertIsNot(PasswordHasher.__doc__, None,
+                         "PasswordHasher class needs a docstring")
+        self.assertTrue(len(PasswordHasher.__doc__) >= 1,
+                        "PasswordHasher class needs a docstring")
+
+    def test_ph_func_docstrings(self):
+        """Test for the presence of docstrings in PasswordHasher methods"""
+        for func in self.ph_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+class TestPasswordHasher(unittest.TestCase):
+    """Test the PasswordHasher class"""
+    def setUp(self):
+        """creates a cheap hasher for the tests"""
+        self.hasher = PasswordHasher(iterations=1000, workers=1)
+
+    def tearDown(self):
+        """shuts the hasher pool down"""
+        self.hasher.close()
+
+    def test_hash_is_salted(self):
+        """Test that hashing twice gives different strings"""
+        first = self.hasher.hash("secret")
+        second = self.hasher.hash("secret")
+        self.assertNotEqual(first, second)
+        self.assertTrue(first.startswith("pbkdf2_sha256$1000$"))
+        self.assertTrue(self.hasher.is_hashed(first))
+
+    def test_verify(self):
+        """Test that verify accepts the right password only"""
+        value = self.hasher.hash("secret")
+        self.assertTrue(self.hasher.verify("secret", value))
+        self.assertFalse(self.hasher.verify("wrong", value))
+        self.assertFalse(self.hasher.verify("secret", ""))
+
+    def test_verify_legacy_md5(self):
+        """Test that verify accepts legacy MD5 digests"""
+        value = md5("secret".encode()).hexdigest()
+        self.assertTrue(self.hasher.is_legacy(value))
+        self.assertTrue(self.hasher.verify("secret", value))
+        self.assertFalse(self.hasher.verify("wrong", value))
+
+    def test_needs_rehash(self):
+        """Test that legacy and cheaper hashes need a rehash"""
+        value = self.hasher.hash("secret")
+        self.assertFalse(self.hasher.needs_rehash(value))
+        self.assertTrue(self.hasher.needs_rehash(
+            md5("secret".encode()).hexdigest()))
+        stronger = PasswordHasher(iterations=2000, workers=1)
+        self.assertTrue(stronger.needs_rehash(value))
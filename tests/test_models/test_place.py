@@ -171,6 +171,15 @@ class TestPlace(unittest.TestCase):
         self.assertEqual(type(place.amenity_ids), list)
         self.assertEqual(len(place.amenity_ids), 0)
 
+    @unittest.skipIf(models.storage_t == 'db', "not testing File Storage")
+    def test_amenities_follow_amenity_ids(self):
+        """Test amenities returns the stored Amenities of amenity_ids"""
+        from models.amenity import Amenity
+        amenity = Amenity(name="Wifi")
+        models.storage.new(amenity)
+        place = Place(amenity_ids=[amenity.id, "nonexistent_id"])
+        self.assertEqual(place.amenities, [amenity])
+
     def test_to_dict_creates_dict(self):
         """test to_dict method creates a dictionary with proper attrs"""
         p = Place()
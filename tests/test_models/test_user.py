@@ -4,12 +4,14 @@ Contains the TestUserDocs classes
 """
 
 from datetime import datetime
+from hashlib import md5
 import inspect
 import models
 from models import user
 from models.base_model import BaseModel
 import pep8
 import unittest
+from unittest import mock
 User = user.User
 
 
@@ -130,3 +132,37 @@ class TestUser(unittest.TestCase):
         user = User()
         string = "[User] ({}) {}".format(user.id, user.__dict__)
         self.assertEqual(string, str(user))
+
+    def test_password_is_hashed(self):
+        """test that the password is stored as a salted hash"""
+        user = User(password="secret")
+        self.assertNotEqual(user.password, "secret")
+        self.assertTrue(user.password.startswith("pbkdf2_sha256$"))
+        self.assertTrue(user.check_password("secret"))
+        self.assertFalse(user.check_password("wrong"))
+
+    @mock.patch('models.storage')
+    def test_check_password_upgrades_md5(self, mock_storage):
+        """test that a legacy MD5 password is rehashed on check"""
+        user = User()
+        user.password = md5("secret".encode()).hexdigest()
+        self.assertTrue(user.check_password("secret"))
+        self.assertTrue(user.password.startswith("pbkdf2_sha256$"))
+        self.assertTrue(mock_storage.save.called)
+        self.assertTrue(user.check_password("secret"))
+
+    def test_hash_like_password_is_hashed(self):
+        """test that a password looking like a hash is hashed too"""
+        stored = User(password="secret").password
+        user = User(password=stored)
+        self.assertNotEqual(user.password, stored)
+        self.assertTrue(user.check_password(stored))
+        self.assertFalse(user.check_password("secret"))
+
+    def test_from_stored_keeps_hash(self):
+        """test that a user read back from storage keeps its hash"""
+        stored = User(password="secret")
+        user = User.from_stored(stored.to_dict(exclude_password=False))
+        self.assertEqual(user.password, stored.password)
+        self.assertEqual(user.id, stored.id)
+        self.assertTrue(user.check_password("secret"))